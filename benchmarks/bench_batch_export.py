@@ -0,0 +1,48 @@
+"""
+Batch PDF export throughput vs number of worker processes.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_batch_export [--invoices 400] [--workers 1 2 4]
+"""
+import argparse
+import os
+import time
+
+from .seed import seed_database, temp_workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=400)
+    parser.add_argument("--items", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    workdir, previous = temp_workdir()
+    try:
+        db_path = workdir / "invoice_app.db"
+        print(f"Seeding {args.invoices} invoices in {workdir} ...")
+        seed_database(db_path, invoices=args.invoices, items_per_invoice=args.items)
+
+        from invoice_system.app.models import db_manager
+        from invoice_system.app.ui.batch_export import export_invoices
+        db_manager.set_database_path(db_path)
+
+        print(f"{os.cpu_count()} CPU(s) available")
+        ids = list(range(1, args.invoices + 1))
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = export_invoices(ids, folder=workdir / f"pdf_{workers}", workers=workers)
+            elapsed = time.perf_counter() - start
+            rate = len(result["exported"]) / elapsed
+            baseline = baseline or rate
+            print(f"  {workers} worker(s): {rate:7.1f} invoices/s  "
+                  f"(x{rate / baseline:.2f}, {len(result['failed'])} failed)")
+        db_manager.close_connections()
+    finally:
+        os.chdir(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Throughput of save_invoice() in a loop vs save_invoices_bulk().
+
+Usage (from the repository root):
+    python -m benchmarks.bench_bulk_save [--invoices 5000] [--items 5]
+"""
+import argparse
+import os
+import random
+import time
+
+from .seed import CUSTOMERS, GST_RATES, PRODUCTS, STATES, temp_workdir
+
+
+def make_invoices(count, items_per_invoice, prefix, seed=7):
+    """Build (invoice_data, items) pairs shaped like CreateInvoice's."""
+    rng = random.Random(seed)
+    invoices = []
+    for n in range(count):
+        state, state_code = rng.choice(STATES)
+        items = []
+        for _ in range(items_per_invoice):
+            description, hsn = rng.choice(PRODUCTS)
+            quantity = rng.randint(1, 50)
+            rate = round(rng.uniform(10, 2000), 2)
+            items.append({
+                'description': description, 'hsn': hsn, 'quantity': quantity,
+                'type': 'pcs', 'rate': rate, 'gst': rng.choice(GST_RATES),
+                'total': round(quantity * rate, 2),
+            })
+        invoices.append(({
+            'customer_name': rng.choice(CUSTOMERS), 'customer_address': f"Address {n}",
+            'gstin': f"{state_code}ABCDE{n % 10000:04d}F1Z5", 'state': state,
+            'state_code': state_code, 'invoice_no': f"{prefix}-{n:07d}",
+            'date': f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-2025",
+            'challan': '', 'transporter': '', 'consignment': '',
+            'grand_total': round(sum(item['total'] for item in items), 2),
+        }, items))
+    return invoices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir, previous = temp_workdir()
+    try:
+        from invoice_system.app.models import db_manager
+        db_manager.set_database_path(workdir / "invoice_app.db")
+        db_manager.create_tables()
+
+        single = make_invoices(args.invoices, args.items, "ONE")
+        start = time.perf_counter()
+        for invoice_data, items in single:
+            invoice_id = db_manager.save_invoice(invoice_data, items)
+            db_manager.calculate_and_insert_invoice_taxes(invoice_id)
+        loop_elapsed = time.perf_counter() - start
+
+        bulk = make_invoices(args.invoices, args.items, "BULK")
+        start = time.perf_counter()
+        ids = db_manager.save_invoices_bulk(bulk)
+        bulk_elapsed = time.perf_counter() - start
+        assert ids and len(ids) == args.invoices
+
+        print(f"{args.invoices} invoices x {args.items} items:")
+        print(f"  save_invoice + taxes loop  {args.invoices / loop_elapsed:10.0f} invoices/s")
+        print(f"  save_invoices_bulk         {args.invoices / bulk_elapsed:10.0f} invoices/s")
+        db_manager.close_connections()
+    finally:
+        os.chdir(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+InvoiceCalculator: one invoice at a time versus the batch path.
+
+Builds --invoices synthetic invoices in memory (no database) and totals
+them with calculate() per invoice and with one calculate_many() call.
+Exits with status 1 if the two disagree on any invoice.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_calculator [--invoices 100000] [--items 3]
+"""
+import argparse
+import random
+import sys
+import time
+
+from invoice_system.app.models.invoice_calculator import GST_RATES, InvoiceCalculator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=3, help="items per invoice")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    calculator = InvoiceCalculator("19ABCDE1234F1Z5")
+    places = {invoice_id: (rng.choice(("19", "27", "", "10")), "") for invoice_id in range(1, args.invoices + 1)}
+    invoice_ids, totals, rates = [], [], []
+    for invoice_id in places:
+        for _ in range(args.items):
+            invoice_ids.append(invoice_id)
+            totals.append(round(rng.uniform(1, 5000), 2))
+            rates.append(rng.choice(GST_RATES))
+
+    start = time.perf_counter()
+    items = {}
+    for invoice_id, total, rate in zip(invoice_ids, totals, rates):
+        items.setdefault(invoice_id, []).append({'total': total, 'gst_percent': rate})
+    single = {invoice_id: calculator.calculate(lines, *places[invoice_id]) for invoice_id, lines in items.items()}
+    per_invoice = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculator.calculate_many(invoice_ids, totals, rates, places)
+    batched = time.perf_counter() - start
+
+    subtotals, tax_totals = batch.subtotals(), batch.tax_totals()
+    mismatches = sum(1 for invoice_id, result in single.items()
+                     if (result.subtotal, result.tax_total) != (subtotals[invoice_id], tax_totals[invoice_id]))
+    print(f"{args.invoices} invoices, {len(totals)} lines, {len(batch)} tax lines")
+    print(f"  calculate() per invoice   {per_invoice * 1000:8.1f} ms")
+    print(f"  calculate_many()          {batched * 1000:8.1f} ms")
+    print(f"  invoices that disagree    {mismatches:8d}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
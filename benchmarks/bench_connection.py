@@ -0,0 +1,114 @@
+"""
+Per-call overhead of db_manager: reconnect-per-call vs pooled connection.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_connection [--invoices 100000] [--calls 2000]
+"""
+import argparse
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from .seed import seed_database, temp_workdir
+
+
+SUMMARY_QUERIES = (
+    "SELECT COUNT(*) FROM invoices",
+    "SELECT COUNT(*) FROM invoices WHERE payment_status = 'Paid'",
+    "SELECT COUNT(*) FROM invoices WHERE payment_status = 'Pending'",
+    "SELECT COALESCE(SUM(grand_total), 0) FROM invoices WHERE payment_status = 'Pending'",
+)
+
+db_manager = None
+
+
+def legacy_connect():
+    """The connect() db_manager used before pooling."""
+    db_dir = Path.cwd()
+    os.makedirs(db_dir, exist_ok=True)
+    return sqlite3.connect(str(db_dir / "invoice_app.db"))
+
+
+def legacy_get_invoice(invoice_id):
+    conn = legacy_connect()
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,))
+    invoice = dict(cursor.fetchone())
+    cursor.execute("SELECT * FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
+    items = [dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return invoice, items
+
+
+def legacy_summary():
+    conn = legacy_connect()
+    cursor = conn.cursor()
+    summary = []
+    for query in SUMMARY_QUERIES:
+        cursor.execute(query)
+        summary.append(cursor.fetchone()[0])
+    conn.close()
+    return summary
+
+
+def pooled_open(_):
+    with db_manager.get_connection():
+        pass
+
+
+def time_calls(label, func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<38} {elapsed * 1e6 / calls:10.1f} us/call")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir, previous = temp_workdir()
+    try:
+        print(f"Seeding {args.invoices} invoices in {workdir} ...")
+        seed_database(workdir / "invoice_app.db", invoices=args.invoices)
+
+        global db_manager
+        from invoice_system.app.models import db_manager
+        db_manager.set_database_path(workdir / "invoice_app.db")
+
+        ids = [(i * 7919) % args.invoices + 1 for i in range(args.calls)]
+
+        print("Bare open/close (no query):")
+        legacy = time_calls("before: connect() + close()",
+                            lambda i: legacy_connect().close(), args.calls)
+        pooled_open(0)
+        pooled = time_calls("after:  get_connection()", pooled_open, args.calls)
+        print(f"  speed-up x{legacy / pooled:.1f}")
+
+        print("get_invoice(id) point lookup (no invoice_id index yet):")
+        legacy = time_calls("before: reconnect per call",
+                            lambda i: legacy_get_invoice(ids[i]), args.calls // 10)
+        pooled = time_calls("after:  pooled connection",
+                            lambda i: db_manager.get_invoice(ids[i]), args.calls // 10)
+        print(f"  speed-up x{legacy / pooled:.1f}")
+
+        print("get_invoice_summary() (runs on every dashboard refresh):")
+        legacy = time_calls("before: reconnect per call",
+                            lambda i: legacy_summary(), 50)
+        pooled = time_calls("after:  pooled connection",
+                            lambda i: db_manager.get_invoice_summary(), 50)
+        print(f"  speed-up x{legacy / pooled:.1f}")
+
+        db_manager.close_connections()
+    finally:
+        os.chdir(previous)
+
+
+if __name__ == "__main__":
+    main()
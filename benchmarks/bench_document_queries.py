@@ -0,0 +1,103 @@
+"""
+Connections opened and SQL statements run per invoice preview and PDF export.
+
+Every new sqlite3 connection is counted and traced with
+set_trace_callback, as is the thread's pooled connection. Exits with
+status 1 if opening a preview or exporting a PDF needs more than one
+connection or more than MAX_STATEMENTS statements.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_document_queries [--rows 50]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+from .seed import seed_database, temp_workdir
+
+# BEGIN, invoice, items, taxes, company, COMMIT
+MAX_STATEMENTS = 6
+MAX_CONNECTIONS = 1
+
+
+@contextmanager
+def counting(pooled):
+    """Count connections opened and statements run (on new and pooled connections) in the block."""
+    counts = {"connections": 0, "statements": []}
+    connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        counts["connections"] += 1
+        conn.set_trace_callback(counts["statements"].append)
+        return conn
+
+    sqlite3.connect = traced_connect
+    pooled.set_trace_callback(counts["statements"].append)
+    try:
+        yield counts
+    finally:
+        sqlite3.connect = connect
+        pooled.set_trace_callback(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50, help="lines on the invoice")
+    parser.add_argument("--verbose", action="store_true", help="print every statement")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    workdir, previous = temp_workdir()
+    failed = False
+    try:
+        seed_database("invoice_app.db", invoices=1, items_per_invoice=args.rows)
+
+        from invoice_system.app.models.connection import manager
+        from invoice_system.app.models.db_manager import compute_invoice_taxes, set_database_path
+        from invoice_system.app.models.pdf_cache import cache
+        from invoice_system.app.ui.invoice_preview import InvoicePreviewWindow
+        from invoice_system.app.ui.pdf_renderer import export_invoice_pdf
+
+        set_database_path("invoice_app.db")
+        cache.configure(workdir / "pdf_cache")
+        compute_invoice_taxes()
+        pooled = manager.acquire()
+
+        def open_preview():
+            window = InvoicePreviewWindow(1)
+            window.show()
+            app.processEvents()
+            window.close()
+
+        print(f"{'operation':<14} {'connections':>12} {'statements':>11}")
+        for name, operation in (("preview", open_preview),
+                                ("export pdf", lambda: export_invoice_pdf(1, workdir / "out"))):
+            with counting(pooled) as counts:
+                operation()
+            statements = counts["statements"]
+            print(f"{name:<14} {counts['connections']:>12} {len(statements):>11}")
+            if args.verbose:
+                for statement in statements:
+                    print("    " + " ".join(statement.split()))
+            if counts["connections"] > MAX_CONNECTIONS or len(statements) > MAX_STATEMENTS:
+                failed = True
+    finally:
+        from invoice_system.app.models.db_manager import close_connections
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failed:
+        print(f"FAIL: more than {MAX_CONNECTIONS} connection or {MAX_STATEMENTS} statements")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Idle cost of the main window's dashboards, and how fast they follow a change.
+
+Leaves the main window idle for --idle seconds and reports the CPU time
+used and the SQL statements run. Then it checks that the invoice and
+challan dashboards pick up an in-process save and a commit made by another
+connection (standing in for another process). Exits with status 1 if a
+dashboard misses a change.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_idle_refresh [--invoices 20000] [--challans 20000] [--idle 10]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import time
+
+from .seed import seed_challans, seed_database, temp_workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=20_000)
+    parser.add_argument("--challans", type=int, default=20_000)
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds to stay idle")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    workdir, previous = temp_workdir()
+    failed = False
+    try:
+        seed_database("invoice_app.db", invoices=args.invoices, items_per_invoice=1)
+        seed_challans("invoice_app.db", challans=args.challans, items_per_challan=1)
+
+        from invoice_system.app.models.connection import manager
+        from invoice_system.app.models.db_manager import (close_connections, create_tables,
+                                                          delete_challan, set_database_path)
+        from invoice_system.app.ui.main_Window import MainWindow
+
+        set_database_path("invoice_app.db")
+        create_tables()
+        window = MainWindow()
+        window.show()
+        app.processEvents()
+
+        def run_for(seconds):
+            # A real event loop: the process sleeps until a timer or event is due
+            loop = QEventLoop()
+            QTimer.singleShot(int(seconds * 1000), loop.quit)
+            loop.exec()
+
+        statements = []
+        manager.acquire().set_trace_callback(statements.append)
+        cpu = time.process_time()
+        run_for(args.idle)
+        cpu = time.process_time() - cpu
+        print(f"idle {args.idle:.0f} s: {cpu * 1000:8.1f} ms CPU, {len(statements)} SQL statements")
+
+        def dashboards():
+            return (window.page("invoice").invoice_widget.total_invoice_box.value_label.text(),
+                    window.page("challan").challan_widget.total_challan_box.value_label.text())
+
+        # In-process write: published on the bus
+        window.show_page("challan")
+        app.processEvents()
+        delete_challan(args.challans)
+        QCoreApplication.sendPostedEvents()
+        app.processEvents()
+        in_process = dashboards()[1] == str(args.challans - 1)
+        print(f"challan deleted in process:   dashboard {'updated' if in_process else 'STALE'}")
+
+        # Another connection commits: noticed through PRAGMA data_version
+        other = sqlite3.connect("invoice_app.db")
+        other.execute("UPDATE invoices SET payment_status = 'Paid'")
+        other.execute("DELETE FROM challans WHERE id = 1")
+        other.commit()
+        other.close()
+        start = time.monotonic()
+        while dashboards()[1] != str(args.challans - 2) and time.monotonic() - start < 5:
+            run_for(0.1)
+        external = dashboards()[1] == str(args.challans - 2)
+        print(f"challan deleted by other connection: dashboard "
+              f"{'updated after %.1f s' % (time.monotonic() - start) if external else 'STALE'}")
+
+        # The invoice page was hidden; it catches up when shown
+        window.show_page("invoice")
+        app.processEvents()
+        pending = window.page("invoice").invoice_widget.pending_bills_box.value_label.text()
+        caught_up = pending == "0"
+        print(f"invoice page shown after external update: {'updated' if caught_up else 'STALE'}")
+
+        failed = not (in_process and external and caught_up)
+        manager.acquire().set_trace_callback(None)
+        window.close()
+    finally:
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Typing into the Create Invoice / Create Challan items table.
+
+Fills --rows rows one cell at a time (quantity, rate and GST %, as typing
+or pasting does: one cellChanged each) and reports the time per row and
+in total, then edits one row in the middle of the full table. Exits with
+status 1 if the grand total or the GST summary disagrees with a
+recalculation from scratch.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_item_totals [--rows 500]
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+GST_CYCLE = ("0", "5", "12", "18", "28", "3", "0.25")
+
+
+def fill(page, rows, gst_column=None):
+    from PySide6.QtWidgets import QTableWidgetItem
+
+    table = page.items_table
+    page.current_rows = rows
+    table.setRowCount(rows)
+    start = time.perf_counter()
+    for row in range(rows):
+        table.setItem(row, 2, QTableWidgetItem(str(row % 7 + 1)))
+        table.setItem(row, 4, QTableWidgetItem(f"{100 + row * 0.35:.2f}"))
+        if gst_column is not None:
+            table.setItem(row, gst_column, QTableWidgetItem(GST_CYCLE[row % len(GST_CYCLE)]))
+    filled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table.setItem(rows // 2, 2, QTableWidgetItem("9"))
+    edited = time.perf_counter() - start
+    return filled, edited
+
+
+def expected_totals(rows):
+    """Grand total (from the rounded row totals) and intra-state CGST per rate, computed directly."""
+    grand = 0
+    taxable = {}
+    for row in range(rows):
+        quantity = 9 if row == rows // 2 else row % 7 + 1
+        paise = round(quantity * float(f"{100 + row * 0.35:.2f}") * 100)
+        grand += paise
+        gst = GST_CYCLE[row % len(GST_CYCLE)]
+        taxable[gst] = taxable.get(gst, 0) + paise
+    # Half of the rate on the taxable value, rounded half up to the paisa
+    cgst = {gst: float((Decimal(value) * Decimal(gst) / 200).quantize(Decimal(1), ROUND_HALF_UP)) / 100
+            for gst, value in taxable.items()}
+    return grand / 100, cgst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    from invoice_system.app.ui.create_challan import CreateChallan
+    from invoice_system.app.ui.create_invoice import CreateInvoice
+
+    grand, cgst = expected_totals(args.rows)
+    invoice = CreateInvoice()
+    filled, edited = fill(invoice, args.rows, gst_column=5)
+    app.processEvents()
+    print(f"invoice {args.rows} rows: {filled * 1000:9.1f} ms  "
+          f"({filled / args.rows * 1000:.2f} ms per row), edit one row {edited * 1000:.2f} ms")
+    # The summary has one column per rate, in this order
+    shown = {rate: field.text()
+             for rate, field in zip(("0", "0.25", "3", "5", "12", "18", "28"), invoice.gst_fields["CGST"])}
+    invoice_ok = (invoice.grand_total.text() == f"{grand:.2f}"
+                  and all(shown[gst] == (f"{value:.2f}" if value > 0 else "")
+                          for gst, value in cgst.items()))
+    print(f"invoice totals {'match' if invoice_ok else 'DIFFER'}: grand total "
+          f"{invoice.grand_total.text()} (expected {grand:.2f})")
+    invoice.close()
+
+    challan = CreateChallan()
+    filled, edited = fill(challan, args.rows)
+    app.processEvents()
+    print(f"challan {args.rows} rows: {filled * 1000:9.1f} ms  "
+          f"({filled / args.rows * 1000:.2f} ms per row), edit one row {edited * 1000:.2f} ms")
+    challan_ok = challan.grand_total.text() == f"{grand:.2f}"
+    print(f"challan totals {'match' if challan_ok else 'DIFFER'}: grand total "
+          f"{challan.grand_total.text()} (expected {grand:.2f})")
+    challan.close()
+    return 0 if invoice_ok and challan_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
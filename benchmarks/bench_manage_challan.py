@@ -0,0 +1,91 @@
+"""
+Manage_Challan list: first screen, background paging, and searching mid-fetch.
+
+Reports the time until the first page is shown, the time to scroll until
+--scroll rows are loaded, and the cost of a search. The search starts
+while a page for the unfiltered list is still loading, and the benchmark
+checks that this stale page never reaches the table.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_manage_challan [--challans 20000] [--scroll 2000]
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+
+from .seed import seed_challans, seed_database, temp_workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--challans", type=int, default=20_000)
+    parser.add_argument("--scroll", type=int, default=2_000, help="rows to scroll through")
+    parser.add_argument("--search", default="sharma")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QDate, QThreadPool
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    workdir, previous = temp_workdir()
+    failed = False
+    try:
+        seed_database("invoice_app.db", invoices=1, items_per_invoice=1)
+        seed_challans("invoice_app.db", challans=args.challans)
+
+        from invoice_system.app.models.db_manager import close_connections, set_database_path
+        from invoice_system.app.ui.manage_challan import Manage_Challan
+
+        set_database_path("invoice_app.db")
+        page = Manage_Challan()
+        page.resize(1400, 900)
+        page.date_from.setDate(QDate(2025, 1, 1))
+        page.date_to.setDate(QDate(2025, 12, 31))
+        page.show()
+        app.processEvents()
+        table, model = page.challans_table, page.challans_model
+
+        def settle():
+            # Wait for the page loaders and deliver their results
+            QThreadPool.globalInstance().waitForDone()
+            app.processEvents()
+
+        start = time.perf_counter()
+        page.load_challans()
+        app.processEvents()
+        first_screen = time.perf_counter() - start
+
+        start = time.perf_counter()
+        while model.rowCount() < args.scroll and (model.canFetchMore() or model.loading):
+            table.scrollToBottom()
+            settle()
+        scrolled = time.perf_counter() - start
+
+        # Ask for one more page and search before it arrives
+        model.fetchMore()
+        start = time.perf_counter()
+        page.search_input.setText(args.search)
+        page.apply_filters()
+        app.processEvents()
+        searched = time.perf_counter() - start
+        settle()
+        stale = [row for row in model.rows if args.search.lower() not in row['customer_name'].lower()]
+
+        print(f"first screen     {first_screen * 1000:9.1f} ms ({model.generation} resets)")
+        print(f"scroll {args.scroll:>6} rows {scrolled * 1000:9.1f} ms")
+        print(f"search           {searched * 1000:9.1f} ms ({model.rowCount()} rows shown)")
+        print(f"stale rows       {len(stale):>9}")
+        failed = bool(stale)
+        page.close()
+    finally:
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+ManageInvoice list: first load, scrolling through loaded pages, and a status change.
+
+Reports the time to show the first page, to scroll until --scroll rows are
+loaded and painted, to mark one invoice paid, and the number of widgets
+living inside the table.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_manage_invoice [--invoices 20000] [--scroll 2000]
+"""
+import argparse
+import os
+import shutil
+import time
+
+from .seed import seed_database, temp_workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=20_000)
+    parser.add_argument("--scroll", type=int, default=2_000, help="rows to scroll through")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QDate
+    from PySide6.QtWidgets import QApplication, QMessageBox, QWidget
+
+    app = QApplication.instance() or QApplication([])
+    workdir, previous = temp_workdir()
+    try:
+        seed_database("invoice_app.db", invoices=args.invoices, items_per_invoice=1)
+
+        from invoice_system.app.models.db_manager import close_connections, set_database_path
+        from invoice_system.app.ui.manage_invoice import ManageInvoice
+
+        set_database_path("invoice_app.db")
+        # The status change confirms and reports with message boxes
+        QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+        QMessageBox.information = staticmethod(lambda *args, **kwargs: None)
+
+        page = ManageInvoice()
+        page.resize(1400, 900)
+        page.date_from.setDate(QDate(2025, 1, 1))
+        page.date_to.setDate(QDate(2025, 12, 31))
+        page.show()
+        app.processEvents()
+        table, model = page.invoices_table, page.invoices_model
+
+        start = time.perf_counter()
+        page.load_invoices()
+        app.processEvents()
+        first_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        while model.rowCount() < args.scroll and model.canFetchMore():
+            table.scrollToBottom()
+            app.processEvents()
+        scrolled = time.perf_counter() - start
+
+        invoice = next(row for row in model.rows if row['payment_status'] == 'Pending')
+        start = time.perf_counter()
+        page.toggle_payment_status(invoice['id'], 'Paid')
+        app.processEvents()
+        toggled = time.perf_counter() - start
+
+        widgets = len(table.findChildren(QWidget))
+        print(f"first page       {first_load * 1000:9.1f} ms")
+        print(f"scroll {model.rowCount():>6} rows {scrolled * 1000:9.1f} ms")
+        print(f"mark paid        {toggled * 1000:9.1f} ms")
+        print(f"widgets in table {widgets:>9}")
+        page.close()
+    finally:
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+PDF cache: cold render vs cache hit vs render after an edit.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pdf_cache [--rows 10 100 1000] [--repeat 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from .bench_pdf_render import make_document
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20, help="cache hits timed per size")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from invoice_system.app.models.pdf_cache import cache
+    from invoice_system.app.ui.pdf_renderer import ensure_gui_application, render_invoice_pdf
+
+    ensure_gui_application()
+    with tempfile.TemporaryDirectory(prefix="invoice_pdf_cache_") as folder:
+        folder = Path(folder)
+        cache.configure(folder / "cache")
+
+        print(f"{'rows':>6} {'cold ms':>9} {'hit ms':>9} {'speedup':>8} {'edited ms':>10}")
+        for rows in args.rows:
+            invoice, items, taxes, company = make_document(rows)
+            invoice['id'] = rows
+            path = folder / f"bench_{rows}.pdf"
+
+            start = time.perf_counter()
+            render_invoice_pdf(path, invoice, items, taxes, company)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                render_invoice_pdf(path, invoice, items, taxes, company)
+            hit = (time.perf_counter() - start) / args.repeat
+
+            # Any change to the content is a new key, so this renders again
+            invoice['payment_status'] = 'Paid'
+            start = time.perf_counter()
+            render_invoice_pdf(path, invoice, items, taxes, company)
+            edited = time.perf_counter() - start
+
+            print(f"{rows:>6} {cold * 1000:>9.1f} {hit * 1000:>9.2f} {cold / hit:>7.0f}x {edited * 1000:>10.1f}")
+
+        print(f"cache size: {cache.size() / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
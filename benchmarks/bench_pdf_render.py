@@ -0,0 +1,71 @@
+"""
+PDF render time and memory vs number of invoice lines.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_pdf_render [--rows 10 100 1000 5000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from .seed import GST_RATES, PRODUCTS
+
+
+def make_document(rows, seed=3):
+    """An invoice header, its items and tax rows, shaped like the database rows."""
+    rng = random.Random(seed)
+    items = []
+    for _ in range(rows):
+        description, hsn = rng.choice(PRODUCTS)
+        quantity = rng.randint(1, 50)
+        rate = round(rng.uniform(10, 2000), 2)
+        items.append({'description': description, 'hsn': hsn, 'quantity': quantity, 'type': 'pcs',
+                      'rate': rate, 'gst_percent': float(rng.choice(GST_RATES)),
+                      'total': round(quantity * rate, 2)})
+    taxes = []
+    for rate in sorted({item['gst_percent'] for item in items}):
+        taxable = sum(item['total'] for item in items if item['gst_percent'] == rate)
+        half = round(taxable * rate / 200, 2)
+        taxes.append({'gst_percent': rate, 'sgst_amount': half, 'cgst_amount': half,
+                      'igst_amount': 0.0, 'tax_total': 2 * half})
+    invoice = {'invoice_no': f"INV-BENCH-{rows}", 'date': '01-06-2025', 'payment_status': 'Pending',
+               'customer_name': 'Sharma Traders', 'customer_address': 'Guwahati', 'gstin': '18ABCDE1234F1Z5',
+               'state': 'Assam', 'state_code': '18',
+               'grand_total': sum(item['total'] for item in items) + sum(tax['tax_total'] for tax in taxes)}
+    company = {'name': 'Bench Co', 'address': 'Karimganj, Assam', 'contact': '0000000000', 'logo_path': ''}
+    return invoice, items, taxes, company
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from invoice_system.app.ui.pdf_renderer import ensure_gui_application, render_document
+
+    ensure_gui_application()
+    with tempfile.TemporaryDirectory(prefix="invoice_pdf_") as folder:
+        print(f"{'rows':>6} {'pages':>6} {'seconds':>9} {'ms/row':>8} {'py peak KiB':>12} {'file KiB':>9}")
+        for rows in args.rows:
+            invoice, items, taxes, company = make_document(rows)
+            path = Path(folder) / f"bench_{rows}.pdf"
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            pages = render_document(path, invoice['invoice_no'],
+                                    lambda renderer: renderer.draw_invoice(invoice, items, taxes, company))
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            print(f"{rows:>6} {pages:>6} {elapsed:>9.3f} {elapsed * 1000 / rows:>8.3f} "
+                  f"{peak / 1024:>12.0f} {path.stat().st_size / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
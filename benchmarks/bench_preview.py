@@ -0,0 +1,60 @@
+"""
+Time to open (build, lay out and paint) an invoice preview vs number of lines.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_preview [--rows 10 100 1000]
+"""
+import argparse
+import os
+import shutil
+import time
+
+from .seed import seed_database, temp_workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    workdir, previous = temp_workdir()
+    try:
+        from invoice_system.app.models.db_manager import (close_connections, compute_invoice_taxes,
+                                                          set_database_path)
+        from invoice_system.app.ui.invoice_preview import InvoicePreviewWindow
+
+        print(f"{'rows':>6} {'open ms':>9}")
+        for rows in args.rows:
+            # The preview reads invoice_app.db from the working directory
+            close_connections()
+            if os.path.exists("invoice_app.db"):
+                os.remove("invoice_app.db")
+            seed_database("invoice_app.db", invoices=1, items_per_invoice=rows)
+            set_database_path("invoice_app.db")
+            compute_invoice_taxes()
+
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                window = InvoicePreviewWindow(1)
+                window.show()
+                app.processEvents()
+                elapsed = time.perf_counter() - start
+                window.close()
+                window.deleteLater()
+                app.processEvents()
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{rows:>6} {best * 1000:>9.1f}")
+    finally:
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Product lookup while typing an item: in-memory prefix index vs an FTS5 query per keystroke.
+
+Types each probe one character at a time and times every lookup, then
+adds a product and checks the index picks it up through the change event.
+Exits with status 1 if the slowest index lookup takes 1 ms or more, or the
+new product is not found.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_product_lookup [--inventory 10000]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+
+from .seed import seed_catalog, seed_database, temp_workdir
+
+PROBES = ["P0004242", "pvc pipe", "ball valve 77", "cement", "gi elbow 1", "inch 3", "xyz"]
+
+
+def keystrokes(probes):
+    return [probe[:length] for probe in probes for length in range(1, len(probe) + 1)]
+
+
+def timed(lookup, prefixes):
+    times = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        lookup(prefix)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inventory", type=int, default=10_000)
+    args = parser.parse_args()
+
+    workdir, previous = temp_workdir()
+    failed = False
+    try:
+        seed_database("invoice_app.db", invoices=10, items_per_invoice=1)
+        seed_catalog("invoice_app.db", customers=10, inventory=args.inventory)
+
+        from invoice_system.app.models.db_manager import (add_inventory_item, close_connections,
+                                                          search_inventory_items, set_database_path)
+        from invoice_system.app.models.product_index import products
+
+        set_database_path("invoice_app.db")
+        start = time.perf_counter()
+        size = len(products)
+        build = (time.perf_counter() - start) * 1000
+
+        prefixes = keystrokes(PROBES)
+        index_times = timed(products.lookup, prefixes)
+        fts_times = timed(lambda prefix: search_inventory_items(prefix, limit=20), prefixes)
+
+        print(f"index of {size} products built in {build:.1f} ms; {len(prefixes)} keystrokes")
+        for label, times in (("prefix index", index_times), ("FTS5 query", fts_times)):
+            print(f"  {label:<13} median {statistics.median(times):7.3f} ms   max {max(times):7.3f} ms")
+
+        add_inventory_item("Brass Tap Quarter Turn", "BT-0001", "Plumbing", "pcs", 5, 100.0, 150.0, "18%", "")
+        found = [product['product_code'] for product in products.lookup("brass tap")]
+        picked_up = found == ["BT-0001"]
+        print(f"new product after change event: {'found' if picked_up else 'MISSING'}")
+
+        failed = max(index_times) >= 1.0 or not picked_up
+    finally:
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
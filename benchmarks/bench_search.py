@@ -0,0 +1,98 @@
+"""
+LIKE / in-memory search paths vs the FTS5 search API.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_search [--invoices 1000000] [--catalog 100000]
+"""
+import argparse
+import os
+import time
+
+from .seed import seed_catalog, seed_database, temp_workdir
+
+# Selective terms first, then terms that match a large share of the rows
+# (the seeded data uses only a handful of customer and product names)
+QUERIES = ["inv-000777", "address 4242", "inv-0004", "sharma", "gupta hard", "valve", "19abcde"]
+
+
+def like_invoices(conn, term):
+    """The substring filter ManageInvoice used before FTS (first 50 by id, unranked)."""
+    pattern = f"%{term}%"
+    return conn.execute("""
+        SELECT id FROM invoices
+        WHERE invoice_no LIKE ? OR customer_name LIKE ? OR customer_address LIKE ? OR gstin LIKE ?
+        ORDER BY id DESC LIMIT 50
+    """, (pattern,) * 4).fetchall()
+
+
+def like_inventory(conn, term):
+    """The previous search_inventory_items query."""
+    pattern = f"%{term}%"
+    return conn.execute("""
+        SELECT * FROM inventory_items
+        WHERE product_name LIKE ? OR product_code LIKE ? OR category LIKE ?
+        ORDER BY product_name
+    """, (pattern,) * 3).fetchall()
+
+
+def python_customers(customers, term):
+    """The previous Edit_Customer.perform_search loop over all loaded customers."""
+    terms = term.lower().split()
+    return [c for c in customers
+            if all(t in " ".join(str(v).lower() for v in c[1:]) for t in terms)]
+
+
+def timed(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, len(result)
+
+
+def report(label, before, after):
+    (before_ms, before_hits), (after_ms, after_hits) = before, after
+    print(f"  {label:<26} LIKE {before_ms:9.2f} ms ({before_hits:>5} hits)   "
+          f"FTS {after_ms:8.2f} ms ({after_hits:>5} hits)   x{before_ms / max(after_ms, 1e-6):.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=1_000_000)
+    parser.add_argument("--catalog", type=int, default=100_000,
+                        help="number of customers and of inventory items")
+    args = parser.parse_args()
+
+    workdir, previous = temp_workdir()
+    try:
+        db_path = workdir / "invoice_app.db"
+        print(f"Seeding {args.invoices} invoices and {args.catalog} customers/items in {workdir} ...")
+        seed_database(db_path, invoices=args.invoices, items_per_invoice=1)
+        seed_catalog(db_path, customers=args.catalog, inventory=args.catalog)
+
+        from invoice_system.app.models import db_manager
+        db_manager.set_database_path(db_path)
+        start = time.perf_counter()
+        db_manager.rebuild_search_index()
+        print(f"Rebuild command: {time.perf_counter() - start:.1f} s")
+
+        conn = db_manager.connect()
+        all_customers = db_manager.get_all_customers()
+        for term in QUERIES:
+            print(f"'{term}':")
+            report("invoices (top 50)",
+                   timed(lambda: like_invoices(conn, term)),
+                   timed(lambda: db_manager.search_invoices(term, limit=50)))
+            report("inventory",
+                   timed(lambda: like_inventory(conn, term)),
+                   timed(lambda: db_manager.search_inventory_items(term)))
+            report("customers (in memory)",
+                   timed(lambda: python_customers(all_customers, term)),
+                   timed(lambda: db_manager.search_customers(term)))
+        conn.close()
+        db_manager.close_connections()
+    finally:
+        os.chdir(previous)
+
+
+if __name__ == "__main__":
+    main()
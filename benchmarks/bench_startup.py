@@ -0,0 +1,125 @@
+"""
+Cold start: import time, time to first paint and time until the dashboard shows data.
+
+Each run starts a fresh interpreter that repeats what main.py does under
+the offscreen Qt platform. The interpreter records when its imports
+finish, when the main window first paints and when the invoice
+dashboard has its figures. Exits with status 1 if any module that should
+load only on navigation (see LAZY_MODULES) was imported before the first
+paint.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_startup [--runs 5] [--invoices 2000]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .seed import seed_database, temp_workdir
+
+# Modules behind the registry or a button; none of them is needed for the first frame
+LAZY_MODULES = [
+    "invoice_system.app.ui.challan_view",
+    "invoice_system.app.ui.inventory",
+    "invoice_system.app.ui.customers_view",
+    "invoice_system.app.ui.create_invoice",
+    "invoice_system.app.ui.manage_invoice",
+    "invoice_system.app.ui.create_challan",
+    "invoice_system.app.ui.manage_challan",
+    "invoice_system.app.ui.admin_page",
+    "invoice_system.app.ui.job_queue",
+    "invoice_system.app.ui.pdf_renderer",
+    "invoice_system.app.ui.invoice_preview",
+    "invoice_system.app.ui.challan_preview",
+    "invoice_system.app.ui.batch_export",
+]
+
+
+def child():
+    """One cold start; prints the measurements as JSON."""
+    start = time.perf_counter()
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+    from invoice_system.app.models.db_manager import create_tables
+    from invoice_system.app.ui.main_Window import MainWindow
+    from invoice_system.app.ui.styles import load_stylesheet
+    imported = time.perf_counter()
+
+    create_tables()
+    app = QApplication([])
+    app.setStyleSheet(load_stylesheet())
+    window = MainWindow()
+    result = {"import_ms": (imported - start) * 1000}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if (event.type() == QEvent.Paint and "first_paint_ms" not in result
+                    and obj.isWidgetType() and obj.window() is window):
+                result["first_paint_ms"] = (time.perf_counter() - start) * 1000
+                result["eager_modules"] = [name for name in LAZY_MODULES if name in sys.modules]
+            return False
+
+    first_paint = FirstPaint()
+    app.installEventFilter(first_paint)
+    window.show()
+
+    def check_data():
+        total = window.page("invoice").invoice_widget.total_invoice_box.value_label.text()
+        painted = "first_paint_ms" in result
+        if (painted and total != "0") or time.perf_counter() - start > 10:
+            result["data_ms"] = (time.perf_counter() - start) * 1000
+            app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(check_data)
+    poll.start(1)
+    app.exec()
+    window.close()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--invoices", type=int, default=2_000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return 0
+
+    repo = Path(__file__).resolve().parent.parent
+    workdir, previous = temp_workdir()
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen",
+               PYTHONPATH=os.pathsep.join(filter(None, [str(repo), os.environ.get("PYTHONPATH")])))
+    runs = []
+    try:
+        # main.py opens invoice_app.db in the working directory
+        seed_database("invoice_app.db", invoices=args.invoices, items_per_invoice=1)
+        for _ in range(args.runs):
+            output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+                                    env=env, capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for key, label in (("import_ms", "imports"), ("first_paint_ms", "first paint"),
+                       ("data_ms", "dashboard data")):
+        values = [run[key] for run in runs if key in run]
+        print(f"{label:<15} median {statistics.median(values):7.1f} ms   min {min(values):7.1f} ms")
+
+    eager = sorted({name for run in runs for name in run.get("eager_modules", [])})
+    if eager:
+        print("FAIL: loaded before the first paint: " + ", ".join(eager))
+    return 1 if eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
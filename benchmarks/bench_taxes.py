@@ -0,0 +1,100 @@
+"""
+Backfill invoice_taxes: legacy per-invoice Python loop vs compute_invoice_taxes().
+
+Usage (from the repository root):
+    python -m benchmarks.bench_taxes [--invoices 100000] [--legacy-sample 5000]
+"""
+import argparse
+import os
+import time
+
+from .seed import seed_database, temp_workdir
+
+
+def legacy_calculate(conn, invoice_id):
+    """The pre-engine calculate_and_insert_invoice_taxes body (rate-based guess)."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT gst_percent, SUM(total) FROM invoice_items
+        WHERE invoice_id = ? GROUP BY gst_percent
+    """, (invoice_id,))
+    for gst_percent, taxable_total in cursor.fetchall():
+        gst_percent = float(gst_percent)
+        taxable_total = float(taxable_total)
+        if gst_percent == 0:
+            sgst = cgst = igst = total_tax = 0.0
+        elif gst_percent in (5, 12, 18, 28):
+            sgst = cgst = taxable_total * (gst_percent / 2) / 100
+            igst = 0.0
+            total_tax = sgst + cgst
+        else:
+            sgst = cgst = 0.0
+            igst = total_tax = taxable_total * gst_percent / 100
+        cursor.execute("""
+            INSERT INTO invoice_taxes (invoice_id, gst_percent, sgst_amount, cgst_amount, igst_amount, tax_total)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (invoice_id, gst_percent, sgst, cgst, igst, total_tax))
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=100_000)
+    parser.add_argument("--legacy-sample", type=int, default=5000,
+                        help="invoices run through the legacy loop (result is extrapolated)")
+    args = parser.parse_args()
+
+    workdir, previous = temp_workdir()
+    try:
+        db_path = workdir / "invoice_app.db"
+        print(f"Seeding {args.invoices} invoices in {workdir} ...")
+        seed_database(db_path, invoices=args.invoices)
+
+        from invoice_system.app.models import db_manager
+        db_manager.set_database_path(db_path)
+        db_manager.save_company_info({
+            'name': 'Bench Co', 'gstin': '19ABCDE1234F1Z5', 'contact': '', 'address': '',
+            'logo_path': '', 'bank_name': '', 'account_number': '', 'bank_ifsc': '', 'bank_branch': '',
+        })
+
+        conn = db_manager.connect()
+        conn.execute("DELETE FROM invoice_taxes")
+        conn.execute("DROP INDEX IF EXISTS idx_invoice_taxes_invoice_rate")
+        conn.commit()
+        sample = min(args.legacy_sample, args.invoices)
+        start = time.perf_counter()
+        for invoice_id in range(1, sample + 1):
+            legacy_calculate(conn, invoice_id)
+        legacy = (time.perf_counter() - start) * args.invoices / sample
+        conn.execute("DELETE FROM invoice_taxes")
+        conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_invoice_taxes_invoice_rate
+            ON invoice_taxes (invoice_id, gst_percent)
+        """)
+        conn.commit()
+        conn.close()
+
+        start = time.perf_counter()
+        rows = db_manager.compute_invoice_taxes()
+        engine = time.perf_counter() - start
+
+        start = time.perf_counter()
+        db_manager.compute_invoice_taxes()
+        rerun = time.perf_counter() - start
+
+        start = time.perf_counter()
+        db_manager.compute_invoice_taxes(list(range(1, 1001)))
+        subset = time.perf_counter() - start
+
+        print(f"Backfill of {args.invoices} invoices ({rows} tax rows):")
+        print(f"  legacy per-invoice loop   {legacy:8.2f} s  (extrapolated from {sample})")
+        print(f"  compute_invoice_taxes()   {engine:8.2f} s")
+        print(f"  re-run (idempotent)       {rerun:8.2f} s")
+        print(f"  1000-invoice id list      {subset * 1000:8.1f} ms")
+        db_manager.close_connections()
+    finally:
+        os.chdir(previous)
+
+
+if __name__ == "__main__":
+    main()
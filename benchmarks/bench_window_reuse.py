@@ -0,0 +1,107 @@
+"""
+Reopening the create/manage screens from the sidebar, and open preview windows.
+
+Clicks each sidebar entry --clicks times, closing the window in between
+the way a user would, and reports the time per click and the widgets left
+alive afterwards. Then opens --previews invoice previews and reports how
+many stay open and the footprint of every live window. Exits with status
+1 if a reopened screen misses a change made while it was closed or more
+previews than the window manager's limit stay open.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_window_reuse [--invoices 20000] [--clicks 5] [--previews 10]
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+
+from .seed import seed_database, temp_workdir
+
+SCREENS = (
+    ("create invoice", "open_createInvoice_page", "createInvoice_window"),
+    ("manage invoices", "open_manageInvoice_page", "manageInvoice_window"),
+    ("create challan", "open_challanPage", "createChallan_window"),
+    ("manage challans", "open_manageChallan_page", "manageChallan_window"),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=20_000)
+    parser.add_argument("--clicks", type=int, default=5)
+    parser.add_argument("--previews", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QCoreApplication, QEvent
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    workdir, previous = temp_workdir()
+    failed = False
+    try:
+        seed_database("invoice_app.db", invoices=args.invoices, items_per_invoice=1)
+
+        from invoice_system.app.models.db_manager import (close_connections, set_database_path,
+                                                          update_payment_status)
+        from invoice_system.app.ui.sideBar import Sidebar
+        from invoice_system.app.ui.window_manager import MAX_PREVIEWS, windows
+
+        set_database_path("invoice_app.db")
+        sidebar = Sidebar()
+
+        def settle():
+            app.processEvents()
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+        settle()
+        baseline = len(app.allWidgets())
+        for label, method, attribute in SCREENS:
+            start = time.perf_counter()
+            for _ in range(args.clicks):
+                getattr(sidebar, method)()
+                settle()
+                getattr(sidebar, attribute).close()
+                settle()
+            per_click = (time.perf_counter() - start) / args.clicks
+            print(f"{label:<16} {per_click * 1000:8.1f} ms per click")
+        print(f"widgets alive after {args.clicks} clicks each: {len(app.allWidgets()) - baseline}")
+
+        # A change made while the list was closed shows up on the next click
+        manage = sidebar.manageInvoice_window
+        manage.date_from.setDate(manage.date_from.minimumDate())
+        manage.load_invoices()
+        pending = int(manage.pending_invoices_value.text())
+        invoice = next(row for row in manage.invoices_model.rows if row['payment_status'] == 'Pending')
+        manage.close()
+        update_payment_status(invoice['id'], 'Paid')
+        sidebar.open_manageInvoice_page()
+        settle()
+        caught_up = int(sidebar.manageInvoice_window.pending_invoices_value.text()) == pending - 1
+        print(f"manage invoices reopened after a change: {'updated' if caught_up else 'STALE'}")
+
+        for invoice_id in range(1, args.previews + 1):
+            windows.show_preview("invoice_preview", invoice_id)
+            settle()
+        open_previews = sum(1 for name, window in windows.windows()
+                            if name == "invoice_preview" and window.isVisible())
+        print(f"previews opened {args.previews}, still open {open_previews} (limit {MAX_PREVIEWS})")
+        print(f"{'window':<16} {'objects':>8} {'rows':>6} {'image KB':>9}")
+        for entry in windows.footprint():
+            print(f"{entry['name']:<16} {entry['objects']:>8} {entry['rows']:>6} "
+                  f"{entry['image_bytes'] / 1024:>9.1f}")
+
+        failed = not caught_up or open_previews > MAX_PREVIEWS
+        windows.close_all()
+        settle()
+    finally:
+        close_connections()
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Builds a throwaway database with the app schema and a configurable number
+of invoices so timings are measured at a realistic size. Run the scripts
+from the repository root, e.g. ``python -m benchmarks.bench_connection``.
+"""
+import os
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+CUSTOMERS = [
+    "Sharma Traders", "Gupta Hardware", "Iqbal Enterprises", "Mehta Steels",
+    "Reddy Agencies", "Patel Brothers", "Khan Distributors", "Singh & Sons",
+]
+STATES = [("West Bengal", "19"), ("Bihar", "10"), ("Odisha", "21"), ("Assam", "18")]
+PRODUCTS = [
+    ("PVC Pipe 1 inch", "3917"), ("GI Elbow", "7307"), ("Ball Valve", "8481"),
+    ("Copper Wire 2.5mm", "8544"), ("MCB 32A", "8536"), ("Cement Bag", "2523"),
+]
+GST_RATES = [0, 5, 12, 18, 28]
+
+
+def temp_workdir():
+    """Create a temporary directory and chdir into it; returns the old cwd."""
+    workdir = Path(tempfile.mkdtemp(prefix="invoice_bench_"))
+    previous = os.getcwd()
+    os.chdir(workdir)
+    return workdir, previous
+
+
+def seed_database(db_path, invoices=100_000, items_per_invoice=3, seed=42):
+    """
+    Create the schema in db_path and fill it with synthetic invoices.
+
+    Args:
+        db_path: File to create
+        invoices: Number of invoices to insert
+        items_per_invoice: Line items per invoice
+        seed: Random seed so runs are comparable
+
+    Returns:
+        Path: db_path
+    """
+    from invoice_system.app.models.db_manager import SCHEMA_MIGRATIONS
+    from invoice_system.app.models.migrations import migrate
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    migrate(conn, SCHEMA_MIGRATIONS)
+    cursor = conn.cursor()
+
+    invoice_rows = []
+    item_rows = []
+    item_id = 1
+    for invoice_id in range(1, invoices + 1):
+        state, state_code = rng.choice(STATES)
+        day, month = rng.randint(1, 28), rng.randint(1, 12)
+        grand_total = 0.0
+        for _ in range(items_per_invoice):
+            description, hsn = rng.choice(PRODUCTS)
+            quantity = rng.randint(1, 50)
+            rate = round(rng.uniform(10, 2000), 2)
+            total = round(quantity * rate, 2)
+            grand_total += total
+            item_rows.append((item_id, invoice_id, description, hsn, quantity,
+                              "pcs", rate, rng.choice(GST_RATES), total))
+            item_id += 1
+        invoice_rows.append((
+            invoice_id, rng.choice(CUSTOMERS), f"Address {invoice_id}",
+            f"{state_code}ABCDE{invoice_id % 10000:04d}F1Z5", state, state_code,
+            f"INV-{invoice_id:06d}", f"{day:02d}-{month:02d}-2025",
+            f"2025-{month:02d}-{day:02d}", "", "", "",
+            round(grand_total, 2), rng.choice(["Paid", "Pending"]),
+        ))
+
+    cursor.executemany("""
+        INSERT INTO invoices (id, customer_name, customer_address, gstin, state,
+            state_code, invoice_no, date, date_iso, challan, transporter,
+            consignment, grand_total, payment_status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, invoice_rows)
+    cursor.executemany("""
+        INSERT INTO invoice_items (id, invoice_id, description, hsn, quantity,
+            type, rate, gst_percent, total)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, item_rows)
+    conn.commit()
+    conn.close()
+    return Path(db_path)
+
+
+def seed_catalog(db_path, customers=10_000, inventory=10_000, seed=42):
+    """
+    Add synthetic customers and inventory items to a seeded database.
+
+    Args:
+        db_path: Database created by seed_database
+        customers: Number of customers to insert
+        inventory: Number of inventory items to insert
+        seed: Random seed so runs are comparable
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA synchronous = OFF")
+
+    customer_rows = []
+    for n in range(customers):
+        state, state_code = rng.choice(STATES)
+        name = f"{rng.choice(CUSTOMERS)} {n}"
+        customer_rows.append((name, f"Address {n}", state, state_code,
+                              f"{state_code}ABCDE{n % 10000:04d}F1Z5", f"98{n:08d}"))
+    conn.executemany("""
+        INSERT INTO customers (customer_name, address, state, state_code, gstin, phone)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, customer_rows)
+
+    inventory_rows = []
+    for n in range(inventory):
+        name, hsn = rng.choice(PRODUCTS)
+        inventory_rows.append((f"{name} {n}", f"P{n:07d}", rng.choice(["Plumbing", "Electrical", "Civil"]),
+                               "pcs", rng.randint(0, 500), 10.0, 12.0, f"{rng.choice(GST_RATES)}%",
+                               f"HSN {hsn}"))
+    conn.executemany("""
+        INSERT INTO inventory_items (product_name, product_code, category, unit,
+            quantity_in_stock, purchase_price, selling_price, gst_percentage, description)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, inventory_rows)
+    conn.commit()
+    conn.close()
+
+
+def seed_challans(db_path, challans=10_000, items_per_challan=3, seed=42):
+    """
+    Add synthetic challans and their items to a seeded database.
+
+    Args:
+        db_path: Database created by seed_database
+        challans: Number of challans to insert
+        items_per_challan: Line items per challan
+        seed: Random seed so runs are comparable
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA synchronous = OFF")
+
+    challan_rows = []
+    item_rows = []
+    for challan_id in range(1, challans + 1):
+        state, state_code = rng.choice(STATES)
+        day, month = rng.randint(1, 28), rng.randint(1, 12)
+        grand_total = 0.0
+        for _ in range(items_per_challan):
+            description, hsn = rng.choice(PRODUCTS)
+            quantity = rng.randint(1, 50)
+            rate = round(rng.uniform(10, 2000), 2)
+            total = round(quantity * rate, 2)
+            grand_total += total
+            item_rows.append((challan_id, description, hsn, quantity, "pcs", rate, total))
+        challan_rows.append((
+            challan_id, rng.choice(CUSTOMERS), f"Address {challan_id}",
+            f"{state_code}ABCDE{challan_id % 10000:04d}F1Z5", state, state_code,
+            f"CH-{challan_id:06d}", f"{day:02d}-{month:02d}-2025", f"2025-{month:02d}-{day:02d}",
+            "", "", "", round(grand_total, 2),
+        ))
+
+    conn.executemany("""
+        INSERT INTO challans (id, customer_name, customer_address, gstin, state, state_code,
+            challan_no, date, date_iso, vehicle, transporter, lr, grand_total)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, challan_rows)
+    conn.executemany("""
+        INSERT INTO challan_items (challan_id, description, hsn, quantity, type, rate, total)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, item_rows)
+    conn.commit()
+    conn.close()
@@ -0,0 +1,177 @@
+import atexit
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+DB_FILENAME = "invoice_app.db"
+
+# Tuning applied once, when a connection is opened
+CACHE_SIZE_KIB = 16384                 # 16 MiB page cache per connection
+MMAP_SIZE_BYTES = 256 * 1024 * 1024    # map up to 256 MiB of the file
+BUSY_TIMEOUT_MS = 5000
+
+
+class _ThreadConnection:
+    """Holds one thread's connection in the thread-local; closes it when the thread ends."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionManager:
+    """
+    Hands out one reusable SQLite connection per thread.
+
+    Opening a connection (path lookup, file open, schema parse, PRAGMAs) is
+    far more expensive than the queries the app runs, so each thread keeps
+    its connection for the lifetime of the thread instead of reconnecting
+    on every call. A thread-pool worker's connection is closed when the
+    worker thread expires.
+    """
+
+    def __init__(self, db_path=None):
+        self._db_path = Path(db_path) if db_path else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._read_only = False
+
+    @property
+    def db_path(self):
+        """Resolve the database path once; defaults to invoice_app.db in the working directory."""
+        if self._db_path is None:
+            db_dir = Path.cwd()
+            os.makedirs(db_dir, exist_ok=True)
+            self._db_path = db_dir / DB_FILENAME
+        return self._db_path
+
+    def configure(self, db_path=None, read_only=False):
+        """
+        Point the manager at another database file.
+
+        Args:
+            db_path: Path of the database file (None keeps the current one)
+            read_only: Open every pooled connection with mode=ro
+        """
+        self.close_all()
+        if db_path is not None:
+            self._db_path = Path(db_path)
+        self._read_only = read_only
+
+    def open(self, read_only=None):
+        """
+        Open a new, fully tuned connection. The caller owns and closes it.
+
+        Args:
+            read_only: Open with mode=ro (defaults to the manager setting)
+        """
+        if read_only is None:
+            read_only = self._read_only
+
+        if read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+
+        cursor = conn.cursor()
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        cursor.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+        return conn
+
+    def acquire(self):
+        """Return the calling thread's connection, opening it on first use."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = self.open()
+            holder = _ThreadConnection(conn)
+            # The thread-local is dropped when the thread ends, and the holder with it
+            weakref.finalize(holder, self._release, conn)
+            self._local.holder = holder
+            with self._lock:
+                self._connections.append(conn)
+        return holder.conn
+
+    def _release(self, conn):
+        """Close a connection whose thread has ended."""
+        with self._lock:
+            try:
+                self._connections.remove(conn)
+            except ValueError:
+                pass
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow the thread's connection for reads.
+
+        Any transaction left open by a failing statement is rolled back so
+        the next caller on this thread starts clean.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    @contextmanager
+    def transaction(self):
+        """Borrow the thread's connection for writes; commit on success, roll back on error."""
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    @contextmanager
+    def read_transaction(self):
+        """
+        Borrow the thread's connection inside one read transaction.
+
+        Every query in the block sees the same snapshot of the database,
+        even if another connection commits in between.
+        """
+        conn = self.acquire()
+        began = not conn.in_transaction
+        if began:
+            conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            if began and conn.in_transaction:
+                conn.commit()
+
+    def close_all(self):
+        """Close every connection handed out so far (all threads)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+
+manager = ConnectionManager()
+atexit.register(manager.close_all)
@@ -1,28 +1,183 @@
 import sqlite3
 import os
-from pathlib import Path
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+from .connection import manager as _connections
+from .events import bus as _events, INVOICES, CHALLANS, INVENTORY, CUSTOMERS, COMPANY, INSERT, UPDATE, DELETE
+from .invoice_calculator import InvoiceCalculator
+from .migrations import migrate
+from .pdf_cache import cache as _pdf_cache
+from .search_index import (
+    build_match_query, create_search_index,
+    rebuild_search_index as _rebuild_search_index,
+)
+
 def connect():
     """
-    Establish a connection to the SQLite database.
-    Ensures the directory exists before creating the database file.
+    Open a new, tuned connection to the SQLite database.
+    The caller owns the connection and must close it; db_manager functions
+    use the pooled connection from get_connection()/transaction() instead.
     """
-    # Get the directory of the database file
-    db_dir = Path.cwd()
-    db_path = db_dir / "invoice_app.db"
-    
-    # Create the directory if it doesn't exist
-    os.makedirs(db_dir, exist_ok=True)
-    
-    # Connect to the database
-    return sqlite3.connect(str(db_path))
+    return _connections.open()
+
+def get_connection():
+    """Context manager yielding the calling thread's pooled connection for reads."""
+    return _connections.connection()
+
+def transaction():
+    """Context manager yielding the pooled connection; commits on success, rolls back on error."""
+    return _connections.transaction()
+
+def read_transaction():
+    """Context manager yielding the pooled connection inside one read transaction (one snapshot)."""
+    return _connections.read_transaction()
+
+def set_database_path(db_path, read_only=False):
+    """
+    Point every db_manager function at another database file.
+
+    Args:
+        db_path (str | Path): Database file to use
+        read_only (bool): Open connections with mode=ro (e.g. for export workers)
+    """
+    _connections.configure(db_path, read_only=read_only)
+
+def get_database_path():
+    """Absolute path of the database file db_manager functions use."""
+    return _connections.db_path.resolve()
+
+def close_connections():
+    """Close all pooled connections (they are reopened on next use)."""
+    _connections.close_all()
+
+# Date formats found in the invoices/challans date column, most specific first
+DATE_FORMATS = ("%d/%m/%Y", "%m/%d/%Y", "%Y-%m-%d", "%d-%m-%y", "%d-%m-%Y")
+
+@lru_cache(maxsize=4096)
+def parse_date_iso(value):
+    """
+    Normalise a stored date string to 'YYYY-MM-DD'.
+
+    Args:
+        value (str): Date as saved by the UI (dd-MM-yyyy, dd/MM/yyyy, ...)
+
+    Returns:
+        str: ISO date, or None if the value matches none of DATE_FORMATS
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        # Reject two-digit years matched by a four-digit pattern (e.g. 02/05/25)
+        if parsed.year >= 1900:
+            return parsed.strftime("%Y-%m-%d")
+    return None
+
+def _build_filter(search_index, search=None, status_column=None, status=None,
+                  date_column=None, date_from=None, date_to=None):
+    """
+    Turn UI filter values into a parameterised WHERE clause.
+
+    Args:
+        search_index (str): FTS table (see search_index.py) matched against the search text
+        search (str): Free text; every word must prefix-match an indexed column
+        status_column (str): Column compared with status
+        status (str): Exact status to keep ('All' or empty keeps everything)
+        date_column (str): ISO 'YYYY-MM-DD' date column (indexed)
+        date_from (str): Inclusive lower bound, 'YYYY-MM-DD'
+        date_to (str): Inclusive upper bound, 'YYYY-MM-DD'
+
+    Returns:
+        tuple: (sql, params) where sql is '' or starts with 'WHERE'
+    """
+    conditions = []
+    params = []
+
+    match_query = build_match_query(search)
+    if match_query:
+        conditions.append(f"id IN (SELECT rowid FROM {search_index} WHERE {search_index} MATCH ?)")
+        params.append(match_query)
+
+    if status_column and status and status != 'All':
+        conditions.append(f"{status_column} = ?")
+        params.append(status)
+
+    # Rows whose date could not be parsed (NULL) are never filtered out by the date range
+    if date_column and (date_from or date_to):
+        bounds = []
+        if date_from:
+            bounds.append(f"{date_column} >= ?")
+            params.append(str(date_from))
+        if date_to:
+            bounds.append(f"{date_column} <= ?")
+            params.append(str(date_to))
+        conditions.append(f"(({' AND '.join(bounds)}) OR {date_column} IS NULL)")
+
+    if not conditions:
+        return "", []
+    return "WHERE " + " AND ".join(conditions), params
+
+def build_invoice_filter(search=None, payment_status=None, date_from=None, date_to=None):
+    """
+    Build the WHERE clause used by the invoice listing.
+
+    Args:
+        search (str): Matches invoice no., customer name, address or GSTIN
+        payment_status (str): 'Paid', 'Pending' or 'All'
+        date_from (str): Inclusive lower bound, 'YYYY-MM-DD'
+        date_to (str): Inclusive upper bound, 'YYYY-MM-DD'
+
+    Returns:
+        tuple: (sql, params)
+    """
+    return _build_filter(
+        "invoices_fts", search,
+        "payment_status", payment_status,
+        "date_iso", date_from, date_to,
+    )
+
+def build_challan_filter(search=None, date_from=None, date_to=None):
+    """
+    Build the WHERE clause used by the challan listing.
+
+    Args:
+        search (str): Matches challan no., customer name, address or GSTIN
+        date_from (str): Inclusive lower bound, 'YYYY-MM-DD'
+        date_to (str): Inclusive upper bound, 'YYYY-MM-DD'
+
+    Returns:
+        tuple: (sql, params)
+    """
+    return _build_filter(
+        "challans_fts", search,
+        date_column="date_iso", date_from=date_from, date_to=date_to,
+    )
 
 def create_tables():
-    """Create the necessary tables if they don't exist"""
-    conn = connect()
-    cursor = conn.cursor()
+    """
+    Bring the database schema up to date by applying pending SCHEMA_MIGRATIONS.
+
+    Call once at startup; when the schema is current this only reads
+    PRAGMA user_version.
+
+    Returns:
+        list: Versions of the migrations that were applied
+    """
+    with get_connection() as conn:
+        return migrate(conn, SCHEMA_MIGRATIONS)
+
+def _create_schema(cursor):
+    """
+    Baseline schema (migration 1). Idempotent, so it also upgrades databases
+    created before versioning by any older build of the app.
+    """
     
     # Create invoices table
     cursor.execute("""
@@ -46,6 +201,10 @@ def create_tables():
     columns = [col[1] for col in cursor.fetchall()]
     if "payment_status" not in columns:
         cursor.execute("ALTER TABLE invoices ADD COLUMN payment_status TEXT DEFAULT 'Pending'")
+    # Canonical ISO date used for filtering and ordering; backfilled once when added
+    if "date_iso" not in columns:
+        cursor.execute("ALTER TABLE invoices ADD COLUMN date_iso TEXT")
+        _backfill_date_iso(cursor, "invoices")
     
     
     # Create invoice_items table
@@ -135,6 +294,12 @@ def create_tables():
         )
     ''')
     
+    cursor.execute("PRAGMA table_info(challans)")
+    columns = [col[1] for col in cursor.fetchall()]
+    if "date_iso" not in columns:
+        cursor.execute("ALTER TABLE challans ADD COLUMN date_iso TEXT")
+        _backfill_date_iso(cursor, "challans")
+    
     # Create challan_items table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS challan_items (
@@ -154,6 +319,12 @@ def create_tables():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_challan_no ON challans (challan_no)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_challan_items_challan_id ON challan_items (challan_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_challans_date ON challans (date)')  
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoice_items_invoice_id ON invoice_items (invoice_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_challans_date_iso ON challans (date_iso)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoices_date_iso ON invoices (date_iso)')
+    cursor.execute('DROP INDEX IF EXISTS idx_invoices_status_date')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoices_status_date_iso ON invoices (payment_status, date_iso)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoices_customer_name ON invoices (customer_name)')
 
     # Create customers table
     cursor.execute('''
@@ -180,8 +351,118 @@ def create_tables():
         ON customers(gstin)
     ''')
 
-    conn.commit()
-    conn.close()
+    # Full-text search indexes and their sync triggers
+    create_search_index(cursor)
+
+    # Dashboard totals, kept current by triggers on invoices
+    _create_invoice_stats(cursor)
+
+# (version, description, function taking a cursor); append new steps, never edit applied ones
+def _unique_invoice_taxes(cursor):
+    """Migration 2: drop duplicate tax rows left by re-saves and forbid new ones"""
+    cursor.execute("""
+        DELETE FROM invoice_taxes
+        WHERE id NOT IN (SELECT MIN(id) FROM invoice_taxes GROUP BY invoice_id, gst_percent)
+    """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_invoice_taxes_invoice_rate
+        ON invoice_taxes (invoice_id, gst_percent)
+    """)
+
+def _company_logo(cursor):
+    """
+    Migration 3: keep pre-scaled logo renditions in the database.
+
+    company_info.logo_digest names the current logo (and changes with it);
+    the PNG blobs live in their own row so SELECT * FROM company_info stays small.
+    An existing logo file is imported once, if it is still there.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS company_logo (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            digest TEXT NOT NULL,
+            print_png BLOB NOT NULL,
+            screen_png BLOB NOT NULL
+        )
+    """)
+    cursor.execute("PRAGMA table_info(company_info)")
+    if 'logo_digest' not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE company_info ADD COLUMN logo_digest TEXT")
+
+    cursor.execute("SELECT logo_path FROM company_info WHERE id = 1")
+    row = cursor.fetchone()
+    if row and row[0] and os.path.exists(row[0]):
+        from .logo import prepare_logo
+        logo = prepare_logo(row[0])
+        if logo:
+            _store_company_logo(cursor, logo)
+
+SCHEMA_MIGRATIONS = [
+    (1, "baseline schema", _create_schema),
+    (2, "unique invoice_taxes per invoice and rate", _unique_invoice_taxes),
+    (3, "company logo renditions", _company_logo),
+]
+
+def rebuild_search_index():
+    """
+    Rebuild all full-text search indexes from their source tables.
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        with transaction() as conn:
+            _rebuild_search_index(conn.cursor())
+        return True
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return False
+
+def _backfill_date_iso(cursor, table):
+    """
+    Fill date_iso from the free-form date column of invoices or challans.
+
+    Args:
+        cursor: Cursor inside the schema transaction
+        table (str): 'invoices' or 'challans'
+
+    Returns:
+        list: (id, date) rows whose date could not be parsed (left NULL)
+    """
+    cursor.execute(f"SELECT id, date FROM {table} WHERE date_iso IS NULL")
+    rows = cursor.fetchall()
+
+    updates = []
+    unparsed = []
+    for row_id, date in rows:
+        date_iso = parse_date_iso(date)
+        if date_iso:
+            updates.append((date_iso, row_id))
+        else:
+            unparsed.append((row_id, date))
+
+    cursor.executemany(f"UPDATE {table} SET date_iso = ? WHERE id = ?", updates)
+    if updates:
+        print(f"Backfilled date_iso for {len(updates)} {table}")
+    if unparsed:
+        print(f"Warning: could not parse the date of {len(unparsed)} {table}:")
+        for row_id, date in unparsed:
+            print(f"  id={row_id} date={date!r}")
+    return unparsed
+
+_INSERT_INVOICE_ITEM_SQL = """
+    INSERT INTO invoice_items (
+        invoice_id, description, hsn, quantity, type, rate, gst_percent, total
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _invoice_item_rows(invoice_id, items):
+    """Parameter tuples for _INSERT_INVOICE_ITEM_SQL"""
+    return [
+        (invoice_id, item['description'], item['hsn'], item['quantity'],
+         item['type'], item['rate'], item['gst'], item['total'])
+        for item in items
+    ]
 
 def save_invoice(invoice_data, items):
     """
@@ -195,119 +476,110 @@ def save_invoice(invoice_data, items):
         int: ID of the saved invoice, or None if an error occurred
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        # Check if invoice number already exists
-        cursor.execute("SELECT id FROM invoices WHERE invoice_no = ?", (invoice_data['invoice_no'],))
-        existing = cursor.fetchone()
-        
-        # Make sure payment_status is included, default to 'Pending' if not provided
-        payment_status = invoice_data.get('payment_status', 'Pending')
-        print(f"Processing invoice with payment status: {payment_status}")
-        
-        if existing:
-            print(f"Warning: Invoice number {invoice_data['invoice_no']} already exists. Updating existing invoice.")
-            invoice_id = existing[0]
+        with transaction() as conn:
+            cursor = conn.cursor()
             
-            # Update existing invoice - now including payment_status
-            cursor.execute("""
-                UPDATE invoices SET
-                    customer_name = ?,
-                    customer_address = ?,
-                    gstin = ?,
-                    state = ?,
-                    state_code = ?,
-                    date = ?,
-                    challan = ?,
-                    transporter = ?,
-                    consignment = ?,
-                    grand_total = ?,
-                    payment_status = ?
-                WHERE id = ?
-            """, (
-                invoice_data['customer_name'],
-                invoice_data['customer_address'],
-                invoice_data['gstin'],
-                invoice_data['state'],
-                invoice_data['state_code'],
-                invoice_data['date'],
-                invoice_data['challan'],
-                invoice_data['transporter'],
-                invoice_data['consignment'],
-                invoice_data['grand_total'],
-                payment_status,
-                invoice_id
-            ))
+            # Check if invoice number already exists
+            cursor.execute("SELECT id FROM invoices WHERE invoice_no = ?", (invoice_data['invoice_no'],))
+            existing = cursor.fetchone()
             
-            # Delete existing items for this invoice
-            cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
-        else:
-            # Insert new invoice - now including payment_status
-            cursor.execute("""
-                INSERT INTO invoices (
-                    customer_name, customer_address, gstin, state, state_code,
-                    invoice_no, date, challan, transporter, consignment, grand_total,
+            # Make sure payment_status is included, default to 'Pending' if not provided
+            payment_status = invoice_data.get('payment_status', 'Pending')
+            
+            if existing:
+                print(f"Warning: Invoice number {invoice_data['invoice_no']} already exists. Updating existing invoice.")
+                invoice_id = existing[0]
+                
+                # Update existing invoice - now including payment_status
+                cursor.execute("""
+                    UPDATE invoices SET
+                        customer_name = ?,
+                        customer_address = ?,
+                        gstin = ?,
+                        state = ?,
+                        state_code = ?,
+                        date = ?,
+                        date_iso = ?,
+                        challan = ?,
+                        transporter = ?,
+                        consignment = ?,
+                        grand_total = ?,
+                        payment_status = ?
+                    WHERE id = ?
+                """, (
+                    invoice_data['customer_name'],
+                    invoice_data['customer_address'],
+                    invoice_data['gstin'],
+                    invoice_data['state'],
+                    invoice_data['state_code'],
+                    invoice_data['date'],
+                    parse_date_iso(invoice_data['date']),
+                    invoice_data['challan'],
+                    invoice_data['transporter'],
+                    invoice_data['consignment'],
+                    invoice_data['grand_total'],
+                    payment_status,
+                    invoice_id
+                ))
+                
+                # Delete existing items for this invoice
+                cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
+            else:
+                # Insert new invoice - now including payment_status
+                cursor.execute("""
+                    INSERT INTO invoices (
+                        customer_name, customer_address, gstin, state, state_code,
+                        invoice_no, date, date_iso, challan, transporter, consignment,
+                        grand_total, payment_status
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    invoice_data['customer_name'],
+                    invoice_data['customer_address'],
+                    invoice_data['gstin'],
+                    invoice_data['state'],
+                    invoice_data['state_code'],
+                    invoice_data['invoice_no'],
+                    invoice_data['date'],
+                    parse_date_iso(invoice_data['date']),
+                    invoice_data['challan'],
+                    invoice_data['transporter'],
+                    invoice_data['consignment'],
+                    invoice_data['grand_total'],
                     payment_status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                invoice_data['customer_name'],
-                invoice_data['customer_address'],
-                invoice_data['gstin'],
-                invoice_data['state'],
-                invoice_data['state_code'],
-                invoice_data['invoice_no'],
-                invoice_data['date'],
-                invoice_data['challan'],
-                invoice_data['transporter'],
-                invoice_data['consignment'],
-                invoice_data['grand_total'],
-                payment_status
-            ))
+                ))
+                
+                invoice_id = cursor.lastrowid  # Get the auto-generated invoice ID
             
-            invoice_id = cursor.lastrowid  # Get the auto-generated invoice ID
-        
-        # Insert line items
-        for item in items:
-            cursor.execute("""
-                INSERT INTO invoice_items (
-                    invoice_id, description, hsn, quantity, type, rate, gst_percent, total
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                invoice_id,
-                item['description'],
-                item['hsn'],
-                item['quantity'],
-                item['type'],
-                item['rate'],
-                item['gst'],
-                item['total']
-            ))
-        
-        # Verify payment status was saved correctly
-        cursor.execute("SELECT payment_status FROM invoices WHERE id = ?", (invoice_id,))
-        saved_status = cursor.fetchone()[0]
-        print(f"Verified: Invoice {invoice_id} saved with payment status: {saved_status}")
-        
-        conn.commit()
-        conn.close()
+            # Insert line items
+            cursor.executemany(_INSERT_INVOICE_ITEM_SQL, _invoice_item_rows(invoice_id, items))
+            
+        _pdf_cache.invalidate("invoice", invoice_id)
+        _events.publish(INVOICES, UPDATE if existing else INSERT, invoice_id)
         return invoice_id
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         return None
     except Exception as e:
         print(f"Error saving invoice: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         return None
 
 # Add this function to your db_manager.py file
 
+INVOICE_PAGE_SIZE = 100
+
+_INVOICE_LIST_COLUMNS = """
+    i.id, i.invoice_no, i.date, i.customer_name, i.customer_address, i.gstin,
+    i.state, i.state_code, i.challan, i.transporter, i.consignment,
+    i.grand_total, i.payment_status
+"""
+
+def _invoice_list_row(row):
+    """Convert a listing row to the dict shape ManageInvoice expects"""
+    invoice_data = dict(row)
+    invoice_data['items'] = [{'count': invoice_data['item_count']}]  # Mock items structure for compatibility
+    return invoice_data
+
 def get_all_invoices():
     """
     Retrieve all invoices from the database with their basic information
@@ -316,55 +588,179 @@ def get_all_invoices():
         list: List of invoice dictionaries, or empty list if none found
     """
     try:
-        conn = connect()
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        cursor = conn.cursor()
-        
-        # Get all invoices with basic information
-        cursor.execute("""
-            SELECT 
-                id,
-                invoice_no,
-                date,
-                customer_name,
-                customer_address,
-                gstin,
-                state,
-                state_code,
-                challan,
-                transporter,
-                consignment,
-                grand_total,
-                payment_status
-            FROM invoices 
-            ORDER BY id DESC
-        """)
-        
-        invoices_rows = cursor.fetchall()
-        invoices = []
-        
-        for invoice_row in invoices_rows:
-            invoice_data = dict(invoice_row)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row  # Return rows as dictionaries
             
-            # Get item count for this invoice
-            cursor.execute("SELECT COUNT(*) as item_count FROM invoice_items WHERE invoice_id = ?", (invoice_data['id'],))
-            item_count_row = cursor.fetchone()
-            invoice_data['items'] = [{'count': item_count_row['item_count']}]  # Mock items structure for compatibility
+            # Item counts come from one grouped join instead of a query per invoice
+            cursor.execute(f"""
+                SELECT {_INVOICE_LIST_COLUMNS}, COUNT(ii.id) AS item_count
+                FROM invoices i
+                LEFT JOIN invoice_items ii ON ii.invoice_id = i.id
+                GROUP BY i.id
+                ORDER BY i.id DESC
+            """)
             
-            invoices.append(invoice_data)
+            invoices = [_invoice_list_row(row) for row in cursor.fetchall()]
         
-        conn.close()
         return invoices
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        if conn:
-            conn.close()
         return []
     except Exception as e:
         print(f"Error retrieving invoices: {e}")
-        if conn:
-            conn.close()
+        return []
+
+def list_invoices(after_id=None, limit=INVOICE_PAGE_SIZE, filters=None, order="newest"):
+    """
+    Fetch one page of invoices using keyset pagination on id.
+
+    Args:
+        after_id (int): Last id of the previous page, or None for the first page
+        limit (int): Maximum number of invoices to return
+        filters (dict): Keyword arguments for build_invoice_filter
+        order (str): 'newest' (id descending) or 'oldest' (id ascending)
+
+    Returns:
+        dict: 'invoices' (list of invoice dicts with 'item_count'),
+              'next_after_id' (pass back for the next page, None when done) and,
+              on the first page only, 'total', 'paid' and 'pending' counts
+              for the whole filtered set
+    """
+    result = {"invoices": [], "next_after_id": None}
+    if after_id is None:
+        result.update(total=0, paid=0, pending=0)
+
+    try:
+        where, params = build_invoice_filter(**(filters or {}))
+        newest = order != "oldest"
+        direction = "DESC" if newest else "ASC"
+
+        page_where = where
+        page_params = list(params)
+        if after_id is not None:
+            page_where += (" AND " if where else "WHERE ") + ("id < ?" if newest else "id > ?")
+            page_params.append(after_id)
+
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+
+            # Page the invoices first, then count items for just that page
+            cursor.execute(f"""
+                SELECT {_INVOICE_LIST_COLUMNS}, COUNT(ii.id) AS item_count
+                FROM (
+                    SELECT * FROM invoices
+                    {page_where}
+                    ORDER BY id {direction}
+                    LIMIT ?
+                ) i
+                LEFT JOIN invoice_items ii ON ii.invoice_id = i.id
+                GROUP BY i.id
+                ORDER BY i.id {direction}
+            """, page_params + [limit])
+            result["invoices"] = [_invoice_list_row(row) for row in cursor.fetchall()]
+
+            if after_id is None:
+                cursor.execute(f"""
+                    SELECT COUNT(*) AS total,
+                           COALESCE(SUM(payment_status = 'Paid'), 0) AS paid
+                    FROM invoices
+                    {where}
+                """, params)
+                counts = cursor.fetchone()
+                result.update(total=counts['total'], paid=counts['paid'],
+                              pending=counts['total'] - counts['paid'])
+
+        if len(result["invoices"]) == limit:
+            result["next_after_id"] = result["invoices"][-1]['id']
+        return result
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return result
+
+def list_invoice_ids(filters=None):
+    """
+    Ids of every invoice matching the listing filters, oldest first.
+
+    Args:
+        filters (dict): Keyword arguments for build_invoice_filter
+
+    Returns:
+        list: Invoice ids, or empty list on error
+    """
+    try:
+        where, params = build_invoice_filter(**(filters or {}))
+        with get_connection() as conn:
+            cursor = conn.execute(f"SELECT id FROM invoices {where} ORDER BY id", params)
+            return [row[0] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+def search_invoices(search_term, limit=50):
+    """
+    Full-text search over invoice headers and item descriptions, best match first.
+
+    Args:
+        search_term (str): Words to look for; each is matched as a prefix
+        limit (int): Maximum number of invoices to return
+
+    Returns:
+        list: Invoice dicts (same shape as list_invoices) ranked by bm25
+    """
+    match_query = build_match_query(search_term)
+    if not match_query:
+        return []
+
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+
+            # Take the best matches from each index (ORDER BY rank LIMIT is
+            # optimised inside FTS5), then merge them per invoice
+            cursor.execute(f"""
+                WITH header_hits AS (
+                    SELECT rowid AS invoice_id, rank AS score
+                    FROM invoices_fts
+                    WHERE invoices_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ),
+                item_hits AS (
+                    SELECT rowid AS item_id, rank AS score
+                    FROM invoice_items_fts
+                    WHERE invoice_items_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                ),
+                ranked AS (
+                    SELECT invoice_id, MIN(score) AS score
+                    FROM (
+                        SELECT invoice_id, score FROM header_hits
+                        UNION ALL
+                        SELECT items.invoice_id, item_hits.score
+                        FROM item_hits
+                        JOIN invoice_items items ON items.id = item_hits.item_id
+                    )
+                    GROUP BY invoice_id
+                    ORDER BY score
+                    LIMIT ?
+                )
+                SELECT {_INVOICE_LIST_COLUMNS},
+                       (SELECT COUNT(*) FROM invoice_items ii WHERE ii.invoice_id = i.id) AS item_count
+                FROM ranked
+                JOIN invoices i ON i.id = ranked.invoice_id
+                ORDER BY ranked.score
+            """, (match_query, limit, match_query, limit * 4, limit))
+
+            return [_invoice_list_row(row) for row in cursor.fetchall()]
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
         return []
 
 def get_invoice(invoice_id):
@@ -378,33 +774,85 @@ def get_invoice(invoice_id):
         tuple: (invoice_data, items) or (None, None) if not found
     """
     try:
-        conn = connect()
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        cursor = conn.cursor()
-        
-        # Get invoice data
-        cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,))
-        invoice_row = cursor.fetchone()
-        
-        if not invoice_row:
-            return None, None
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row  # Return rows as dictionaries
+            
+            # Get invoice data
+            cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,))
+            invoice_row = cursor.fetchone()
+            
+            if not invoice_row:
+                return None, None
+                
+            invoice_data = dict(invoice_row)
+            
+            # Get items
+            cursor.execute("SELECT * FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
+            items_rows = cursor.fetchall()
+            items = [dict(row) for row in items_rows]
             
-        invoice_data = dict(invoice_row)
-        
-        # Get items
-        cursor.execute("SELECT * FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
-        items_rows = cursor.fetchall()
-        items = [dict(row) for row in items_rows]
-        
-        conn.close()
         return invoice_data, items
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        if conn:
-            conn.close()
         return None, None
 
+@dataclass(frozen=True)
+class InvoiceDocument:
+    """
+    Everything needed to show or print one invoice, read from one snapshot.
+
+    Rows are sqlite3.Row objects (read-only, indexable by column name) and
+    the row lists are tuples, so a loaded document cannot be changed.
+    """
+    invoice: sqlite3.Row
+    items: tuple
+    taxes: tuple        # ordered by gst_percent, with taxable_amount per rate
+    company: Optional[sqlite3.Row]
+
+def _read_invoice_document(invoice_id):
+    with read_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,))
+        invoice = cursor.fetchone()
+        if invoice is None:
+            return None
+        cursor.execute("SELECT * FROM invoice_items WHERE invoice_id = ? ORDER BY id", (invoice_id,))
+        items = tuple(cursor.fetchall())
+        cursor.execute(_INVOICE_TAXES_SQL, (invoice_id,))
+        taxes = tuple(cursor.fetchall())
+        cursor.execute("SELECT * FROM company_info WHERE id = 1")
+        company = cursor.fetchone()
+    return InvoiceDocument(invoice, items, taxes, company)
+
+def load_invoice_document(invoice_id):
+    """
+    Load an invoice's header, items, taxes and the company row together.
+
+    All four queries run on the thread's pooled connection in one read
+    transaction. Tax rows missing for an invoice with items (invoices
+    saved by older builds) are computed first, once.
+
+    Args:
+        invoice_id (int): ID of the invoice
+
+    Returns:
+        InvoiceDocument: The invoice, or None if it does not exist or on error
+    """
+    try:
+        document = _read_invoice_document(invoice_id)
+        if document is not None and document.items and not document.taxes:
+            print(f"Tax data missing for invoice {invoice_id}, calculating...")
+            if compute_invoice_taxes([invoice_id]):
+                document = _read_invoice_document(invoice_id)
+        return document
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return None
+
 def delete_invoice(invoice_id):
     """
     Delete an invoice and its items from the database
@@ -414,33 +862,29 @@ def delete_invoice(invoice_id):
         bool: True if successful, False otherwise
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        # Delete items first (foreign key constraint)
-        cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
-        
-        # Delete invoice
-        cursor.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
-        
-        # Check if any rows were affected
-        success = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Delete items and tax rows first (foreign key constraint)
+            cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
+            cursor.execute("DELETE FROM invoice_taxes WHERE invoice_id = ?", (invoice_id,))
+            
+            # Delete invoice
+            cursor.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
+            
+            # Check if any rows were affected
+            success = cursor.rowcount > 0
+            
+        _pdf_cache.invalidate("invoice", invoice_id)
+        if success:
+            _events.publish(INVOICES, DELETE, invoice_id)
         return success
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         return False
     except Exception as e:
         print(f"Error deleting invoice: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         return False
 
 def update_payment_status(invoice_id, new_status):
@@ -455,135 +899,198 @@ def update_payment_status(invoice_id, new_status):
         bool: True if successful, False otherwise
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        # Update payment status
-        cursor.execute("""
-            UPDATE invoices 
-            SET payment_status = ? 
-            WHERE id = ?
-        """, (new_status, invoice_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Update payment status
+            cursor.execute("""
+                UPDATE invoices 
+                SET payment_status = ? 
+                WHERE id = ?
+            """, (new_status, invoice_id))
+            
+            success = cursor.rowcount > 0
         
+        _pdf_cache.invalidate("invoice", invoice_id)
+        if success:
+            _events.publish(INVOICES, UPDATE, invoice_id)
         print(f"Updated invoice {invoice_id} payment status to: {new_status}")
         return success
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         return False
     except Exception as e:
         print(f"Error updating payment status: {e}")
-        if conn:
-            conn.rollback()
-            conn.close()
         return False
     
-def calculate_and_insert_invoice_taxes(invoice_id: int):
+def save_invoices_bulk(invoices):
+    """
+    Save many new invoices, their line items and tax rows in one transaction.
 
-    conn = sqlite3.connect('invoice_app.db')
-    cursor = conn.cursor()
+    Meant for data migration and bulk generation: ids are allocated up front
+    and every table is written with executemany. The batch is all-or-nothing;
+    if any invoice number already exists (or repeats within the batch)
+    nothing is written.
 
-    # 1. Group items by GST percent and sum their totals
-    cursor.execute("""
-        SELECT gst_percent, SUM(total) AS taxable_total
-        FROM invoice_items
-        WHERE invoice_id = ?
-        GROUP BY gst_percent
-    """, (invoice_id,))
-    
-    gst_groups = cursor.fetchall()
-
-    for gst_percent, taxable_total in gst_groups:
-        gst_percent = float(gst_percent)
-        taxable_total = float(taxable_total)
-
-        if gst_percent == 0:
-            sgst = cgst = igst = total_tax = 0.0
-        elif gst_percent in (5, 12, 18, 28):  # Assume intra-state
-            sgst = taxable_total * (gst_percent / 2) / 100
-            cgst = taxable_total * (gst_percent / 2) / 100
-            igst = 0.0
-            total_tax = sgst + cgst
-        else:
-            # Handle IGST-only case (inter-state)
-            sgst = cgst = 0.0
-            igst = taxable_total * gst_percent / 100
-            total_tax = igst
+    Args:
+        invoices (list): (invoice_data, items) pairs, shaped like the
+                         arguments of save_invoice
 
-        # 2. Insert the tax summary for this GST rate
-        cursor.execute("""
-            INSERT INTO invoice_taxes (invoice_id, gst_percent, sgst_amount, cgst_amount, igst_amount, tax_total)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (invoice_id, gst_percent, sgst, cgst, igst, total_tax))
+    Returns:
+        list: Assigned invoice ids in input order, or None if an error occurred
+    """
+    if not invoices:
+        return []
+
+    invoice_nos = [invoice_data['invoice_no'] for invoice_data, _ in invoices]
+    if len(set(invoice_nos)) != len(invoice_nos):
+        print("Error: duplicate invoice numbers within the batch")
+        return None
+
+    try:
+        with transaction() as conn:
+            cursor = conn.cursor()
+            # Take the write lock now so the ids allocated below stay free
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+
+            existing = []
+            for start in range(0, len(invoice_nos), 500):
+                chunk = invoice_nos[start:start + 500]
+                cursor.execute(
+                    f"SELECT invoice_no FROM invoices WHERE invoice_no IN ({', '.join('?' * len(chunk))})",
+                    chunk)
+                existing.extend(row[0] for row in cursor.fetchall())
+            if existing:
+                print(f"Error: {len(existing)} invoice numbers already exist, e.g. {existing[0]}")
+                return None
+
+            # AUTOINCREMENT never reuses ids, so start after the highest ever issued
+            cursor.execute("""
+                SELECT MAX(COALESCE((SELECT MAX(id) FROM invoices), 0),
+                           COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'invoices'), 0))
+            """)
+            first_id = cursor.fetchone()[0] + 1
+            invoice_ids = list(range(first_id, first_id + len(invoices)))
+
+            header_rows = []
+            item_rows = []
+            for invoice_id, (invoice_data, items) in zip(invoice_ids, invoices):
+                header_rows.append((
+                    invoice_id,
+                    invoice_data['customer_name'],
+                    invoice_data['customer_address'],
+                    invoice_data['gstin'],
+                    invoice_data['state'],
+                    invoice_data['state_code'],
+                    invoice_data['invoice_no'],
+                    invoice_data['date'],
+                    parse_date_iso(invoice_data['date']),
+                    invoice_data['challan'],
+                    invoice_data['transporter'],
+                    invoice_data['consignment'],
+                    invoice_data['grand_total'],
+                    invoice_data.get('payment_status', 'Pending'),
+                ))
+                item_rows.extend(_invoice_item_rows(invoice_id, items))
+
+            cursor.executemany("""
+                INSERT INTO invoices (
+                    id, customer_name, customer_address, gstin, state, state_code,
+                    invoice_no, date, date_iso, challan, transporter, consignment,
+                    grand_total, payment_status
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, header_rows)
+            cursor.executemany(_INSERT_INVOICE_ITEM_SQL, item_rows)
+            _compute_invoice_taxes(cursor, invoice_ids)
+
+        _events.publish(INVOICES, INSERT, *invoice_ids)
+        return invoice_ids
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return None
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Error saving invoices: {e}")
+        return None
 
-    conn.commit()
-    conn.close()
 
+def _store_company_logo(cursor, logo):
+    """Write (digest, print_png, screen_png), or clear the logo when logo is None"""
+    if logo is None:
+        cursor.execute("DELETE FROM company_logo WHERE id = 1")
+        cursor.execute("UPDATE company_info SET logo_digest = NULL WHERE id = 1")
+        return
+    digest, print_png, screen_png = logo
+    cursor.execute("""
+        INSERT OR REPLACE INTO company_logo (id, digest, print_png, screen_png)
+        VALUES (1, ?, ?, ?)
+    """, (digest, sqlite3.Binary(print_png), sqlite3.Binary(screen_png)))
+    cursor.execute("UPDATE company_info SET logo_digest = ? WHERE id = 1", (digest,))
 
 def save_company_info(data):
     """
     Save or update the company information in a single-row table.
-    """
-    try:
-        conn = connect()
-        cursor = conn.cursor()
-
-        # Create table if not exists
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS company_info (
-            id INTEGER PRIMARY KEY CHECK (id = 1),
-            name TEXT,
-            gstin TEXT,
-            contact TEXT,
-            address TEXT,
-            logo_path TEXT,
-            bank_name TEXT,
-            account_number TEXT,
-            bank_ifsc TEXT,
-            bank_branch TEXT
-        )
-        """)
-
-        # Check if row exists
-        cursor.execute("SELECT id FROM company_info WHERE id = 1")
-        exists = cursor.fetchone()
 
-        if exists:
-            # Update existing
-            cursor.execute("""
-                UPDATE company_info SET
-                    name = ?, gstin = ?, contact = ?, address = ?, logo_path = ?,
-                    bank_name = ?, account_number = ?, bank_ifsc = ?, bank_branch = ?
-                WHERE id = 1
-            """, (
-                data['name'], data['gstin'], data['contact'], data['address'],
-                data['logo_path'], data['bank_name'], data['account_number'],
-                data['bank_ifsc'], data['bank_branch']
-            ))
-        else:
-            # Insert new
-            cursor.execute("""
-                INSERT INTO company_info (
-                    id, name, gstin, contact, address, logo_path,
-                    bank_name, account_number, bank_ifsc, bank_branch
-                ) VALUES (
-                    1, ?, ?, ?, ?, ?, ?, ?, ?, ?
-                )
-            """, (
-                data['name'], data['gstin'], data['contact'], data['address'],
-                data['logo_path'], data['bank_name'], data['account_number'],
-                data['bank_ifsc'], data['bank_branch']
-            ))
+    A new logo_path is decoded and stored as pre-scaled PNG renditions
+    (see models/logo.py); pass data['logo'] = prepare_logo(path) to reuse
+    renditions the caller already made. If logo_path is unchanged the stored
+    logo is kept, so it survives the original file being moved.
+    """
+    current = load_company_info() or {}
+    logo_path = data.get('logo_path')
+    if not logo_path:
+        logo = None
+    elif data.get('logo'):
+        logo = data['logo']
+    elif logo_path == current.get('logo_path') and current.get('logo_digest'):
+        logo = False  # keep the stored renditions
+    else:
+        from .logo import prepare_logo
+        logo = prepare_logo(logo_path)
 
-        conn.commit()
-        conn.close()
+    try:
+        with transaction() as conn:
+            cursor = conn.cursor()
+
+            # Check if row exists
+            cursor.execute("SELECT id FROM company_info WHERE id = 1")
+            exists = cursor.fetchone()
+
+            if exists:
+                # Update existing
+                cursor.execute("""
+                    UPDATE company_info SET
+                        name = ?, gstin = ?, contact = ?, address = ?, logo_path = ?,
+                        bank_name = ?, account_number = ?, bank_ifsc = ?, bank_branch = ?
+                    WHERE id = 1
+                """, (
+                    data['name'], data['gstin'], data['contact'], data['address'],
+                    data['logo_path'], data['bank_name'], data['account_number'],
+                    data['bank_ifsc'], data['bank_branch']
+                ))
+            else:
+                # Insert new
+                cursor.execute("""
+                    INSERT INTO company_info (
+                        id, name, gstin, contact, address, logo_path,
+                        bank_name, account_number, bank_ifsc, bank_branch
+                    ) VALUES (
+                        1, ?, ?, ?, ?, ?, ?, ?, ?, ?
+                    )
+                """, (
+                    data['name'], data['gstin'], data['contact'], data['address'],
+                    data['logo_path'], data['bank_name'], data['account_number'],
+                    data['bank_ifsc'], data['bank_branch']
+                ))
+
+            if logo is not False:
+                _store_company_logo(cursor, logo)
+
+        # The company header is on every document
+        _pdf_cache.invalidate()
+        _events.publish(COMPANY, UPDATE, 1)
         return True
 
     except sqlite3.Error as e:
@@ -597,12 +1104,11 @@ def load_company_info():
     Returns a dictionary or None if not found.
     """
     try:
-        conn = connect()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM company_info WHERE id = 1")
-        row = cursor.fetchone()
-        conn.close()
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT * FROM company_info WHERE id = 1")
+            row = cursor.fetchone()
 
         if row:
             return dict(row)
@@ -613,6 +1119,134 @@ def load_company_info():
         return None
 
 
+def load_company_logo():
+    """
+    Load the stored logo renditions.
+
+    Returns:
+        dict: digest, print_png and screen_png (PNG bytes), or None if no logo is set
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT digest, print_png, screen_png FROM company_logo WHERE id = 1")
+            row = cursor.fetchone()
+
+        if row:
+            return dict(row)
+        return None
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return None
+
+
+# Aggregates behind the dashboard; invoice_stats stores exactly these values
+_INVOICE_STATS_SQL = """
+    SELECT COUNT(*),
+           COALESCE(SUM(payment_status IS 'Paid'), 0),
+           COALESCE(SUM(payment_status IS 'Pending'), 0),
+           COALESCE(SUM(CASE WHEN payment_status IS 'Pending' THEN grand_total END), 0)
+    FROM invoices
+"""
+
+def _create_invoice_stats(cursor):
+    """Create the single-row invoice_stats table and the triggers that maintain it"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'invoice_stats'")
+    exists = cursor.fetchone() is not None
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS invoice_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_invoices INTEGER NOT NULL DEFAULT 0,
+            paid_bills INTEGER NOT NULL DEFAULT 0,
+            pending_bills INTEGER NOT NULL DEFAULT 0,
+            due_amount REAL NOT NULL DEFAULT 0.0
+        )
+    """)
+
+    # IS (not =) so a NULL payment_status counts as neither paid nor pending
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS invoice_stats_ai AFTER INSERT ON invoices BEGIN
+            UPDATE invoice_stats SET
+                total_invoices = total_invoices + 1,
+                paid_bills = paid_bills + (new.payment_status IS 'Paid'),
+                pending_bills = pending_bills + (new.payment_status IS 'Pending'),
+                due_amount = due_amount + CASE WHEN new.payment_status IS 'Pending'
+                                               THEN COALESCE(new.grand_total, 0) ELSE 0 END
+            WHERE id = 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS invoice_stats_ad AFTER DELETE ON invoices BEGIN
+            UPDATE invoice_stats SET
+                total_invoices = total_invoices - 1,
+                paid_bills = paid_bills - (old.payment_status IS 'Paid'),
+                pending_bills = pending_bills - (old.payment_status IS 'Pending'),
+                due_amount = due_amount - CASE WHEN old.payment_status IS 'Pending'
+                                               THEN COALESCE(old.grand_total, 0) ELSE 0 END
+            WHERE id = 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS invoice_stats_au AFTER UPDATE OF payment_status, grand_total ON invoices BEGIN
+            UPDATE invoice_stats SET
+                paid_bills = paid_bills - (old.payment_status IS 'Paid') + (new.payment_status IS 'Paid'),
+                pending_bills = pending_bills - (old.payment_status IS 'Pending') + (new.payment_status IS 'Pending'),
+                due_amount = due_amount
+                    - CASE WHEN old.payment_status IS 'Pending' THEN COALESCE(old.grand_total, 0) ELSE 0 END
+                    + CASE WHEN new.payment_status IS 'Pending' THEN COALESCE(new.grand_total, 0) ELSE 0 END
+            WHERE id = 1;
+        END
+    """)
+
+    if not exists:
+        _rebuild_invoice_stats(cursor)
+
+def _rebuild_invoice_stats(cursor):
+    """Recompute the invoice_stats row from the invoices table"""
+    cursor.execute(f"""
+        INSERT OR REPLACE INTO invoice_stats (id, total_invoices, paid_bills, pending_bills, due_amount)
+        SELECT 1, * FROM ({_INVOICE_STATS_SQL})
+    """)
+
+def check_invoice_stats(repair=True):
+    """
+    Compare invoice_stats with a full recount of the invoices table.
+
+    Args:
+        repair (bool): Rebuild the row from scratch if it is out of date
+
+    Returns:
+        bool: True if the stored totals were already correct, False otherwise
+    """
+    try:
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_INVOICE_STATS_SQL)
+            expected = cursor.fetchone()
+            cursor.execute("""
+                SELECT total_invoices, paid_bills, pending_bills, due_amount
+                FROM invoice_stats WHERE id = 1
+            """)
+            stored = cursor.fetchone()
+
+            consistent = (
+                stored is not None
+                and tuple(stored[:3]) == tuple(expected[:3])
+                and abs(stored[3] - expected[3]) < 0.005  # tolerate float drift from running sums
+            )
+            if not consistent:
+                print(f"invoice_stats out of date: stored {stored}, expected {tuple(expected)}")
+                if repair:
+                    _rebuild_invoice_stats(cursor)
+        return consistent
+
+    except sqlite3.Error as e:
+        print(f"Database error in check_invoice_stats: {e}")
+        return False
+
 def get_invoice_summary():
     """
     Get summary data for the invoice dashboard.
@@ -621,38 +1255,33 @@ def get_invoice_summary():
         dict: Contains total invoices, paid bills, pending bills, and due amount.
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        # Total invoices
-        cursor.execute("SELECT COUNT(*) FROM invoices")
-        total_invoices = cursor.fetchone()[0]
-        
-        # Paid bills
-        cursor.execute("SELECT COUNT(*) FROM invoices WHERE payment_status = 'Paid'")
-        paid_bills = cursor.fetchone()[0]
-        
-        # Pending bills
-        cursor.execute("SELECT COUNT(*) FROM invoices WHERE payment_status = 'Pending'")
-        pending_bills = cursor.fetchone()[0]
-        
-        # Due amount (sum of grand_total for pending invoices)
-        cursor.execute("SELECT COALESCE(SUM(grand_total), 0) FROM invoices WHERE payment_status = 'Pending'")
-        due_amount = cursor.fetchone()[0]
-        
-        conn.close()
-        
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT total_invoices, paid_bills, pending_bills, due_amount
+                FROM invoice_stats WHERE id = 1
+            """)
+            row = cursor.fetchone()
+        
+        if row is None:
+            # Row missing (e.g. deleted by hand): recreate it and read again
+            check_invoice_stats(repair=True)
+            with get_connection() as conn:
+                row = conn.execute("""
+                    SELECT total_invoices, paid_bills, pending_bills, due_amount
+                    FROM invoice_stats WHERE id = 1
+                """).fetchone()
+        
+        total_invoices, paid_bills, pending_bills, due_amount = row
         return {
             "total_invoices": total_invoices,
             "paid_bills": paid_bills,
             "pending_bills": pending_bills,
-            "due_amount": due_amount
+            "due_amount": round(due_amount, 2)
         }
         
     except sqlite3.Error as e:
         print(f"Database error in get_invoice_summary: {e}")
-        if conn:
-            conn.close()
         return {
             "total_invoices": 0,
             "paid_bills": 0,
@@ -662,6 +1291,133 @@ def get_invoice_summary():
 
      # TAX SECTION
 
+# Invoices taxed per calculate_many call, so a full backfill never holds every line at once
+TAX_CHUNK_INVOICES = 5000
+
+def _compute_invoice_taxes(cursor, invoice_ids=None):
+    """
+    Replace the invoice_taxes rows of the given invoices.
+
+    Invoices in scope are read in id order, TAX_CHUNK_INVOICES at a time;
+    each chunk's lines are taxed by InvoiceCalculator.calculate_many (the
+    one implementation of the tax rules, see invoice_calculator) and the
+    rows are written with executemany.
+
+    Args:
+        cursor: Cursor inside a write transaction
+        invoice_ids: One id, an iterable of ids, or None for every invoice
+
+    Returns:
+        int: Number of invoice_taxes rows written
+    """
+    cursor.execute("SELECT gstin FROM company_info WHERE id = 1")
+    company = cursor.fetchone()
+    calculator = InvoiceCalculator(company[0] if company else None)
+
+    params = {"invoice_id": None}
+    if invoice_ids is None:
+        scope = ""
+    elif isinstance(invoice_ids, int):
+        scope = "{column} = :invoice_id"
+        params["invoice_id"] = invoice_ids
+    else:
+        # Many ids go through a temp table instead of a huge IN (...) list
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS tax_scope (id INTEGER PRIMARY KEY)")
+        cursor.execute("DELETE FROM temp.tax_scope")
+        cursor.executemany("INSERT OR IGNORE INTO temp.tax_scope (id) VALUES (?)",
+                           ((invoice_id,) for invoice_id in invoice_ids))
+        scope = "{column} IN (SELECT id FROM temp.tax_scope)"
+    item_scope = scope.format(column="invoice_id")
+
+    cursor.execute(f"DELETE FROM invoice_taxes {'WHERE ' + item_scope if scope else ''}", params)
+
+    # A second cursor walks the invoices while this one reads lines and writes taxes
+    invoices = cursor.connection.cursor()
+    invoices.execute(f"""
+        SELECT id, state_code, gstin FROM invoices
+        {'WHERE ' + scope.format(column='id') if scope else ''}
+        ORDER BY id
+    """, params)
+    written = 0
+    while True:
+        chunk = invoices.fetchmany(TAX_CHUNK_INVOICES)
+        if not chunk:
+            break
+        places = {invoice_id: (state_code, gstin) for invoice_id, state_code, gstin in chunk}
+        cursor.execute(f"""
+            SELECT invoice_id, total, gst_percent, quantity, rate FROM invoice_items
+            WHERE invoice_id BETWEEN :first AND :last {'AND ' + item_scope if scope else ''}
+        """, dict(params, first=chunk[0][0], last=chunk[-1][0]))
+        # Lines whose invoice no longer exists get no tax rows
+        lines = [line for line in cursor.fetchall() if line[0] in places]
+        if not lines:
+            continue
+        invoice_column, totals, rates, quantities, unit_rates = zip(*lines)
+        batch = calculator.calculate_many(invoice_column, totals, rates, places, quantities, unit_rates)
+        cursor.executemany("""
+            INSERT INTO invoice_taxes (invoice_id, gst_percent, sgst_amount, cgst_amount, igst_amount, tax_total)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, batch.tax_rows())
+        written += len(batch)
+    return written
+
+def compute_invoice_taxes(invoice_ids=None):
+    """
+    Recompute the GST breakdown in invoice_taxes. Safe to re-run: existing
+    rows for the invoices in scope are replaced, never duplicated.
+
+    Args:
+        invoice_ids: One invoice id, a list of ids, or None for the whole database
+
+    Returns:
+        int: Number of tax rows written, or None if an error occurred
+    """
+    try:
+        with transaction() as conn:
+            return _compute_invoice_taxes(conn.cursor(), invoice_ids)
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return None
+
+def calculate_and_insert_invoice_taxes(invoice_id: int):
+    """Recompute the tax rows of a single invoice (see compute_invoice_taxes)."""
+    return compute_invoice_taxes(int(invoice_id))
+
+# Tax rows with the taxable amount per rate, summed in the same grouped query
+_INVOICE_TAXES_SQL = """
+    SELECT t.gst_percent, t.sgst_amount, t.cgst_amount, t.igst_amount, t.tax_total,
+           COALESCE(SUM(ii.total), 0.0) AS taxable_amount
+    FROM invoice_taxes t
+    LEFT JOIN invoice_items ii
+           ON ii.invoice_id = t.invoice_id
+          AND ROUND(COALESCE(ii.gst_percent, 0), 2) = ROUND(t.gst_percent, 2)
+    WHERE t.invoice_id = ?
+    GROUP BY t.id
+    ORDER BY t.gst_percent
+"""
+
+def get_invoice_taxes(invoice_id):
+    """
+    Retrieve the GST breakdown of an invoice, lowest rate first
+
+    Args:
+        invoice_id (int): ID of the invoice
+
+    Returns:
+        list: Tax rows as dictionaries, each with the taxable_amount of its
+              rate (empty if none or on error)
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(_INVOICE_TAXES_SQL, (invoice_id,))
+            return [dict(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+
 
      #  INVENTORY SECTION
 
@@ -687,27 +1443,26 @@ def add_inventory_item(product_name: str, product_code: str, category: str,
         bool: True if item was added successfully, False otherwise
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        # Check if product code already exists
-        cursor.execute("SELECT id FROM inventory_items WHERE product_code = ?", (product_code,))
-        if cursor.fetchone():
-            print(f"Error: Product code '{product_code}' already exists!")
-            conn.close()
-            return False
-        
-        # Insert new item
-        cursor.execute("""
-            INSERT INTO inventory_items 
-            (product_name, product_code, category, unit, quantity_in_stock, 
-             purchase_price, selling_price, gst_percentage, description)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (product_name, product_code, category, unit, quantity, 
-              purchase_price, selling_price, gst_percentage, description))
-        
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Check if product code already exists
+            cursor.execute("SELECT id FROM inventory_items WHERE product_code = ?", (product_code,))
+            if cursor.fetchone():
+                print(f"Error: Product code '{product_code}' already exists!")
+                return False
+            
+            # Insert new item
+            cursor.execute("""
+                INSERT INTO inventory_items 
+                (product_name, product_code, category, unit, quantity_in_stock, 
+                 purchase_price, selling_price, gst_percentage, description)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (product_name, product_code, category, unit, quantity, 
+                  purchase_price, selling_price, gst_percentage, description))
+            item_id = cursor.lastrowid
+        
+        _events.publish(INVENTORY, INSERT, item_id)
         print(f"Successfully added item: {product_name}")
         return True
         
@@ -725,9 +1480,6 @@ def update_inventory_item(item_id: int, **kwargs) -> bool:
         bool: True if update was successful, False otherwise
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
         # Build dynamic update query
         update_fields = []
         values = []
@@ -743,27 +1495,21 @@ def update_inventory_item(item_id: int, **kwargs) -> bool:
         
         if not update_fields:
             print("No valid fields to update")
-            conn.close()
             return False
         
-        # Add updated_at timestamp
-        """update_fields.append("updated_at = CURRENT_TIMESTAMP")"""
-        
         query = f"UPDATE inventory_items SET {', '.join(update_fields)} WHERE id = ?"
         values.append(item_id)
         
-        print(f"Executing query: {query}")  # Debug line
-        print(f"With values: {values}")     # Debug line
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, values)
+            updated = cursor.rowcount > 0
         
-        cursor.execute(query, values)
-        
-        if cursor.rowcount == 0:
+        if not updated:
             print(f"No item found with ID: {item_id}")
-            conn.close()
             return False
         
-        conn.commit()
-        conn.close()
+        _events.publish(INVENTORY, UPDATE, item_id)
         print(f"Successfully updated item ID: {item_id}")
         return True
         
@@ -785,18 +1531,16 @@ def delete_inventory_item(item_id: int) -> bool:
         bool: True if deletion was successful, False otherwise
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM inventory_items WHERE id = ?", (item_id,))
+            deleted = cursor.rowcount > 0
         
-        cursor.execute("DELETE FROM inventory_items WHERE id = ?", (item_id,))
-        
-        if cursor.rowcount == 0:
+        if not deleted:
             print(f"No item found with ID: {item_id}")
-            conn.close()
             return False
         
-        conn.commit()
-        conn.close()
+        _events.publish(INVENTORY, DELETE, item_id)
         print(f"Successfully deleted item ID: {item_id}")
         return True
         
@@ -807,36 +1551,37 @@ def delete_inventory_item(item_id: int) -> bool:
         print(f"Error deleting item: {e}")
         return False
 
+def _inventory_item_dict(columns, row):
+    """Build an inventory item dict, replacing NULLs with type-appropriate defaults"""
+    item_dict = dict(zip(columns, row))
+    # Ensure all values are properly handled
+    for key, value in item_dict.items():
+        if value is None:
+            if key in ['purchase_price', 'selling_price']:
+                item_dict[key] = 0.0
+            elif key in ['quantity_in_stock']:
+                item_dict[key] = 0
+            else:
+                item_dict[key] = ''
+    return item_dict
+
 def get_all_inventory_items():
     """Get all inventory items from database with better error handling."""
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, product_name, product_code, category, unit, 
-                   quantity_in_stock, purchase_price, selling_price, 
-                   gst_percentage, description
-            FROM inventory_items 
-            ORDER BY id DESC
-        """)
-        
-        columns = [description[0] for description in cursor.description]
-        items = []
-        for row in cursor.fetchall():
-            item_dict = dict(zip(columns, row))
-            # Ensure all values are properly handled
-            for key, value in item_dict.items():
-                if value is None:
-                    if key in ['purchase_price', 'selling_price']:
-                        item_dict[key] = 0.0
-                    elif key in ['quantity_in_stock']:
-                        item_dict[key] = 0
-                    else:
-                        item_dict[key] = ''
-            items.append(item_dict)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, product_name, product_code, category, unit, 
+                       quantity_in_stock, purchase_price, selling_price, 
+                       gst_percentage, description
+                FROM inventory_items 
+                ORDER BY id DESC
+            """)
+            
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
         
-        conn.close()
-        return items
+        return [_inventory_item_dict(columns, row) for row in rows]
         
     except Exception as e:
         print(f"Error fetching inventory items: {e}")
@@ -853,26 +1598,23 @@ def get_inventory_item_by_code(product_code: str) -> Optional[Dict[str, Any]]:
         Dictionary containing item data or None if not found
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, product_name, product_code, category, unit, 
-                   quantity_in_stock, purchase_price, selling_price, 
-                   gst_percentage, description, created_at, updated_at
-            FROM inventory_items 
-            WHERE product_code = ?
-        """, (product_code,))
-        
-        row = cursor.fetchone()
-        
-        if row:
-            columns = [description[0] for description in cursor.description]
-            item = dict(zip(columns, row))
-            conn.close()
-            return item
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, product_name, product_code, category, unit, 
+                       quantity_in_stock, purchase_price, selling_price, 
+                       gst_percentage, description, created_at, updated_at
+                FROM inventory_items 
+                WHERE product_code = ?
+            """, (product_code,))
+            
+            row = cursor.fetchone()
+            
+            if row:
+                columns = [description[0] for description in cursor.description]
+                return dict(zip(columns, row))
         
-        conn.close()
         return None
         
     except sqlite3.Error as e:
@@ -882,38 +1624,39 @@ def get_inventory_item_by_code(product_code: str) -> Optional[Dict[str, Any]]:
         print(f"Error retrieving item: {e}")
         return None
 
-def search_inventory_items(search_term: str) -> List[Dict[str, Any]]:
+def search_inventory_items(search_term: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
-    Search inventory items by name, code, or category.
+    Search inventory items by name, code, category, description or unit.
     
     Args:
-        search_term: Term to search for
+        search_term: Words to search for; each must prefix-match some field
+        limit: Maximum number of items to return (None for all matches)
     
     Returns:
-        List of dictionaries containing matching items
+        List of dictionaries containing matching items, best match first
     """
+    match_query = build_match_query(search_term)
+    if not match_query:
+        return []
+    
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        search_pattern = f"%{search_term}%"
-        cursor.execute("""
-            SELECT id, product_name, product_code, category, unit, 
-                   quantity_in_stock, purchase_price, selling_price, 
-                   gst_percentage, description
-            FROM inventory_items 
-            WHERE product_name LIKE ? OR product_code LIKE ? OR category LIKE ?
-            ORDER BY product_name
-        """, (search_pattern, search_pattern, search_pattern))
-        
-        columns = [description[0] for description in cursor.description]
-        items = []
-        
-        for row in cursor.fetchall():
-            item = dict(zip(columns, row))
-            items.append(item)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT i.id, i.product_name, i.product_code, i.category, i.unit, 
+                       i.quantity_in_stock, i.purchase_price, i.selling_price, 
+                       i.gst_percentage, i.description
+                FROM inventory_fts
+                JOIN inventory_items i ON i.id = inventory_fts.rowid
+                WHERE inventory_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (match_query, -1 if limit is None else limit))
+            
+            columns = [description[0] for description in cursor.description]
+            items = [_inventory_item_dict(columns, row) for row in cursor.fetchall()]
         
-        conn.close()
         return items
         
     except sqlite3.Error as e:
@@ -935,36 +1678,33 @@ def update_stock_quantity(product_code: str, quantity_change: int) -> bool:
         bool: True if update was successful, False otherwise
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        # Get current quantity
-        cursor.execute("SELECT quantity_in_stock FROM inventory_items WHERE product_code = ?", 
-                      (product_code,))
-        result = cursor.fetchone()
-        
-        if not result:
-            print(f"Product code '{product_code}' not found")
-            conn.close()
-            return False
-        
-        current_quantity = result[0]
-        new_quantity = current_quantity + quantity_change
-        
-        if new_quantity < 0:
-            print(f"Insufficient stock. Current: {current_quantity}, Requested: {abs(quantity_change)}")
-            conn.close()
-            return False
-        
-        # Update quantity
-        cursor.execute("""
-            UPDATE inventory_items 
-            SET quantity_in_stock = ?, updated_at = CURRENT_TIMESTAMP 
-            WHERE product_code = ?
-        """, (new_quantity, product_code))
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Get current quantity
+            cursor.execute("SELECT id, quantity_in_stock FROM inventory_items WHERE product_code = ?", 
+                          (product_code,))
+            result = cursor.fetchone()
+            
+            if not result:
+                print(f"Product code '{product_code}' not found")
+                return False
+            
+            item_id, current_quantity = result
+            new_quantity = current_quantity + quantity_change
+            
+            if new_quantity < 0:
+                print(f"Insufficient stock. Current: {current_quantity}, Requested: {abs(quantity_change)}")
+                return False
+            
+            # Update quantity
+            cursor.execute("""
+                UPDATE inventory_items 
+                SET quantity_in_stock = ?, updated_at = CURRENT_TIMESTAMP 
+                WHERE product_code = ?
+            """, (new_quantity, product_code))
         
-        conn.commit()
-        conn.close()
+        _events.publish(INVENTORY, UPDATE, item_id)
         print(f"Stock updated for {product_code}: {current_quantity} -> {new_quantity}")
         return True
         
@@ -986,26 +1726,21 @@ def get_low_stock_items(threshold: int = 10) -> List[Dict[str, Any]]:
         List of dictionaries containing low stock items
     """
     try:
-        conn = connect()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, product_name, product_code, category, unit, 
-                   quantity_in_stock, purchase_price, selling_price, 
-                   gst_percentage, description
-            FROM inventory_items 
-            WHERE quantity_in_stock <= ?
-            ORDER BY quantity_in_stock ASC
-        """, (threshold,))
-        
-        columns = [description[0] for description in cursor.description]
-        items = []
-        
-        for row in cursor.fetchall():
-            item = dict(zip(columns, row))
-            items.append(item)
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, product_name, product_code, category, unit, 
+                       quantity_in_stock, purchase_price, selling_price, 
+                       gst_percentage, description
+                FROM inventory_items 
+                WHERE quantity_in_stock <= ?
+                ORDER BY quantity_in_stock ASC
+            """, (threshold,))
+            
+            columns = [description[0] for description in cursor.description]
+            items = [dict(zip(columns, row)) for row in cursor.fetchall()]
         
-        conn.close()
         return items
         
     except sqlite3.Error as e:
@@ -1015,19 +1750,6 @@ def get_low_stock_items(threshold: int = 10) -> List[Dict[str, Any]]:
         print(f"Error retrieving low stock items: {e}")
         return []
 
-# Initialize database on import
-def initialize_database():
-    """Initialize the database by creating necessary tables."""
-    try:
-        create_tables()
-        print("Database initialized successfully")
-    except Exception as e:
-        print(f"Error initializing database: {e}")
-
-# Call initialization when module is imported
-if __name__ == "__main__":
-    initialize_database()
-
     # CHALLAN SECTION
 
 def save_challan(challan_data: Dict, items: List[Dict]) -> Optional[int]:
@@ -1041,65 +1763,59 @@ def save_challan(challan_data: Dict, items: List[Dict]) -> Optional[int]:
     Returns:
         challan_id if successful, None if failed
     """
-    conn = connect()
-    if not conn:
-        return None
-    
     try:
-        cursor = conn.cursor()
-        
-        # Insert challan data
-        cursor.execute('''
-            INSERT INTO challans (
-                customer_name, customer_address, gstin, state, state_code,
-                challan_no, date, vehicle, transporter, lr, grand_total
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            challan_data.get('customer_name', ''),
-            challan_data.get('customer_address', ''),
-            challan_data.get('gstin', ''),
-            challan_data.get('state', ''),
-            challan_data.get('state_code', ''),
-            challan_data.get('challan_no', ''),
-            challan_data.get('date', ''),
-            challan_data.get('vehicle', ''),
-            challan_data.get('transporter', ''),
-            challan_data.get('lr', ''),
-            challan_data.get('grand_total', 0.0)
-        ))
-        
-        challan_id = cursor.lastrowid
-        
-        # Insert items
-        for item in items:
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Insert challan data
             cursor.execute('''
-                INSERT INTO challan_items (
-                    challan_id, description, hsn, quantity, type, rate, total
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO challans (
+                    customer_name, customer_address, gstin, state, state_code,
+                    challan_no, date, date_iso, vehicle, transporter, lr, grand_total
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
-                challan_id,
-                item.get('description', ''),
-                item.get('hsn', ''),
-                item.get('quantity', 0),
-                item.get('type', ''),
-                item.get('rate', 0.0),
-                item.get('total', 0.0)
+                challan_data.get('customer_name', ''),
+                challan_data.get('customer_address', ''),
+                challan_data.get('gstin', ''),
+                challan_data.get('state', ''),
+                challan_data.get('state_code', ''),
+                challan_data.get('challan_no', ''),
+                challan_data.get('date', ''),
+                parse_date_iso(challan_data.get('date', '')),
+                challan_data.get('vehicle', ''),
+                challan_data.get('transporter', ''),
+                challan_data.get('lr', ''),
+                challan_data.get('grand_total', 0.0)
             ))
-        
-        conn.commit()
+            
+            challan_id = cursor.lastrowid
+            
+            # Insert items
+            for item in items:
+                cursor.execute('''
+                    INSERT INTO challan_items (
+                        challan_id, description, hsn, quantity, type, rate, total
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    challan_id,
+                    item.get('description', ''),
+                    item.get('hsn', ''),
+                    item.get('quantity', 0),
+                    item.get('type', ''),
+                    item.get('rate', 0.0),
+                    item.get('total', 0.0)
+                ))
+        
+        _events.publish(CHALLANS, INSERT, challan_id)
         print(f"Challan saved successfully with ID: {challan_id}")
         return challan_id
         
     except sqlite3.IntegrityError as e:
         print(f"Integrity error: {e}")
-        conn.rollback()
         return None
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        conn.rollback()
         return None
-    finally:
-        conn.close()
 
 def get_challan_by_id(challan_id):
     """
@@ -1109,95 +1825,174 @@ def get_challan_by_id(challan_id):
     Returns:
         Tuple of (challan_data, items_list) if found, None if not found
     """
-    conn = connect()
-    if not conn:
-        return None
-    
     try:
-        conn.row_factory = sqlite3.Row 
-        cursor = conn.cursor()
-        
-        # Get challan data
-        cursor.execute('SELECT * FROM challans WHERE id = ?', (challan_id,))
-        challan_row = cursor.fetchone()
-        
-        if not challan_row:
-            return None
-        
-        # Convert row to dictionary - now this will work!
-        challan_data = dict(challan_row)
-        
-        # Get items
-        cursor.execute('SELECT * FROM challan_items WHERE challan_id = ?', (challan_id,))
-        items_rows = cursor.fetchall()
-        
-        items = [dict(row) for row in items_rows]
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row 
+            
+            # Get challan data
+            cursor.execute('SELECT * FROM challans WHERE id = ?', (challan_id,))
+            challan_row = cursor.fetchone()
+            
+            if not challan_row:
+                return None
+            
+            challan_data = dict(challan_row)
+            
+            # Get items
+            cursor.execute('SELECT * FROM challan_items WHERE challan_id = ?', (challan_id,))
+            items = [dict(row) for row in cursor.fetchall()]
         
         return challan_data, items
         
     except sqlite3.Error as e:
         print(f"Error retrieving challan: {e}")
         return None
-    finally:
-        conn.close()
 
-def get_all_challans():
+CHALLAN_PAGE_SIZE = 100
+
+_CHALLAN_LIST_COLUMNS = """
+    c.id, c.customer_name, c.customer_address, c.gstin, c.state, c.state_code,
+    c.challan_no, c.date, c.vehicle, c.transporter, c.lr, c.grand_total
+"""
+
+def _challan_list_row(row):
+    """Convert a listing row to the dict shape Manage_Challan expects"""
+    challan_data = dict(row)
+    challan_data['items'] = [{'count': challan_data['item_count']}]
+    return challan_data
+
+def get_all_challans(filters=None):
     """
     Retrieve all challans from the database with their basic information
     
+    Args:
+        filters (dict): Optional keyword arguments for build_challan_filter
+    
     Returns:
         list: List of challan dictionaries, or empty list if none found
     """
     try:
-        conn = connect()
-        conn.row_factory = sqlite3.Row  # ✅ Add this line - same as in get_all_invoices()
-        cursor = conn.cursor()
+        where, params = build_challan_filter(**(filters or {}))
         
-        # Get all challans with basic information
-        cursor.execute("""
-            SELECT 
-                id,
-                customer_name,
-                customer_address,
-                gstin,
-                state,
-                state_code,
-                challan_no,
-                date,
-                vehicle,
-                transporter,
-                lr,
-                grand_total
-            FROM challans 
-            ORDER BY id DESC
-        """)
-        
-        challans_rows = cursor.fetchall()
-        challans = []
-        
-        for challan_row in challans_rows:
-            challan_data = dict(challan_row) 
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
-            # Get item count for this challan
-            cursor.execute("SELECT COUNT(*) as item_count FROM challan_items WHERE challan_id = ?", (challan_data['id'],))
-            item_count_row = cursor.fetchone()
-            challan_data['items'] = [{'count': item_count_row['item_count']}]  
-            challans.append(challan_data)
+            # Item counts come from one grouped join instead of a query per challan
+            cursor.execute(f"""
+                SELECT {_CHALLAN_LIST_COLUMNS}, COUNT(ci.id) AS item_count
+                FROM (SELECT * FROM challans {where}) c
+                LEFT JOIN challan_items ci ON ci.challan_id = c.id
+                GROUP BY c.id
+                ORDER BY c.id DESC
+            """, params)
+            
+            challans = [_challan_list_row(row) for row in cursor.fetchall()]
         
-        conn.close()
         return challans
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        if 'conn' in locals():
-            conn.close()
         return []
     except Exception as e:
         print(f"Error retrieving challans: {e}")
-        if 'conn' in locals():
-            conn.close()
         return []
 
+def list_challans(after_id=None, limit=CHALLAN_PAGE_SIZE, filters=None):
+    """
+    Fetch one page of challans, newest first, using keyset pagination on id.
+
+    Args:
+        after_id (int): Last id of the previous page, or None for the first page
+        limit (int): Maximum number of challans to return
+        filters (dict): Keyword arguments for build_challan_filter
+
+    Returns:
+        dict: 'challans' (list of challan dicts with 'item_count'),
+              'next_after_id' (pass back for the next page, None when done)
+              and, on the first page only, 'total' for the whole filtered set
+    """
+    result = {"challans": [], "next_after_id": None}
+    if after_id is None:
+        result["total"] = 0
+
+    try:
+        where, params = build_challan_filter(**(filters or {}))
+        page_where = where
+        page_params = list(params)
+        if after_id is not None:
+            page_where += (" AND " if where else "WHERE ") + "id < ?"
+            page_params.append(after_id)
+
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+
+            # Page the challans first, then count items for just that page
+            cursor.execute(f"""
+                SELECT {_CHALLAN_LIST_COLUMNS}, COUNT(ci.id) AS item_count
+                FROM (
+                    SELECT * FROM challans
+                    {page_where}
+                    ORDER BY id DESC
+                    LIMIT ?
+                ) c
+                LEFT JOIN challan_items ci ON ci.challan_id = c.id
+                GROUP BY c.id
+                ORDER BY c.id DESC
+            """, page_params + [limit])
+            result["challans"] = [_challan_list_row(row) for row in cursor.fetchall()]
+
+            if after_id is None:
+                cursor.execute(f"SELECT COUNT(*) FROM challans {where}", params)
+                result["total"] = cursor.fetchone()[0]
+
+        if len(result["challans"]) == limit:
+            result["next_after_id"] = result["challans"][-1]['id']
+        return result
+
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return result
+
+def list_challan_ids(filters=None):
+    """
+    Ids of every challan matching the listing filters, oldest first.
+
+    Args:
+        filters (dict): Keyword arguments for build_challan_filter
+
+    Returns:
+        list: Challan ids, or empty list on error
+    """
+    try:
+        where, params = build_challan_filter(**(filters or {}))
+        with get_connection() as conn:
+            cursor = conn.execute(f"SELECT id FROM challans {where} ORDER BY id", params)
+            return [row[0] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+
+def count_challans(filters=None):
+    """
+    Number of challans matching the listing filters (all challans by default).
+
+    Args:
+        filters (dict): Keyword arguments for build_challan_filter
+
+    Returns:
+        int: Challan count, or 0 on error
+    """
+    try:
+        where, params = build_challan_filter(**(filters or {}))
+        with get_connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM challans {where}", params).fetchone()[0]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return 0
+
 def delete_challan(challan_id: int) -> bool:
     """
     Delete a challan and its items
@@ -1208,18 +2003,17 @@ def delete_challan(challan_id: int) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    conn = connect()
-    if not conn:
-        return False
-    
     try:
-        cursor = conn.cursor()
-        
-        # Delete challan (items will be deleted automatically due to CASCADE)
-        cursor.execute('DELETE FROM challans WHERE id = ?', (challan_id,))
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Delete challan (items will be deleted automatically due to CASCADE)
+            cursor.execute('DELETE FROM challans WHERE id = ?', (challan_id,))
+            deleted = cursor.rowcount > 0
         
-        if cursor.rowcount > 0:
-            conn.commit()
+        _pdf_cache.invalidate("challan", challan_id)
+        if deleted:
+            _events.publish(CHALLANS, DELETE, challan_id)
             print(f"Challan {challan_id} deleted successfully")
             return True
         else:
@@ -1228,45 +2022,43 @@ def delete_challan(challan_id: int) -> bool:
             
     except sqlite3.Error as e:
         print(f"Error deleting challan: {e}")
-        conn.rollback()
         return False
-    finally:
-        conn.close()
 
-def search_challans(search_term: str) -> List[Dict]:
+def search_challans(search_term: str, limit: Optional[int] = None) -> List[Dict]:
     """
-    Search challans by customer name, challan number, or GSTIN
+    Search challans by customer name, challan number, address or GSTIN
     
     Args:
-        search_term: Term to search for
+        search_term: Words to search for; each must prefix-match some field
+        limit: Maximum number of challans to return (None for all matches)
     
     Returns:
-        List of matching challan dictionaries
+        List of matching challan dictionaries, best match first
     """
-    conn = connect()
-    if not conn:
+    match_query = build_match_query(search_term)
+    if not match_query:
         return []
     
     try:
-        cursor = conn.cursor()
-        search_pattern = f"%{search_term}%"
-        
-        cursor.execute('''
-            SELECT * FROM challans 
-            WHERE customer_name LIKE ? 
-            OR challan_no LIKE ? 
-            OR gstin LIKE ?
-            ORDER BY date DESC
-        ''', (search_pattern, search_pattern, search_pattern))
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            cursor.execute(f"""
+                SELECT c.* FROM challans_fts
+                JOIN challans c ON c.id = challans_fts.rowid
+                WHERE challans_fts MATCH ?
+                ORDER BY rank, c.date_iso DESC
+                LIMIT ?
+            """, (match_query, -1 if limit is None else limit))
+            
+            rows = cursor.fetchall()
         
-        rows = cursor.fetchall()
         return [dict(row) for row in rows]
         
     except sqlite3.Error as e:
         print(f"Error searching challans: {e}")
         return []
-    finally:
-        conn.close()
 
 def update_challan(challan_id: int, challan_data: Dict, items: List[Dict]) -> bool:
     """
@@ -1280,169 +2072,163 @@ def update_challan(challan_id: int, challan_data: Dict, items: List[Dict]) -> bo
     Returns:
         True if successful, False otherwise
     """
-    conn = connect()
-    if not conn:
-        return False
-    
     try:
-        cursor = conn.cursor()
-        
-        # Update challan data
-        cursor.execute('''
-            UPDATE challans SET
-                customer_name = ?, customer_address = ?, gstin = ?, state = ?, 
-                state_code = ?, challan_no = ?, date = ?, vehicle = ?, 
-                transporter = ?, lr = ?, grand_total = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (
-            challan_data.get('customer_name', ''),
-            challan_data.get('customer_address', ''),
-            challan_data.get('gstin', ''),
-            challan_data.get('state', ''),
-            challan_data.get('state_code', ''),
-            challan_data.get('challan_no', ''),
-            challan_data.get('date', ''),
-            challan_data.get('vehicle', ''),
-            challan_data.get('transporter', ''),
-            challan_data.get('lr', ''),
-            challan_data.get('grand_total', 0.0),
-            challan_id
-        ))
-        
-        # Delete existing items
-        cursor.execute('DELETE FROM challan_items WHERE challan_id = ?', (challan_id,))
-        
-        # Insert updated items
-        for item in items:
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Update challan data
             cursor.execute('''
-                INSERT INTO challan_items (
-                    challan_id, description, hsn, quantity, type, rate, total
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                UPDATE challans SET
+                    customer_name = ?, customer_address = ?, gstin = ?, state = ?, 
+                    state_code = ?, challan_no = ?, date = ?, date_iso = ?, vehicle = ?, 
+                    transporter = ?, lr = ?, grand_total = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
             ''', (
-                challan_id,
-                item.get('description', ''),
-                item.get('hsn', ''),
-                item.get('quantity', 0),
-                item.get('type', ''),
-                item.get('rate', 0.0),
-                item.get('total', 0.0)
+                challan_data.get('customer_name', ''),
+                challan_data.get('customer_address', ''),
+                challan_data.get('gstin', ''),
+                challan_data.get('state', ''),
+                challan_data.get('state_code', ''),
+                challan_data.get('challan_no', ''),
+                challan_data.get('date', ''),
+                parse_date_iso(challan_data.get('date', '')),
+                challan_data.get('vehicle', ''),
+                challan_data.get('transporter', ''),
+                challan_data.get('lr', ''),
+                challan_data.get('grand_total', 0.0),
+                challan_id
             ))
-        
-        conn.commit()
+            
+            # Delete existing items
+            cursor.execute('DELETE FROM challan_items WHERE challan_id = ?', (challan_id,))
+            
+            # Insert updated items
+            for item in items:
+                cursor.execute('''
+                    INSERT INTO challan_items (
+                        challan_id, description, hsn, quantity, type, rate, total
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    challan_id,
+                    item.get('description', ''),
+                    item.get('hsn', ''),
+                    item.get('quantity', 0),
+                    item.get('type', ''),
+                    item.get('rate', 0.0),
+                    item.get('total', 0.0)
+                ))
+        
+        _pdf_cache.invalidate("challan", challan_id)
+        _events.publish(CHALLANS, UPDATE, challan_id)
         print(f"Challan {challan_id} updated successfully")
         return True
         
     except sqlite3.Error as e:
         print(f"Error updating challan: {e}")
-        conn.rollback()
         return False
-    finally:
-        conn.close()
-
-# Initialize database when module is imported
-create_tables()
-
-if __name__ == "__main__":
-    print("Database initialization completed")
-
 
         # CUSTOMERS SECTION
 
 def save_customer(customer_data):
     """Save customer data to database"""
-    conn = connect()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
-            INSERT INTO customers (customer_name, address, state, state_code, gstin, phone)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            customer_data['customer_name'],
-            customer_data['address'],
-            customer_data['state'],
-            customer_data['state_code'],
-            customer_data['gstin'],
-            customer_data['phone']
-        ))
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO customers (customer_name, address, state, state_code, gstin, phone)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                customer_data['customer_name'],
+                customer_data['address'],
+                customer_data['state'],
+                customer_data['state_code'],
+                customer_data['gstin'],
+                customer_data['phone']
+            ))
+            customer_id = cursor.lastrowid
         
-        conn.commit()
-        customer_id = cursor.lastrowid
+        _events.publish(CUSTOMERS, INSERT, customer_id)
         return True, customer_id, "Customer saved successfully!"
         
     except sqlite3.Error as e:
         return False, None, f"Database error: {str(e)}"
-    finally:
-        conn.close()
 
 def update_customer(customer_id, customer_data):
     """Update existing customer data"""
-    conn = connect()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('''
-            UPDATE customers 
-            SET customer_name=?, address=?, state=?, state_code=?, gstin=?, phone=?
-            WHERE id=?
-        ''', (
-            customer_data['customer_name'],
-            customer_data['address'],
-            customer_data['state'],
-            customer_data['state_code'],
-            customer_data['gstin'],
-            customer_data['phone'],
-            customer_id
-        ))
+        with transaction() as conn:
+            conn.execute('''
+                UPDATE customers 
+                SET customer_name=?, address=?, state=?, state_code=?, gstin=?, phone=?
+                WHERE id=?
+            ''', (
+                customer_data['customer_name'],
+                customer_data['address'],
+                customer_data['state'],
+                customer_data['state_code'],
+                customer_data['gstin'],
+                customer_data['phone'],
+                customer_id
+            ))
         
-        conn.commit()
+        _events.publish(CUSTOMERS, UPDATE, customer_id)
         return True, "Customer updated successfully!"
         
     except sqlite3.Error as e:
         return False, f"Database error: {str(e)}"
-    finally:
-        conn.close()
 
 def get_all_customers():
     """Retrieve all customers from database"""
-    conn = connect()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('SELECT * FROM customers ORDER BY id')
-        customers = cursor.fetchall()
-        return customers
+        with get_connection() as conn:
+            return conn.execute('SELECT * FROM customers ORDER BY id').fetchall()
     except sqlite3.Error as e:
         print(f"Database error: {str(e)}")
         return []
-    finally:
-        conn.close()
 
 def get_customer_by_id(customer_id):
     """Retrieve a specific customer by ID"""
-    conn = connect()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('SELECT * FROM customers WHERE id=?', (customer_id,))
-        customer = cursor.fetchone()
-        return customer
+        with get_connection() as conn:
+            return conn.execute('SELECT * FROM customers WHERE id=?', (customer_id,)).fetchone()
     except sqlite3.Error as e:
         print(f"Database error: {str(e)}")
         return None
-    finally:
-        conn.close()
 
 def delete_customer(customer_id):
     """Delete a customer from database"""
-    conn = connect()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute('DELETE FROM customers WHERE id=?', (customer_id,))
-        conn.commit()
+        with transaction() as conn:
+            conn.execute('DELETE FROM customers WHERE id=?', (customer_id,))
+        _events.publish(CUSTOMERS, DELETE, customer_id)
         return True, "Customer deleted successfully!"
     except sqlite3.Error as e:
         return False, f"Database error: {str(e)}"
-    finally:
-        conn.close()
\ No newline at end of file
+
+def search_customers(search_term, limit=None):
+    """
+    Full-text search over customer name, address, state, GSTIN and phone.
+
+    Args:
+        search_term (str): Words to search for; each must prefix-match some field
+        limit (int): Maximum number of customers to return (None for all matches)
+
+    Returns:
+        list: Customer rows (same shape as get_all_customers), best match first
+    """
+    match_query = build_match_query(search_term)
+    if not match_query:
+        return []
+
+    try:
+        with get_connection() as conn:
+            return conn.execute(f"""
+                SELECT c.* FROM customers_fts
+                JOIN customers c ON c.id = customers_fts.rowid
+                WHERE customers_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (match_query, -1 if limit is None else limit)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {str(e)}")
+        return []
@@ -0,0 +1,87 @@
+"""
+Data-change notifications.
+
+db_manager publishes a DataChanged event after every successful write,
+and views subscribe to the tables they show instead of re-querying on a
+timer. Callbacks run on the thread that made the change; Qt widgets
+should subscribe through ui.data_events, which hands events over to the
+GUI thread.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Tables (or groups of tables) events are published for
+INVOICES = "invoices"
+CHALLANS = "challans"
+INVENTORY = "inventory"
+CUSTOMERS = "customers"
+COMPANY = "company"
+
+# Actions
+INSERT, UPDATE, DELETE = "insert", "update", "delete"
+# Written by another process (or connection); which tables is unknown
+EXTERNAL = "external"
+
+
+@dataclass(frozen=True)
+class DataChanged:
+    """
+    One committed change.
+
+    Args:
+        table: One of the table constants, or None for an external
+            change that may touch any table
+        action: INSERT, UPDATE, DELETE or EXTERNAL
+        ids: Ids of the changed rows (empty when not known)
+    """
+    table: Optional[str]
+    action: str
+    ids: Tuple[int, ...] = ()
+
+    def affects(self, *tables):
+        """Whether a view showing these tables needs to refresh."""
+        return self.table is None or self.table in tables
+
+
+class EventBus:
+    """Thread-safe publish/subscribe for DataChanged events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = []
+
+    def subscribe(self, callback, *tables):
+        """
+        Call callback(event) for every event affecting the given tables
+        (every event when no table is given).
+
+        Returns:
+            The token to pass to unsubscribe()
+        """
+        token = (callback, frozenset(tables))
+        with self._lock:
+            self._subscribers.append(token)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            if token in self._subscribers:
+                self._subscribers.remove(token)
+
+    def publish(self, table, action, *ids):
+        """Notify subscribers of a committed change."""
+        event = DataChanged(table, action, tuple(i for i in ids if i is not None))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, tables in subscribers:
+            if tables and not event.affects(*tables):
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                # A failing view must not turn a successful write into an error
+                print(f"Error in data change subscriber: {e}")
+
+
+bus = EventBus()
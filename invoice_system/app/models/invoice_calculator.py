@@ -0,0 +1,373 @@
+"""
+Invoice arithmetic shared by the entry screens, the invoice_taxes rows,
+the preview and the PDF export.
+
+Amounts are integer paise. Values typed or stored in rupees are converted
+once, rounding half up (half a paisa goes up, as on a printed invoice),
+and after that totals are exact sums. A stored (float) amount is rounded
+with a tolerance of 1e-7 paise, so 1.005, held as 1.00499..., still goes
+up. The rules:
+
+- A line total is quantity x rate, rounded to the paisa. A stored line
+  without a total counts its quantity x rate; one that is not a number
+  counts for nothing, as on the entry screen.
+- A GST rate is rounded half up to two places (0.125% is 0.13%), and tax
+  is charged per rate on the sum of that rate's line totals.
+- When the place of supply (the customer's state code, else the first two
+  digits of their GSTIN) is a different state than the company's (first
+  two digits of the company GSTIN), the tax is IGST; otherwise it is split
+  into equal CGST and SGST, each rounded to the paisa. With either state
+  unknown the invoice is treated as intra-state.
+
+Any rate is accepted; GST_RATES are only the slabs the entry screen shows
+a column for. There is no Qt dependency here.
+
+    calculator = InvoiceCalculator(company_gstin)
+    totals = calculator.calculate(items, state_code=invoice['state_code'], gstin=invoice['gstin'])
+    batch = calculator.calculate_many(invoice_ids, line_totals, gst_rates, places)
+"""
+import math
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+from itertools import repeat
+from typing import Tuple
+
+# GST slabs (percent), in the order the entry screen shows them
+GST_RATES = (0, 0.25, 3, 5, 12, 18, 28)
+
+# Rates are held as integers in basis points (1/100 of a percent)
+_RATE_SCALE = 100
+_PAISE = Decimal(1)
+_BASIS_POINT = Decimal("0.01")
+# Slack, in paise, for a float that is a hair below half a paisa
+_FLOAT_SLACK = 1e-7
+
+
+def _decimal(value):
+    """Exact decimal of a typed or stored number; ValueError if it is not one."""
+    try:
+        number = Decimal(repr(value) if isinstance(value, float) else str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"not a number: {value!r}") from None
+    if not number.is_finite():
+        raise ValueError(f"not a number: {value!r}")
+    return number
+
+
+def to_paise(value):
+    """
+    Rupees to integer paise, rounding half up.
+
+    Args:
+        value: int, float, Decimal or numeric string; None or "" is 0
+
+    Returns:
+        int: Paise
+    """
+    if value is None or value == "":
+        return 0
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        return _float_paise(value)
+    return int(_decimal(value).scaleb(2).quantize(_PAISE, rounding=ROUND_HALF_UP))
+
+
+def _float_paise(value):
+    """A stored amount to paise, half up with _FLOAT_SLACK."""
+    if not math.isfinite(value):
+        raise ValueError(f"not a number: {value!r}")
+    scaled = value * 100
+    if scaled >= 0:
+        return int(scaled + _FLOAT_SLACK + 0.5)
+    return -int(-(scaled - _FLOAT_SLACK) + 0.5)
+
+
+def to_rupees(paise):
+    return paise / 100
+
+
+def format_paise(paise):
+    """Paise as a rupee amount with two decimals ('1234.50')."""
+    sign = "-" if paise < 0 else ""
+    rupees, rest = divmod(abs(paise), 100)
+    return f"{sign}{rupees}.{rest:02d}"
+
+
+def line_total(quantity, rate):
+    """quantity x rate in paise, rounded half up; ValueError if either is not a number."""
+    amount = _decimal(quantity) * _decimal(rate) * 100
+    return int(amount.quantize(_PAISE, rounding=ROUND_HALF_UP))
+
+
+def line_paise(total, quantity=None, rate=None):
+    """
+    A stored line's amount in paise: its total, else quantity x rate.
+
+    A line that is not a number counts as 0, as on the entry screen.
+    """
+    try:
+        if total is None or total == "":
+            return line_total(quantity or 0, rate or 0)
+        return to_paise(total)
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=1024)
+def gst_rate(value):
+    """
+    A GST percent as taxes are keyed by: rounded half up to two places
+    (0.125 -> 0.13). None, "" or a value that is not a number is 0.
+    """
+    if value is None or value == "":
+        return 0.0
+    try:
+        return float(_decimal(value).quantize(_BASIS_POINT, rounding=ROUND_HALF_UP))
+    except ValueError:
+        return 0.0
+
+
+@lru_cache(maxsize=None)
+def _rate_units(gst_percent):
+    return int(_decimal(gst_rate(gst_percent)).scaleb(2).quantize(_PAISE, rounding=ROUND_HALF_UP))
+
+
+def _divide_half_up(numerator, denominator):
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return quotient if numerator >= 0 else -quotient
+
+
+def split_tax(taxable, gst_percent, inter_state=False):
+    """
+    Tax on one rate's taxable value.
+
+    Args:
+        taxable: Taxable value in paise
+        gst_percent: GST rate in percent
+        inter_state: Charge IGST instead of CGST + SGST
+
+    Returns:
+        tuple: (sgst, cgst, igst) in paise
+    """
+    units = _rate_units(gst_percent)
+    if inter_state:
+        return 0, 0, _divide_half_up(taxable * units, 100 * _RATE_SCALE)
+    half = _divide_half_up(taxable * units, 200 * _RATE_SCALE)
+    return half, half, 0
+
+
+def state_number(code):
+    """Numeric GST state code from a state code or GSTIN ('18', '09', '18ABC...'), or None"""
+    digits = str(code or '').strip()[:2]
+    return int(digits) if digits.isdigit() and int(digits) > 0 else None
+
+
+def _item_value(item, *names):
+    """First of the named fields an item (dict or sqlite3.Row) has."""
+    keys = item.keys()
+    for name in names:
+        if name in keys:
+            return item[name]
+    return None
+
+
+def taxable_by_rate(items):
+    """
+    Sum of line totals per GST rate.
+
+    Args:
+        items: Item dicts or rows with 'total' (or 'quantity' and 'rate')
+            and 'gst_percent' (or 'gst')
+
+    Returns:
+        dict: {gst_rate(): taxable paise}
+    """
+    taxable = {}
+    for item in items:
+        rate = gst_rate(_item_value(item, 'gst_percent', 'gst'))
+        paise = line_paise(_item_value(item, 'total'), _item_value(item, 'quantity'), _item_value(item, 'rate'))
+        taxable[rate] = taxable.get(rate, 0) + paise
+    return taxable
+
+
+@dataclass(frozen=True)
+class TaxLine:
+    """Tax on one GST rate of an invoice, in paise."""
+    gst_percent: float
+    taxable: int
+    sgst: int
+    cgst: int
+    igst: int
+
+    @property
+    def tax_total(self):
+        return self.sgst + self.cgst + self.igst
+
+
+@dataclass(frozen=True)
+class InvoiceTotals:
+    """
+    Totals of one invoice, in paise.
+
+    subtotal is the sum of the line totals, which is what the invoice
+    stores as its grand_total; taxes are listed lowest rate first.
+    """
+    subtotal: int
+    taxes: Tuple[TaxLine, ...]
+    inter_state: bool
+
+    @property
+    def tax_total(self):
+        return sum(tax.tax_total for tax in self.taxes)
+
+
+class BatchTotals:
+    """
+    Tax lines of many invoices as parallel arrays, one entry per
+    (invoice, rate), ordered by invoice id then rate.
+    """
+
+    def __init__(self):
+        self.invoice_id = array('q')
+        self.gst_percent = array('d')
+        self.taxable = array('q')
+        self.sgst = array('q')
+        self.cgst = array('q')
+        self.igst = array('q')
+
+    def __len__(self):
+        return len(self.invoice_id)
+
+    def tax_rows(self):
+        """(invoice_id, gst_percent, sgst, cgst, igst, tax_total) in rupees, as stored in invoice_taxes"""
+        for invoice_id, gst_percent, sgst, cgst, igst in zip(self.invoice_id, self.gst_percent,
+                                                             self.sgst, self.cgst, self.igst):
+            yield invoice_id, gst_percent, sgst / 100, cgst / 100, igst / 100, (sgst + cgst + igst) / 100
+
+    def subtotals(self):
+        """{invoice_id: sum of line totals in paise}"""
+        subtotals = {}
+        for invoice_id, taxable in zip(self.invoice_id, self.taxable):
+            subtotals[invoice_id] = subtotals.get(invoice_id, 0) + taxable
+        return subtotals
+
+    def tax_totals(self):
+        """{invoice_id: total tax in paise}"""
+        totals = {}
+        for i, invoice_id in enumerate(self.invoice_id):
+            totals[invoice_id] = totals.get(invoice_id, 0) + self.sgst[i] + self.cgst[i] + self.igst[i]
+        return totals
+
+
+class InvoiceCalculator:
+    """The rules above, for one company."""
+
+    def __init__(self, company_gstin=None):
+        self.company_state = state_number(company_gstin)
+        self._inter_state = lru_cache(maxsize=1024)(self._is_inter_state)
+
+    def is_inter_state(self, state_code=None, gstin=None):
+        """Whether an invoice to this customer state / GSTIN is charged IGST."""
+        return self._inter_state(state_code, gstin)
+
+    def _is_inter_state(self, state_code, gstin):
+        customer_state = state_number(state_code) or state_number(gstin)
+        return (self.company_state is not None and customer_state is not None
+                and customer_state != self.company_state)
+
+    def calculate(self, items, state_code=None, gstin=None):
+        """
+        Totals of one invoice.
+
+        Args:
+            items: Item dicts or rows with 'total' (or 'quantity' and
+                'rate') and 'gst_percent' (or 'gst')
+            state_code, gstin: The customer's, for the place of supply
+
+        Returns:
+            InvoiceTotals
+        """
+        inter_state = self.is_inter_state(state_code, gstin)
+        taxable = taxable_by_rate(items)
+        taxes = tuple(TaxLine(rate, amount, *split_tax(amount, rate, inter_state))
+                      for rate, amount in sorted(taxable.items()))
+        return InvoiceTotals(sum(taxable.values()), taxes, inter_state)
+
+    def calculate_many(self, invoice_ids, line_totals, gst_rates, places=None,
+                       quantities=None, unit_rates=None):
+        """
+        Tax lines of many invoices in one pass over column data; this is
+        what fills invoice_taxes (db_manager.compute_invoice_taxes).
+
+        Args:
+            invoice_ids: Invoice id of each line
+            line_totals: Line total of each line, in rupees (None: quantity x rate)
+            gst_rates: GST percent of each line
+            places: {invoice_id: (state_code, gstin)} of the customers;
+                invoices missing from it are intra-state
+            quantities, unit_rates: Quantity and rate of each line, for
+                lines without a total
+
+        Returns:
+            BatchTotals
+        """
+        # Plain loops over local caches: this runs once per line of a whole database
+        rates = {}
+        taxable = {}
+        slack = _FLOAT_SLACK
+        lines = zip(invoice_ids, line_totals, gst_rates,
+                    quantities if quantities is not None else repeat(None),
+                    unit_rates if unit_rates is not None else repeat(None))
+        for invoice_id, total, rate, quantity, unit_rate in lines:
+            key_rate = rates.get(rate)
+            if key_rate is None:
+                key_rate = rates[rate] = gst_rate(rate)
+            if total.__class__ is float and -1e15 < total < 1e15:
+                # _float_paise(), inlined
+                scaled = total * 100
+                if scaled >= 0:
+                    paise = int(scaled + slack + 0.5)
+                else:
+                    paise = -int(-(scaled - slack) + 0.5)
+            else:
+                paise = line_paise(total, quantity, unit_rate)
+            key = (invoice_id, key_rate)
+            taxable[key] = taxable.get(key, 0) + paise
+
+        # Customers mostly share a handful of state codes; the GSTIN is only read without one
+        inter_state = {}
+        if places and self.company_state is not None:
+            states = {}
+            for invoice_id, (state_code, gstin) in places.items():
+                state = states.get(state_code, -1)
+                if state == -1:
+                    state = states[state_code] = state_number(state_code)
+                if state is None:
+                    state = state_number(gstin)
+                inter_state[invoice_id] = state is not None and state != self.company_state
+        units = {rate: _rate_units(rate) for rate in set(rates.values())}
+        columns = ([], [], [], [], [], [])
+        ids, percents, taxables, sgsts, cgsts, igsts = columns
+        for (invoice_id, rate), amount in sorted(taxable.items()):
+            # split_tax(), inlined
+            numerator = abs(amount) * units[rate]
+            if inter_state.get(invoice_id):
+                tax = (2 * numerator + 100 * _RATE_SCALE) // (200 * _RATE_SCALE)
+                sgst, igst = 0, (tax if amount >= 0 else -tax)
+            else:
+                tax = (2 * numerator + 200 * _RATE_SCALE) // (400 * _RATE_SCALE)
+                sgst, igst = (tax if amount >= 0 else -tax), 0
+            ids.append(invoice_id)
+            percents.append(rate)
+            taxables.append(amount)
+            sgsts.append(sgst)
+            cgsts.append(sgst)
+            igsts.append(igst)
+
+        batch = BatchTotals()
+        for name, values in zip(('invoice_id', 'gst_percent', 'taxable', 'sgst', 'cgst', 'igst'), columns):
+            getattr(batch, name).extend(values)
+        return batch
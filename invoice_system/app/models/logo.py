@@ -0,0 +1,55 @@
+"""
+Normalising the company logo before it is stored in the database.
+
+The picked image is decoded once, scaled down to the sizes the documents
+actually use and re-encoded as PNG, so previews and PDF renders load a
+small blob from company_logo instead of the original file.
+"""
+import hashlib
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PySide6.QtGui import QImage
+
+# Box each rendition is scaled to fit (aspect ratio is kept).
+# Print: the PDF logo box is 110 x 70 pt, i.e. about 460 x 290 px at 300 dpi.
+PRINT_LOGO_SIZE = QSize(480, 300)
+# Screen: previews show the logo in 150 x 100 px, stored at 2x for high-DPI screens
+SCREEN_LOGO_SIZE = QSize(300, 200)
+SCREEN_LOGO_SCALE = 2
+
+
+def _png_bytes(image):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def _fit(image, size):
+    # Small logos are scaled up too, as the previews always did
+    return image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def prepare_logo(file_path):
+    """
+    Decode a logo file and produce the stored renditions.
+
+    Args:
+        file_path (str): Image picked by the user (PNG or JPEG)
+
+    Returns:
+        tuple: (digest, print_png, screen_png), or None if the file
+               cannot be read as an image
+    """
+    image = QImage(str(file_path))
+    if image.isNull():
+        print(f"Could not read logo image: {file_path}")
+        return None
+
+    image = image.convertToFormat(QImage.Format_ARGB32)
+    print_png = _png_bytes(_fit(image, PRINT_LOGO_SIZE))
+    screen_png = _png_bytes(_fit(image, SCREEN_LOGO_SIZE))
+    digest = hashlib.sha256(print_png).hexdigest()[:16]
+    return digest, print_png, screen_png
@@ -0,0 +1,48 @@
+import sqlite3
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in the database header (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, migrations):
+    """
+    Apply every migration newer than the database's user_version, in order.
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction together with
+    the user_version bump, so it is applied exactly once even if two
+    processes start at the same time, and a failing step leaves the
+    database at the previous version. When the schema is already current
+    this is a single PRAGMA read.
+
+    Args:
+        conn: sqlite3 connection (not inside a transaction)
+        migrations: Iterable of (version, description, func); func receives a cursor
+
+    Returns:
+        list: Versions that were applied
+    """
+    migrations = sorted(migrations, key=lambda migration: migration[0])
+    if not migrations or get_schema_version(conn) >= migrations[-1][0]:
+        return []
+
+    applied = []
+    for version, description, func in migrations:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock in case another process got here first
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            func(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        print(f"Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
@@ -0,0 +1,199 @@
+"""
+On-disk cache of rendered invoice and challan PDFs.
+
+A PDF is stored under the SHA-256 of everything it was rendered from
+(document_key), so an unchanged document is served from disk and any
+edit misses without explicit invalidation. The folder is shared by the
+app and export worker processes and kept under a size cap.
+
+    from ..models.pdf_cache import cache, document_key
+    key = document_key("invoice", LAYOUT_VERSION, header, items, taxes, company)
+    data = cache.get("invoice", invoice_id, key)
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+CACHE_DIR_ENV = "FINVO_PDF_CACHE"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def document_key(*parts):
+    """
+    SHA-256 of everything a rendered document depends on.
+
+    Rows (dicts or sqlite3.Row) are serialised as sorted JSON, so the
+    same content always gives the same key and any changed field,
+    item or tax row gives a new one.
+
+    Args:
+        *parts: Header row, item rows, tax rows, company row, layout version...
+
+    Returns:
+        str: Hex digest
+    """
+    def plain(value):
+        if hasattr(value, "keys"):
+            return {key: value[key] for key in value.keys()}
+        if isinstance(value, (list, tuple)):
+            return [plain(item) for item in value]
+        return value
+
+    payload = json.dumps([plain(part) for part in parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    """
+    On-disk cache of rendered PDFs with a total size cap.
+
+    Files are stored as <kind>/<id>/<key>.pdf, so dropping one document
+    only lists its own folder. A hit refreshes the file's
+    mtime, and when the cap is exceeded the least recently used files are
+    deleted first. Writes go through a temp file and os.replace, so
+    several export processes can share the directory.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self._directory = Path(directory) if directory else None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Running size estimate; the folder is only scanned once it passes the cap
+        self._size = None
+
+    @property
+    def directory(self):
+        """Cache folder: configure(), else $FINVO_PDF_CACHE, else ~/.cache/finvo/pdf."""
+        if self._directory is None:
+            self._directory = Path(os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "finvo" / "pdf")
+        return self._directory
+
+    def configure(self, directory=None, max_bytes=None):
+        """
+        Point the cache at another folder and/or change its size cap.
+
+        Args:
+            directory: Cache folder (None keeps the current one)
+            max_bytes (int): Size cap in bytes; 0 disables caching
+        """
+        if directory is not None:
+            self._directory = Path(directory)
+            self._size = None
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+    def _path(self, kind, doc_id, key):
+        return self.directory / kind / str(doc_id) / f"{key}.pdf"
+
+    def get(self, kind, doc_id, key):
+        """
+        Cached PDF bytes for a document, or None on a miss.
+
+        Args:
+            kind (str): 'invoice' or 'challan'
+            doc_id (int): Invoice or challan id
+            key (str): document_key() of the current content
+        """
+        if not self.max_bytes:
+            return None
+        path = self._path(kind, doc_id, key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        return data
+
+    def put(self, kind, doc_id, key, data):
+        """Store PDF bytes for a document and evict old entries if over the cap."""
+        if not self.max_bytes or len(data) > self.max_bytes:
+            return
+        try:
+            # An older rendering of the same document can never be hit again
+            self.invalidate(kind, doc_id)
+            path = self._path(kind, doc_id, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"PDF cache write failed: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self.size()
+            else:
+                self._size += len(data)
+            over_cap = self._size > self.max_bytes
+        if over_cap:
+            self.evict()
+
+    def invalidate(self, kind=None, doc_id=None):
+        """
+        Drop cached PDFs.
+
+        Args:
+            kind (str): 'invoice' or 'challan'; None drops every entry
+            doc_id (int): One document of that kind; None drops the whole kind
+        """
+        if kind is None:
+            pattern = "*/*/*.pdf"
+        elif doc_id is None:
+            pattern = f"{kind}/*/*.pdf"
+        else:
+            pattern = f"{kind}/{doc_id}/*.pdf"
+        try:
+            paths = list(self.directory.glob(pattern))
+        except OSError:
+            return
+        removed = 0
+        for path in paths:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                continue
+            removed += size
+        if removed:
+            with self._lock:
+                if self._size is not None:
+                    self._size = max(self._size - removed, 0)
+
+    def evict(self):
+        """Delete least recently used entries until the cache is within its cap."""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.directory.glob("*/*/*.pdf"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total > self.max_bytes:
+                for _mtime, size, path in sorted(entries):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        continue
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self._size = total
+
+    def size(self):
+        """Total bytes currently cached."""
+        total = 0
+        for path in self.directory.glob("*/*/*.pdf"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+
+cache = PdfCache()
@@ -0,0 +1,128 @@
+"""
+In-memory prefix index over the inventory, for product lookup while an
+invoice or challan is being typed.
+
+Product codes, names and the words inside names are kept as one sorted
+list of lowercase keys; a prefix lookup is a bisect to the first key
+that could match plus a short walk, with no query. The index is built on
+first use and marked stale by inventory change events (including
+external writes), so the next lookup rebuilds it.
+
+    from ..models.product_index import products
+    products.lookup("pvc p")      # [{'product_code': ..., 'product_name': ..., 'gst': 18.0, ...}]
+"""
+import threading
+from bisect import bisect_left
+
+from .db_manager import get_all_inventory_items
+from .events import INVENTORY, bus
+
+LOOKUP_LIMIT = 20
+
+
+def gst_percent(value):
+    """GST percent of an inventory item's gst_percentage ('18%', '5', 'None'), or None"""
+    text = str(value or '').strip().rstrip('%').strip()
+    try:
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+
+class ProductIndex:
+    """Sorted prefix keys over product codes and names."""
+
+    def __init__(self, loader=get_all_inventory_items):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._stale = True
+        self._products = []
+        self._keys = []        # sorted lowercase keys
+        self._positions = []   # index into _products of each key
+
+    def invalidate(self, event=None):
+        """Rebuild on the next lookup (safe to call from any thread)."""
+        self._stale = True
+
+    def ensure_loaded(self):
+        if self._stale:
+            self._build()
+
+    def _build(self):
+        with self._lock:
+            if not self._stale:
+                return
+            # Cleared before reading, so a change made during the read marks it stale again
+            self._stale = False
+            products = []
+            for item in self._loader():
+                product = dict(item)
+                product['gst'] = gst_percent(product.get('gst_percentage'))
+                products.append(product)
+
+            entries = set()
+            for position, product in enumerate(products):
+                code = str(product.get('product_code') or '').casefold().strip()
+                name = " ".join(str(product.get('product_name') or '').casefold().split())
+                if code:
+                    entries.add((code, position))
+                # The name from each word on, so "pipe" finds "PVC Pipe 20mm"
+                words = name.split(" ") if name else []
+                for start in range(len(words)):
+                    entries.add((" ".join(words[start:]), position))
+            ordered = sorted(entries)
+            self._products = products
+            self._keys = [key for key, _ in ordered]
+            self._positions = [position for _, position in ordered]
+
+    def lookup(self, prefix, limit=LOOKUP_LIMIT):
+        """
+        Products whose code, name or a word of the name starts with prefix.
+
+        Args:
+            prefix: Typed text (case and repeated spaces are ignored)
+            limit: Maximum number of products returned
+
+        Returns:
+            list: Inventory item dicts, each with 'gst' (percent or None)
+                added, in key order
+        """
+        key = " ".join(str(prefix or '').casefold().split())
+        if not key:
+            return []
+        self.ensure_loaded()
+        keys, positions, products = self._keys, self._positions, self._products
+        found = []
+        seen = set()
+        index = bisect_left(keys, key)
+        while index < len(keys) and len(found) < limit and keys[index].startswith(key):
+            position = positions[index]
+            if position not in seen:
+                seen.add(position)
+                found.append(products[position])
+            index += 1
+        return found
+
+    def get(self, product_code):
+        """The product with exactly this code (case-insensitive), or None"""
+        code = str(product_code or '').casefold().strip()
+        if not code:
+            return None
+        self.ensure_loaded()
+        keys, positions, products = self._keys, self._positions, self._products
+        # Only the keys equal to the code; a name can equal it too, so check each
+        index = bisect_left(keys, code)
+        while index < len(keys) and keys[index] == code:
+            product = products[positions[index]]
+            if str(product.get('product_code') or '').casefold().strip() == code:
+                return product
+            index += 1
+        return None
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self._products)
+
+
+products = ProductIndex()
+bus.subscribe(products.invalidate, INVENTORY)
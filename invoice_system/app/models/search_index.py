@@ -0,0 +1,158 @@
+"""
+FTS5 full-text indexes over invoices, invoice items, challans, customers
+and inventory.
+
+Each index is an external-content FTS5 table: it stores only the token
+index and reads column values back from the source table, so it adds
+little to the file size. Triggers on the source tables keep it in sync.
+
+Rebuild every index from scratch (e.g. after restoring an old backup):
+
+    python -m invoice_system.app.models.search_index [path/to/invoice_app.db]
+"""
+import re
+import sys
+
+# Prefix lengths indexed up front so "sha" or "inv-20" match without a full scan
+PREFIX_LENGTHS = "2 3 4"
+
+# fts table -> (source table, indexed columns, bm25 column weights)
+SEARCH_INDEXES = {
+    "invoices_fts": (
+        "invoices",
+        ("invoice_no", "customer_name", "customer_address", "gstin"),
+        (10.0, 5.0, 1.0, 3.0),
+    ),
+    "invoice_items_fts": (
+        "invoice_items",
+        ("description",),
+        (1.0,),
+    ),
+    "challans_fts": (
+        "challans",
+        ("challan_no", "customer_name", "customer_address", "gstin"),
+        (10.0, 5.0, 1.0, 3.0),
+    ),
+    "customers_fts": (
+        "customers",
+        ("customer_name", "address", "state", "state_code", "gstin", "phone"),
+        (10.0, 2.0, 1.0, 1.0, 3.0, 3.0),
+    ),
+    "inventory_fts": (
+        "inventory_items",
+        ("product_name", "product_code", "category", "description", "unit"),
+        (10.0, 8.0, 3.0, 1.0, 1.0),
+    ),
+}
+
+
+def rank_function(fts_table):
+    """The weighted bm25() call stored as the index's default rank (lower is a better match)."""
+    weights = ", ".join(str(weight) for weight in SEARCH_INDEXES[fts_table][2])
+    return f"bm25({weights})"
+
+
+def build_match_query(search_text):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all terms must match, so
+    "sharma trad" finds "Sharma Traders". Quoting keeps user input from
+    being parsed as FTS5 syntax.
+
+    Args:
+        search_text (str): Text typed by the user
+
+    Returns:
+        str: MATCH expression, or None if the text has no searchable words
+    """
+    tokens = re.findall(r"\w+", (search_text or "").lower())
+    if not tokens:
+        return None
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def create_search_index(cursor):
+    """
+    Create any missing FTS tables and their sync triggers.
+
+    A table created on a database that already has rows is rebuilt once
+    from its source table.
+
+    Args:
+        cursor: Cursor inside the schema transaction
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    for fts_table, (source, columns, _weights) in SEARCH_INDEXES.items():
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                {column_list},
+                content='{source}',
+                content_rowid='id',
+                prefix='{PREFIX_LENGTHS}'
+            )
+        """)
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN
+                INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {column_list} ON {source} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+            END
+        """)
+
+        if fts_table not in existing:
+            # Persist the column weights so "ORDER BY rank" uses them
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}, rank) VALUES ('rank', ?)",
+                           (rank_function(fts_table),))
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def rebuild_search_index(cursor):
+    """
+    Rebuild every FTS index from its source table and merge its segments.
+
+    Args:
+        cursor: Cursor inside a write transaction
+    """
+    for fts_table in SEARCH_INDEXES:
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}, rank) VALUES ('rank', ?)",
+                       (rank_function(fts_table),))
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('optimize')")
+
+
+def main(argv=None):
+    """Command line entry point: rebuild the search indexes of a database."""
+    argv = sys.argv[1:] if argv is None else argv
+
+    from . import db_manager
+
+    if argv:
+        db_manager.set_database_path(argv[0])
+    db_manager.create_tables()
+    if db_manager.rebuild_search_index():
+        print(f"Rebuilt {len(SEARCH_INDEXES)} search indexes")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,13 +5,11 @@ from PySide6.QtWidgets import (
     QDoubleSpinBox, QStackedWidget, QFrame, QMessageBox
 )
 from PySide6.QtGui import QFont
-from ..models.db_manager import add_inventory_item, initialize_database
+from ..models.db_manager import add_inventory_item
 
 class AddItems_Page(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        # Initialize database on startup
-        initialize_database()
         self.setup_ui()
         self.setWindowTitle("Add Items Page")
         
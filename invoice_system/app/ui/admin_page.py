@@ -1,12 +1,13 @@
-import os
 from PySide6.QtCore import Qt, QRectF
 from PySide6.QtWidgets import (
     QDialog, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QLineEdit, QTextEdit, QPushButton, QFileDialog,
     QScrollArea, QFrame, QGroupBox, QSizePolicy
 )
-from PySide6.QtGui import QPixmap, QPainter, QPainterPath
+from PySide6.QtGui import QImage
 from ..models.db_manager import save_company_info,load_company_info
+from ..models.logo import prepare_logo
+from .logo_cache import circular_pixmap, logos
 
 
 class AdminPage(QDialog):
@@ -205,14 +206,12 @@ class AdminPage(QDialog):
         
         main_layout.addLayout(buttons_layout)
         
-        # Store the logo path
+        # Store the logo path and, for a newly picked file, its prepared renditions
         self.logo_path = None
+        self.logo = None
 
-        #Load saved data from the database
+        #Load saved data (and the stored circular logo) from the database
         self.load_data()
-
-        #loads circular logo
-        self.load_logo()
         
     def add_logo(self):
         file_dialog = QFileDialog()
@@ -221,53 +220,26 @@ class AdminPage(QDialog):
         )
 
         if file_path:
+            # Decode and scale the file once; save_data stores these renditions
+            logo = prepare_logo(file_path)
+            if logo is None:
+                return
             self.logo_path = file_path
-            original_pixmap = QPixmap(file_path)
-
-            # Scale image to desired size (e.g., 180x180)
-            size = 180
-            scaled_pixmap = original_pixmap.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-
-            # Create circular mask
-            mask = QPixmap(size, size)
-            mask.fill(Qt.transparent)
-
-            painter = QPainter(mask)
-            painter.setRenderHint(QPainter.Antialiasing)
-            path = QPainterPath()
-            path.addEllipse(0, 0, size, size)
-            painter.setClipPath(path)
-            painter.drawPixmap(0, 0, scaled_pixmap)
-            painter.end()
-
-            self.logo_frame.setPixmap(mask)
-            self.logo_frame.setStyleSheet("background-color: transparent;")
+            self.logo = logo
+            self.show_logo(circular_pixmap(QImage.fromData(logo[1], "PNG"), 180))
     
     def remove_logo(self):
         self.logo_path = None
-        self.logo_frame.clear()
-        self.logo_frame.setStyleSheet("background-color: #f8f8f8; border-radius: 90px;")
+        self.logo = None
+        self.show_logo(None)
     
-    def load_logo(self):
-        if hasattr(self, 'logo_path') and os.path.exists(self.logo_path):
-            original_pixmap = QPixmap(self.logo_path)
-            size = 180
-            scaled_pixmap = original_pixmap.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-
-            # Create circular mask again
-            mask = QPixmap(size, size)
-            mask.fill(Qt.transparent)
-
-            painter = QPainter(mask)
-            painter.setRenderHint(QPainter.Antialiasing)
-            path = QPainterPath()
-            path.addEllipse(0, 0, size, size)
-            painter.setClipPath(path)
-            painter.drawPixmap(0, 0, scaled_pixmap)
-            painter.end()
-
-            self.logo_frame.setPixmap(mask)
-            self.logo_frame.setStyleSheet("background-color: transparent;")
+    def show_logo(self, pixmap):
+        if pixmap is None:
+            self.logo_frame.clear()
+            self.logo_frame.setStyleSheet("background-color: #f8f8f8; border-radius: 90px;")
+            return
+        self.logo_frame.setPixmap(pixmap)
+        self.logo_frame.setStyleSheet("background-color: transparent;")
    
     def clear_form(self):
         # Clear all form fields
@@ -290,6 +262,7 @@ class AdminPage(QDialog):
             'contact': self.contact.text().strip(),
             'address': self.address.toPlainText().strip(),
             'logo_path': self.logo_path,
+            'logo': self.logo,
             'bank_name': self.bank_name.text().strip(),
             'account_number': self.account_number.text().strip(),
             'bank_ifsc': self.bank_ifsc.text().strip(),
@@ -317,10 +290,6 @@ class AdminPage(QDialog):
             self.bank_ifsc.setText(data.get('bank_ifsc', ''))
             self.bank_branch.setText(data.get('bank_branch', ''))
         
+            # The stored logo, even if the original file has since moved
             self.logo_path = data.get('logo_path')
-            if self.logo_path and os.path.exists(self.logo_path):
-                pixmap = QPixmap(self.logo_path).scaled(180, 180, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.logo_frame.setPixmap(pixmap)
-                self.logo_frame.setStyleSheet("background-color: transparent; border-radius: 90px;")
-            else:
-                self.remove_logo()
+            self.show_logo(logos.circle(data))
@@ -0,0 +1,145 @@
+"""
+Batch PDF export of invoices across a process pool.
+
+Every worker process opens its own read-only connection to the database
+and its own offscreen renderer, so rendering scales with the number of
+cores instead of running one invoice at a time on the GUI thread.
+
+Export a month to ~/Documents/Finvo/Invoices:
+
+    python -m invoice_system.app.ui.batch_export --from 2025-06-01 --to 2025-06-30
+
+or specific invoices to a folder:
+
+    python -m invoice_system.app.ui.batch_export --ids 12 15 19 --out exports/
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from ..models.db_manager import (compute_invoice_taxes, get_database_path, list_invoice_ids,
+                                 set_database_path)
+from ..models.pdf_cache import cache as pdf_cache
+from .pdf_renderer import ensure_gui_application, export_dir, export_invoice_pdf
+
+# Set in each worker by _init_worker
+_worker_folder = None
+
+
+def _init_worker(db_path, folder, cache_dir):
+    """Process pool initializer: read-only DB connection, parent's PDF cache and offscreen Qt."""
+    global _worker_folder
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    set_database_path(db_path, read_only=True)
+    pdf_cache.configure(cache_dir)
+    ensure_gui_application()
+    _worker_folder = folder
+
+
+def _export_one(invoice_id):
+    """Render one invoice in a worker; returns (invoice_id, path, error)."""
+    try:
+        path = export_invoice_pdf(invoice_id, _worker_folder)
+    except Exception as e:
+        return invoice_id, None, str(e)
+    if path is None:
+        return invoice_id, None, "Invoice not found"
+    return invoice_id, str(path), None
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def export_invoices(invoice_ids=None, date_from=None, date_to=None, folder=None,
+                    workers=None, progress=None):
+    """
+    Render many invoices to PDF in parallel.
+
+    Args:
+        invoice_ids: Invoices to export; when None, every invoice dated
+            between date_from and date_to ('YYYY-MM-DD', inclusive)
+        date_from (str): Lower date bound used when invoice_ids is None
+        date_to (str): Upper date bound used when invoice_ids is None
+        folder: Output folder (defaults to export_dir("Invoices"))
+        workers (int): Worker processes (defaults to one per core, minus one)
+        progress: Optional callable(done, total, invoice_id, error) called
+            in this process after each invoice; return False to cancel
+
+    Returns:
+        dict: 'exported' (list of (invoice_id, path)), 'failed'
+              (list of (invoice_id, error)) and 'cancelled' (bool)
+    """
+    result = {"exported": [], "failed": [], "cancelled": False}
+    if invoice_ids is None:
+        invoice_ids = list_invoice_ids({"date_from": date_from, "date_to": date_to})
+    invoice_ids = [int(invoice_id) for invoice_id in invoice_ids]
+    if not invoice_ids:
+        return result
+
+    # Workers are read-only, so bring the tax rows up to date first in one set-based pass
+    compute_invoice_taxes(invoice_ids)
+
+    folder = Path(folder) if folder else export_dir("Invoices")
+    folder.mkdir(parents=True, exist_ok=True)
+    workers = min(workers or default_workers(), len(invoice_ids))
+
+    # spawn, not fork: the parent may be running a Qt GUI
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(str(get_database_path()), str(folder),
+                                       str(pdf_cache.directory))) as executor:
+        futures = [executor.submit(_export_one, invoice_id) for invoice_id in invoice_ids]
+        for done, future in enumerate(as_completed(futures), 1):
+            invoice_id, path, error = future.result()
+            if error:
+                result["failed"].append((invoice_id, error))
+            else:
+                result["exported"].append((invoice_id, path))
+
+            if progress is not None and progress(done, len(invoice_ids), invoice_id, error) is False:
+                result["cancelled"] = True
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    return result
+
+
+def main(argv=None):
+    """Command line entry point for batch invoice export."""
+    parser = argparse.ArgumentParser(description="Export invoice PDFs in parallel.")
+    parser.add_argument("--db", help="database file (default: invoice_app.db in the working directory)")
+    parser.add_argument("--from", dest="date_from", help="first invoice date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="last invoice date, YYYY-MM-DD")
+    parser.add_argument("--ids", type=int, nargs="+", help="export these invoice ids instead of a date range")
+    parser.add_argument("--out", help="output folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    if args.db:
+        set_database_path(args.db)
+
+    def report(done, total, invoice_id, error):
+        if error:
+            print(f"[{done}/{total}] invoice {invoice_id} failed: {error}")
+        elif done % 100 == 0 or done == total:
+            print(f"[{done}/{total}] exported")
+
+    start = time.perf_counter()
+    result = export_invoices(args.ids, args.date_from, args.date_to, args.out,
+                             args.workers, progress=report)
+    elapsed = time.perf_counter() - start
+
+    exported = len(result["exported"])
+    print(f"Exported {exported} invoices in {elapsed:.1f}s, {len(result['failed'])} failed")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
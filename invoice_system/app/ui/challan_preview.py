@@ -1,17 +1,22 @@
 from PySide6.QtWidgets import (QWidget, QLineEdit, QPushButton, QDialog, QVBoxLayout,
-                            QLabel, QRadioButton, QButtonGroup, QDialogButtonBox, QTableWidget,
-                            QMessageBox, QMainWindow, QTextEdit, QScrollArea, QFrame, QTableWidgetItem,
-                            QHBoxLayout, QGridLayout, QHeaderView, QSpacerItem, QSizePolicy)
-from PySide6.QtCore import Qt, QPoint, QRect, QMarginsF, QSize
-from PySide6.QtGui import QFont, QPainter, QPixmap, QPdfWriter, QPageLayout, QPageSize, QRegion, QColor
+                            QLabel, QRadioButton, QButtonGroup, QDialogButtonBox,
+                            QMainWindow, QTextEdit, QScrollArea, QFrame,
+                            QHBoxLayout, QGridLayout, QSpacerItem, QSizePolicy)
+from PySide6.QtCore import Qt, QRect, QSize
+from PySide6.QtGui import QFont
 from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog, QPrintDialog
-import os
 import sqlite3
+from .job_queue import jobs, show_jobs_panel
+from .logo_cache import logos
+from .preview_table import create_document_table
+from .pdf_renderer import (CHALLAN_COLUMNS, CHALLAN_NOTES, challan_detail_fields,
+                           consignee_fields, export_dir, item_cells, render_challan_pdf)
 
 class ChallanPreview_Window(QMainWindow):
     def __init__(self, challan_id, parent=None):
         super().__init__(parent)
         self.challan_id = challan_id
+        self.document = None
         self.setWindowTitle("Delivery Challan Preview")
         self.setMinimumSize(900, 700)
         self.resize(1000, 800)
@@ -166,6 +171,9 @@ class ChallanPreview_Window(QMainWindow):
 
             conn.close()
 
+            # Keep the loaded rows so Download renders without re-querying
+            self.document = (challan, items, company)
+
             # Display UI
             self.create_challan_ui(challan, items, company)
 
@@ -249,13 +257,9 @@ class ChallanPreview_Window(QMainWindow):
         logo_layout.setContentsMargins(0, 0, 0, 0)
         
         logo_label = QLabel()
-        if company and company["logo_path"]:
-            try:
-                pixmap = QPixmap(company["logo_path"])
-                if not pixmap.isNull():
-                    logo_label.setPixmap(pixmap.scaledToWidth(150, Qt.SmoothTransformation))
-            except Exception as e:
-                print(f"Failed to load logo: {e}")
+        pixmap = logos.screen_pixmap(company)
+        if pixmap is not None:
+            logo_label.setPixmap(pixmap)
         
         # Placeholder if no logo
         if logo_label.pixmap() is None or logo_label.pixmap().isNull():
@@ -306,31 +310,22 @@ class ChallanPreview_Window(QMainWindow):
         customer_layout.addWidget(title)
         
         # Customer details
-        details = [
-            ("Name:", challan['customer_name'] if challan['customer_name'] else 'N/A'),
-            ("Address:", challan['customer_address'] if challan['customer_address'] else 'N/A'),
-            ("GSTIN:", challan['gstin'] if challan['gstin'] else 'N/A'),
-            ("State:", challan['state'] if challan['state'] else 'N/A'),
-            ("State Code:", challan['state_code'] if challan['state_code'] else 'N/A')
-        ]
-        
-        for label_text, value in details:
-            if value and value != 'N/A':
-                detail_layout = QVBoxLayout()
-                detail_layout.setSpacing(2)
-                
-                label = QLabel(label_text)
-                label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                label.setStyleSheet("color: #000000; border: none; padding: 0;")
-                
-                value_label = QLabel(str(value))
-                value_label.setFont(QFont("Segoe UI", 11))
-                value_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 8px;")
-                value_label.setWordWrap(True)
-                
-                detail_layout.addWidget(label)
-                detail_layout.addWidget(value_label)
-                customer_layout.addLayout(detail_layout)
+        for label_text, value in consignee_fields(challan):
+            detail_layout = QVBoxLayout()
+            detail_layout.setSpacing(2)
+            
+            label = QLabel(label_text)
+            label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            label.setStyleSheet("color: #000000; border: none; padding: 0;")
+            
+            value_label = QLabel(value)
+            value_label.setFont(QFont("Segoe UI", 11))
+            value_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 8px;")
+            value_label.setWordWrap(True)
+            
+            detail_layout.addWidget(label)
+            detail_layout.addWidget(value_label)
+            customer_layout.addLayout(detail_layout)
         
         customer_layout.addStretch()
         return customer_widget
@@ -348,36 +343,22 @@ class ChallanPreview_Window(QMainWindow):
         title.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 10px;")
         challan_layout.addWidget(title)
         
-        # Challan details
-        details = [
-            ("Challan No:", challan['challan_no']),
-            ("Date:", challan['date']),
-        ]
-        
-        # Add transport details if available
-        if challan['vehicle'] and challan['vehicle'].strip():
-            details.append(("Vehicle No:", challan['vehicle']))
-        if challan['transporter'] and challan['transporter'].strip():
-            details.append(("Transporter:", challan['transporter']))
-        if challan['lr'] and challan['lr'].strip():
-            details.append(("LR No:", challan['lr']))
-        
-        for label_text, value in details:
-            if value and value != 'N/A':
-                detail_layout = QVBoxLayout()
-                detail_layout.setSpacing(2)
-                
-                label = QLabel(label_text)
-                label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                label.setStyleSheet("color: #000000; border: none; padding: 0;")
-                
-                value_label = QLabel(str(value))
-                value_label.setFont(QFont("Segoe UI", 11))
-                value_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 8px;")
-                
-                detail_layout.addWidget(label)
-                detail_layout.addWidget(value_label)
-                challan_layout.addLayout(detail_layout)
+        # Challan details (transport fields only when filled in)
+        for label_text, value in challan_detail_fields(challan):
+            detail_layout = QVBoxLayout()
+            detail_layout.setSpacing(2)
+            
+            label = QLabel(label_text)
+            label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            label.setStyleSheet("color: #000000; border: none; padding: 0;")
+            
+            value_label = QLabel(value)
+            value_label.setFont(QFont("Segoe UI", 11))
+            value_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 8px;")
+            
+            detail_layout.addWidget(label)
+            detail_layout.addWidget(value_label)
+            challan_layout.addLayout(detail_layout)
         
         challan_layout.addStretch()
         return challan_widget
@@ -391,78 +372,9 @@ class ChallanPreview_Window(QMainWindow):
         table_title.setStyleSheet("color: #000000; margin: 25px 0 15px 0;")
         self.content_layout.addWidget(table_title)
         
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(7)
-        headers = ["Sl No.", "Description", "HSN/SAC", "Quantity", "Type", "Rate", "Total"]
-        table.setHorizontalHeaderLabels(headers)
-        table.setRowCount(len(items))
-        
-        # Populate table
-        for row, item in enumerate(items):
-            # Serial number
-            sl_item = QTableWidgetItem(str(row + 1))
-            sl_item.setTextAlignment(Qt.AlignCenter)
-            sl_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 0, sl_item)
-            
-            # Description
-            desc_item = QTableWidgetItem(item["description"] or "")
-            desc_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 1, desc_item)
-            
-            # HSN/SAC
-            hsn_item = QTableWidgetItem(item["hsn"] or "")
-            hsn_item.setTextAlignment(Qt.AlignCenter)
-            hsn_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 2, hsn_item)
-            
-            # Quantity
-            qty_item = QTableWidgetItem(str(item["quantity"]) if item["quantity"] else "0")
-            qty_item.setTextAlignment(Qt.AlignRight)
-            qty_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 3, qty_item)
-            
-            # Type
-            type_item = QTableWidgetItem(item["type"] or "")
-            type_item.setTextAlignment(Qt.AlignCenter)
-            type_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 4, type_item)
-            
-            # Rate
-            rate_item = QTableWidgetItem(f"₹{item['rate']:.2f}" if item["rate"] else "₹0.00")
-            rate_item.setTextAlignment(Qt.AlignRight)
-            rate_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 5, rate_item)
-            
-            # Total
-            total_item = QTableWidgetItem(f"₹{item['total']:.2f}" if item["total"] else "₹0.00")
-            total_item.setTextAlignment(Qt.AlignRight)
-            total_item.setFont(QFont("Segoe UI", 11, QFont.Bold))
-            table.setItem(row, 6, total_item)
-        
-        # Configure table
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionMode(QTableWidget.NoSelection)
-        table.verticalHeader().setVisible(False)
-        
-        # Set column widths
-        table.setColumnWidth(0, 60)   # Sl No
-        table.setColumnWidth(2, 80)   # HSN
-        table.setColumnWidth(3, 80)   # Quantity  
-        table.setColumnWidth(4, 60)   # Type
-        table.setColumnWidth(5, 100)  # Rate
-        table.setColumnWidth(6, 120)  # Total
-        
-        # Description column stretches
-        header = table.horizontalHeader()
-        header.setSectionResizeMode(1, QHeaderView.Stretch)
-        
-        # Set table height
-        row_height = 35
-        header_height = 40
-        table_height = (len(items) * row_height) + header_height + 10
-        table.setFixedHeight(min(table_height, 400))
+        # Model/view table over the loaded rows (columns shared with the PDF renderer)
+        table = create_document_table(CHALLAN_COLUMNS, item_cells(CHALLAN_COLUMNS, items),
+                                      bold_column=len(CHALLAN_COLUMNS) - 1, stretch_column=1)
         
         self.content_layout.addWidget(table)
     
@@ -514,16 +426,11 @@ class ChallanPreview_Window(QMainWindow):
         notes_layout = QVBoxLayout(notes_widget)
         notes_layout.setSpacing(10)
         
-        notes_title = QLabel("NOTE:")
+        notes_title = QLabel(CHALLAN_NOTES[0])
         notes_title.setFont(QFont("Segoe UI", 12, QFont.Bold))
         notes_title.setStyleSheet("color: #000000; border: none; background: transparent;")
         
-        notes_text = QLabel(
-            "1. This is a computer-generated delivery challan and does not require a signature.\n"
-            "2. All goods mentioned above are delivered in good condition.\n"
-            "3. Any discrepancy should be reported within 24 hours of delivery.\n"
-            "4. This challan is valid for transportation purposes only."
-        )
+        notes_text = QLabel(CHALLAN_NOTES[1])
         notes_text.setFont(QFont("Segoe UI", 11))
         notes_text.setStyleSheet("color: #000000; border: none; background: transparent; line-height: 1.5;")
         notes_text.setWordWrap(True)
@@ -542,74 +449,15 @@ class ChallanPreview_Window(QMainWindow):
         return line
     
     def download_challan(self):
-        """Download challan as PDF"""
-        folder_path = r"C:\Users\91863\OneDrive\Desktop\Practice\Challans_pdf"
-        
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-
-        file_name = f"Challan_{self.challan_id}.pdf"
-        file_path = os.path.join(folder_path, file_name)
-
-        try:
-            # PDF writer setup
-            pdf_writer = QPdfWriter(file_path)
-            pdf_writer.setPageSize(QPageSize(QPageSize.A4))
-            pdf_writer.setPageMargins(QMarginsF(15, 15, 15, 15), QPageLayout.Millimeter)
-
-            # Create painter
-            painter = QPainter(pdf_writer)
-            if not painter.isActive():
-                raise RuntimeError("Painter could not start on PDF writer")
-
-            # Scale widget to fit width of PDF page
-            self.challan_content.adjustSize()
-            widget_width = self.challan_content.width()
-            pdf_width = pdf_writer.width()
-            scale = pdf_width / widget_width
-            painter.scale(scale, scale)
+        """Render the challan to PDF in the background and show it in the jobs panel"""
+        if self.document is None:
+            return
 
-            # Render the challan content
-            self.challan_content.render(
-                painter,
-                QPoint(0, 0),
-                QRegion(self.challan_content.rect()),
-                QWidget.RenderFlags(QWidget.DrawChildren)
-            )
-
-            painter.end()
-            
-            # Success message
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Success")
-            msg.setText("Challan saved successfully!")
-            msg.setDetailedText(f"File saved at:\n{file_path}")
-            msg.setIcon(QMessageBox.Information)
-            msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: white;
-                }
-                QMessageBox QLabel {
-                    color: #212529;
-                }
-            """)
-            msg.exec()
-
-        except Exception as e:
-            error_msg = QMessageBox(self)
-            error_msg.setWindowTitle("Error")
-            error_msg.setText("Failed to generate PDF")
-            error_msg.setDetailedText(str(e))
-            error_msg.setIcon(QMessageBox.Critical)
-            error_msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: white;
-                }
-                QMessageBox QLabel {
-                    color: #212529;
-                }
-            """)
-            error_msg.exec()
+        file_path = export_dir("Challans") / f"Challan_{self.challan_id}.pdf"
+        document = self.document
+        jobs.submit(f"Challan {document[0]['challan_no']} PDF",
+                    lambda job: render_challan_pdf(file_path, *document))
+        show_jobs_panel()
     
     def clear_layout(self, layout):
         """Clear all widgets from a layout"""
@@ -3,9 +3,10 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QStackedWidget, 
     QGridLayout, QFrame, QSizePolicy,QHBoxLayout,QPushButton
 )
-from .create_challan import CreateChallan
-from .manage_challan import Manage_Challan 
-from ..models.db_manager import get_all_challans
+from .window_manager import windows
+from ..models.db_manager import count_challans
+from ..models.events import CHALLANS
+from .data_events import data_events
 
 class ChallanView(QWidget):
     def __init__(self):
@@ -27,12 +28,17 @@ class ChallanView(QWidget):
         # Set Challan page as default
         self.stacked_widget.setCurrentWidget(self.challan_widget)
 
-        # Set up auto-refresh timer
-        self.refresh_timer = QTimer()
+        # Refresh when challans change instead of polling the database;
+        # several changes in one event-loop pass cause a single refresh
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(0)
         self.refresh_timer.timeout.connect(self.refresh_dashboard)
-        self.refresh_timer.start(3000)  # Refresh every 3 seconds (adjust as needed)
+        self.stale = False
+        data_events.changed.connect(self.on_data_changed)
 
-        self.refresh_dashboard()  # Load data on startup
+        # First load once the event loop runs, so building the page does not wait on the database
+        self.refresh_timer.start()
 
     def show_challan(self):
         self.stacked_widget.setCurrentWidget(self.challan_widget)
@@ -40,12 +46,7 @@ class ChallanView(QWidget):
     def refresh_dashboard(self):
         """Refresh dashboard data from database"""
         try:
-            challan_list = get_all_challans()  # This returns a list of challans
-            # Create a data dictionary with the total count
-            data = {
-                "total_challan": len(challan_list),  # Count the number of challans
-                "challans": challan_list  # Store the actual challan data if needed elsewhere
-            }
+            data = {"total_challan": count_challans()}
             self.challan_widget.update_values(data)
         except Exception as e:
             print(f"Error refreshing challan dashboard: {e}")
@@ -57,30 +58,21 @@ class ChallanView(QWidget):
         """Force an immediate refresh (can be called from other parts of the app)"""
         self.refresh_dashboard()
 
-    def set_refresh_interval(self, milliseconds):
-        """Change the auto-refresh interval"""
-        self.refresh_timer.setInterval(milliseconds)
-
-    def start_auto_refresh(self):
-        """Start auto-refresh if stopped"""
-        if not self.refresh_timer.isActive():
+    def on_data_changed(self, change):
+        """Refresh after challans change; while hidden, wait until the page is shown"""
+        if not change.affects(CHALLANS):
+            return
+        if self.isVisible():
             self.refresh_timer.start()
-
-    def stop_auto_refresh(self):
-        """Stop auto-refresh"""
-        self.refresh_timer.stop()
+        else:
+            self.stale = True
 
     def showEvent(self, event):
-        """Called when widget becomes visible - refresh data"""
+        """Called when widget becomes visible - catch up on changes made while hidden"""
         super().showEvent(event)
-        self.refresh_dashboard()
-        self.start_auto_refresh()
-
-    def hideEvent(self, event):
-        """Called when widget becomes hidden - can pause refresh to save resources"""
-        super().hideEvent(event)
-        # Optionally stop auto-refresh when not visible to save resources
-        # self.stop_auto_refresh()
+        if self.stale:
+            self.stale = False
+            self.refresh_dashboard()
 
 class HoverBox(QFrame):
     def __init__(self, title, value="0", parent=None):
@@ -292,11 +284,7 @@ class ChallanWidget(QWidget):
             self.total_challan_box.set_value(total_challan)
         
     def open_challanPage(self):
-        self.createChallan_window = CreateChallan()
-        self.createChallan_window.show()
-        self.createChallan_window.showMaximized()
+        self.createChallan_window = windows.show("create_challan")
         
     def open_manageChallan_page(self):
-        self.manageChallan_window = Manage_Challan()
-        self.manageChallan_window.show()
-        self.manageChallan_window.showMaximized()
\ No newline at end of file
+        self.manageChallan_window = windows.show("manage_challan")
\ No newline at end of file
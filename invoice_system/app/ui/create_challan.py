@@ -7,8 +7,11 @@ from PySide6.QtWidgets import (
 import datetime
 import time 
 from PySide6.QtGui import QFont, QKeyEvent
-from .challan_preview import ChallanPreview_Window
-from ..models.db_manager import create_tables, save_challan
+from ..models.invoice_calculator import format_paise
+from .item_totals import ItemTableTotals, set_text
+from .product_completer import ProductDelegate, fill_items_row
+from .window_manager import windows
+from ..models.db_manager import save_challan
 
 class CustomTableWidget(QTableWidget):
     def __init__(self, rows, cols, parent=None):
@@ -49,8 +52,6 @@ class CreateChallan(QWidget):
         self.grand_total.setReadOnly(True)
         self.grand_total.setText("0.00")
         
-        create_tables
-        
         # Create a main scroll area for the entire window
         main_scroll = QScrollArea()
         main_scroll.setWidgetResizable(True)
@@ -246,9 +247,16 @@ class CreateChallan(QWidget):
         # Table Widget for items (removed GST % column)
         self.current_rows = 8
         self.items_table = CustomTableWidget(self.current_rows, 6)
-        self.items_table.cellChanged.connect(self.calculate_totals)
+        self.item_totals = ItemTableTotals(self.items_table, quantity_column=2, rate_column=4,
+                                           total_column=5)
+        self.item_totals.changed.connect(self.show_totals)
         self.items_table.setHorizontalHeaderLabels(["Description", "HSN/SAC", "Quantity", "Type", "Rate", "Total"])
 
+        # Typing a code or name in Description offers inventory products
+        self.product_delegate = ProductDelegate(self.items_table)
+        self.items_table.setItemDelegateForColumn(0, self.product_delegate)
+        self.product_delegate.product_chosen.connect(self.fill_product_row)
+
         # Set column stretch
         header = self.items_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)
@@ -323,34 +331,17 @@ class CreateChallan(QWidget):
         unique_id = str(int(time.time() * 1000))[-5:]  # Last 5 digits of milliseconds
         return f"CH-{date_str}-{unique_id}"
 
-    def calculate_totals(self): 
-        self.items_table.blockSignals(True)
-        grand_total = 0.0
-
-        for row in range(self.items_table.rowCount()):
-            quantity_item = self.items_table.item(row, 2)
-            rate_item = self.items_table.item(row, 4)
-
-            if quantity_item and rate_item and quantity_item.text().strip() and rate_item.text().strip():
-                try:
-                    quantity = float(quantity_item.text())
-                    rate = float(rate_item.text())
-                    total = quantity * rate
-
-                    total_item = QTableWidgetItem(f"{total:.2f}")
-                    total_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
-                    self.items_table.setItem(row, 5, total_item)
+    def calculate_totals(self):
+        """Recalculate every row; a cell edit only recalculates its own row (see item_totals)"""
+        self.item_totals.recalculate()
 
-                    grand_total += total
+    def show_totals(self, rate_indexes):
+        set_text(self.grand_total, format_paise(self.item_totals.totals.grand_total_paise))
 
-                except ValueError:
-                    pass
-            else:
-                # Clear total column if inputs are empty
-                self.items_table.setItem(row, 5, QTableWidgetItem(""))
-
-        self.grand_total.setText(f"{grand_total:.2f}")
-        self.items_table.blockSignals(False)
+    def fill_product_row(self, row, product):
+        """Fill the rest of an items row from the inventory product picked in Description"""
+        fill_items_row(self.items_table, row, product, quantity_column=2, type_column=3,
+                       rate_column=4)
 
     def toggle_vehicle_field(self, text):
         self.vehicle_no.setEnabled(text == "YES")
@@ -407,6 +398,13 @@ class CreateChallan(QWidget):
         # Clear grand total
         self.grand_total.setText("0.00")
 
+    def reopen(self):
+        """Called by the window manager: start a new challan in the same window"""
+        self.current_rows = 8
+        self.items_table.setRowCount(self.current_rows)
+        self.clear_form()
+        self.current_challan_id = None
+
     def get_cell_text(self, row, col):
         """Safely get text from a table cell"""
         item = self.items_table.item(row, col)
@@ -497,5 +495,4 @@ class CreateChallan(QWidget):
     def show_challan_preview(self):
         """Open the challan preview window"""
         if self.current_challan_id:
-            preview_window = ChallanPreview_Window(self.current_challan_id, self)
-            preview_window.show()
\ No newline at end of file
+            windows.show_preview("challan_preview", self.current_challan_id)
\ No newline at end of file
@@ -4,12 +4,14 @@ from PySide6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QPushButton, QScrollArea,QDialog,
     QFrame, QGridLayout, QHeaderView, QSizePolicy, QComboBox,QMessageBox,QDialogButtonBox
 )
-import sqlite3
 import datetime
 import time 
 from PySide6.QtGui import QFont, QKeyEvent
-from .invoice_preview import InvoicePreviewWindow
-from ..models.db_manager import create_tables, save_invoice,calculate_and_insert_invoice_taxes
+from .item_totals import GST_RATES, ItemTableTotals, set_text
+from .product_completer import ProductDelegate, fill_items_row
+from .window_manager import windows
+from ..models.db_manager import save_invoice,calculate_and_insert_invoice_taxes,load_company_info
+from ..models.invoice_calculator import InvoiceCalculator, format_paise
 
 class CustomTableWidget(QTableWidget):
     def __init__(self, rows, cols, parent=None):
@@ -38,20 +40,24 @@ class CustomTableWidget(QTableWidget):
             # Default handler for other keys
             super().keyPressEvent(event)
 
+def new_calculator():
+    """Invoice calculator for the company's current GSTIN"""
+    company = load_company_info() or {}
+    return InvoiceCalculator(company.get('gstin'))
+
 class CreateInvoice(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Create Invoice")
         
         self.current_invoice_id = None
+        self.calculator = new_calculator()
         
         # Need to add a QLabel or similar widget to display the grand total
         self.grand_total = QLineEdit()
         self.grand_total.setReadOnly(True)
         self.grand_total.setText("0.00")
         
-        create_tables()
-        
         # Create a main scroll area for the entire window
         main_scroll = QScrollArea()
         main_scroll.setWidgetResizable(True)
@@ -168,6 +174,7 @@ class CreateInvoice(QWidget):
         
         customer_layout.addWidget(QLabel("GSTIN :"), 2, 0)
         self.customer_gstin = QLineEdit()
+        self.customer_gstin.textChanged.connect(self.update_place_of_supply)
         customer_layout.addWidget(self.customer_gstin, 2, 1)
         
         customer_layout.addWidget(QLabel("State :"), 3, 0)
@@ -176,6 +183,7 @@ class CreateInvoice(QWidget):
         
         customer_layout.addWidget(QLabel("Code :"), 3, 2)
         self.state_code = QLineEdit()
+        self.state_code.textChanged.connect(self.update_place_of_supply)
         customer_layout.addWidget(self.state_code, 3, 3)
         
         # Right side
@@ -252,9 +260,16 @@ class CreateInvoice(QWidget):
        # Table Widget for items
         self.current_rows = 8
         self.items_table = CustomTableWidget(self.current_rows, 7)
-        self.items_table.cellChanged.connect(self.calculate_totals)
+        self.item_totals = ItemTableTotals(self.items_table, quantity_column=2, rate_column=4,
+                                           total_column=6, gst_column=5)
+        self.item_totals.changed.connect(self.show_totals)
         self.items_table.setHorizontalHeaderLabels(["Description", "HSN/SAC", "Quantity", "Type", "Rate", "GST %", "Total"])
 
+        # Typing a code or name in Description offers inventory products
+        self.product_delegate = ProductDelegate(self.items_table)
+        self.items_table.setItemDelegateForColumn(0, self.product_delegate)
+        self.product_delegate.product_chosen.connect(self.fill_product_row)
+
         # Set column stretch
         header = self.items_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)
@@ -296,7 +311,7 @@ class CreateInvoice(QWidget):
         gst_layout = QGridLayout(gst_frame)
         
         # Right side - GST rates
-        gst_rates = ["0%", "0.25%", "3%", "5%", "12%", "18%", "28%"]
+        gst_rates = [f"{rate:g}%" for rate in GST_RATES]
         for i, rate in enumerate(gst_rates):
             gst_layout.addWidget(QLabel(rate), 0, i+2)
         
@@ -306,7 +321,7 @@ class CreateInvoice(QWidget):
         for i, gst_type in enumerate(gst_types):
             gst_layout.addWidget(QLabel(gst_type), i+1, 1)
             row_fields = []
-            for j in range(7):
+            for j in range(len(GST_RATES)):
                 field = QLineEdit()
                 gst_layout.addWidget(field, i+1, j+2)
                 row_fields.append(field)
@@ -351,78 +366,34 @@ class CreateInvoice(QWidget):
         unique_id = str(int(time.time() * 1000))[-5:]  # Last 5 digits of milliseconds
         return f"INV-{date_str}-{unique_id}"
 
-    def calculate_totals(self): 
-        self.items_table.blockSignals(True)
-        grand_total = 0.0
-
-        # Clear GST fields first
-        for gst_type in self.gst_fields:
-            for field in self.gst_fields[gst_type]:
-                field.setText("")
-
-        # Create GST accumulators
-        gst_accumulator = {
-            "SGST": [0.0] * 7,
-            "CGST": [0.0] * 7,
-            "IGST": [0.0] * 7,
-            "Taxation": [0.0] * 7,
-        }
-
-        # Rate reference
-        gst_rates = ["0%", "0.25%", "3%", "5%", "12%", "18%", "28%"]
-        gst_rate_values = [float(rate.strip('%')) for rate in gst_rates]
-
-        for row in range(self.items_table.rowCount()):
-            quantity_item = self.items_table.item(row, 2)
-            rate_item = self.items_table.item(row, 4)
-            gst_item = self.items_table.item(row, 5)
-
-            if quantity_item and rate_item and quantity_item.text().strip() and rate_item.text().strip():
-                try:
-                    quantity = float(quantity_item.text())
-                    rate = float(rate_item.text())
-                    total = quantity * rate
-
-                    total_item = QTableWidgetItem(f"{total:.2f}")
-                    total_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled|Qt.ItemIsEditable)
-                    self.items_table.setItem(row, 6, total_item)
-
-                    grand_total += total
+    def calculate_totals(self):
+        """Recalculate every row; a cell edit only recalculates its own row (see item_totals)"""
+        self.item_totals.recalculate()
+
+    def show_totals(self, rate_indexes):
+        """Repaint the grand total and the GST fields of the rates that changed"""
+        totals = self.item_totals.totals
+        set_text(self.grand_total, format_paise(totals.grand_total_paise))
+        for index in rate_indexes:
+            sgst, cgst, igst = totals.tax(index)
+            tax_total = sgst + cgst + igst
+            set_text(self.gst_fields["SGST"][index], format_paise(sgst) if sgst else "")
+            set_text(self.gst_fields["CGST"][index], format_paise(cgst) if cgst else "")
+            set_text(self.gst_fields["IGST"][index], format_paise(igst))
+            set_text(self.gst_fields["Taxation"][index], format_paise(tax_total) if tax_total else "")
+
+    def update_place_of_supply(self):
+        """Charge IGST instead of CGST + SGST while the customer is in another state"""
+        inter_state = self.calculator.is_inter_state(self.state_code.text(), self.customer_gstin.text())
+        if inter_state != self.item_totals.totals.inter_state:
+            self.item_totals.totals.inter_state = inter_state
+            self.show_totals(range(len(GST_RATES)))
+
+    def fill_product_row(self, row, product):
+        """Fill the rest of an items row from the inventory product picked in Description"""
+        fill_items_row(self.items_table, row, product, quantity_column=2, type_column=3,
+                       rate_column=4, gst_column=5)
 
-                    # GST calculation
-                    if gst_item and gst_item.text().strip():
-                        gst_value = float(gst_item.text())
-                        if gst_value in gst_rate_values:
-                            index = gst_rate_values.index(gst_value)
-
-                            sgst = (gst_value / 2) * total / 100
-                            cgst = (gst_value / 2) * total / 100
-                            igst = 0.0  # Assuming IGST is 0
-                            tax_total = sgst + cgst + igst
-
-                            gst_accumulator["SGST"][index] += sgst
-                            gst_accumulator["CGST"][index] += cgst
-                            gst_accumulator["IGST"][index] += igst
-                            gst_accumulator["Taxation"][index] += tax_total
-
-                except ValueError:
-                    pass
-            else:
-                # Clear total column if inputs are empty
-                self.items_table.setItem(row, 6, QTableWidgetItem(""))
-
-        # Update GST fields
-        for gst_type in self.gst_fields:
-            for i in range(7):
-                amount = gst_accumulator[gst_type][i]
-                if gst_type == "IGST":
-                    self.gst_fields[gst_type][i].setText("0.00")  # Always show 0.00
-                else:
-                    self.gst_fields[gst_type][i].setText(f"{amount:.2f}" if amount > 0 else "")
-        self.grand_total.setText(f"{grand_total:.2f}")
-        self.items_table.blockSignals(False)
-
-    
     def toggle_challan_field(self, text):
         self.challan_no.setEnabled(text == "YES")
         if text == "NO":
@@ -481,6 +452,18 @@ class CreateInvoice(QWidget):
             for field in fields:
                 field.clear()
 
+    def reopen(self):
+        """Called by the window manager: start a new invoice in the same window"""
+        self.current_rows = 8
+        self.items_table.setRowCount(self.current_rows)
+        self.clear_form()
+        self.invoice_no.setText(self.generate_invoice_no())
+        self.invoice_date.setText(QDate.currentDate().toString("dd-MM-yyyy"))
+        self.grand_total.setText("0.00")
+        self.current_invoice_id = None
+        # The company GSTIN (and with it the company's state) may have changed
+        self.calculator = new_calculator()
+
     def get_cell_text(self, row, col):
         """Safely get text from a table cell"""
         item = self.items_table.item(row, col)
@@ -651,35 +634,8 @@ class CreateInvoice(QWidget):
             # User canceled
             return None
 
-    def save_invoice_taxes(self, invoice_id):
-        """Save calculated tax amounts to database"""
-        try:
-            conn = sqlite3.connect('invoice_app.db')
-            cursor = conn.cursor()
-            
-            # Get the accumulated tax values from GST fields
-            for i in range(7):  # 7 GST rates
-                sgst_amount = float(self.gst_fields["SGST"][i].text()) if self.gst_fields["SGST"][i].text() else 0.0
-                cgst_amount = float(self.gst_fields["CGST"][i].text()) if self.gst_fields["CGST"][i].text() else 0.0
-                igst_amount = float(self.gst_fields["IGST"][i].text()) if self.gst_fields["IGST"][i].text() else 0.0
-                tax_total = float(self.gst_fields["Taxation"][i].text()) if self.gst_fields["Taxation"][i].text() else 0.0
-                
-                # Only insert if there are non-zero values
-                if sgst_amount > 0 or cgst_amount > 0 or igst_amount > 0:
-                    cursor.execute('''
-                        INSERT INTO invoice_taxes (invoice_id, sgst_amount, cgst_amount, igst_amount, tax_total)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (invoice_id, sgst_amount, cgst_amount, igst_amount, tax_total))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f"Error saving tax data: {e}")
-
     def show_invoice_preview(self):
         """Open the invoice preview window"""
         if self.current_invoice_id:
-            preview_window = InvoicePreviewWindow(self.current_invoice_id, self)
-            preview_window.show()       
+            windows.show_preview("invoice_preview", self.current_invoice_id)       
     
@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (
     QDialog, QDialogButtonBox, QGroupBox, QCheckBox
 )
 from PySide6.QtGui import QFont, QColor
-from ..models.db_manager import create_tables, update_customer, get_all_customers, get_customer_by_id, delete_customer
+from ..models.db_manager import create_tables, update_customer, get_all_customers, get_customer_by_id, delete_customer, search_customers
 from .add_customer import Add_Customer
 
 class EditCustomerDialog(QDialog):
@@ -502,18 +502,7 @@ class Edit_Customer(QWidget):
         try:
             customers = get_all_customers()
             # Convert to dictionary format for consistency
-            self.current_customers = []
-            for customer in customers:
-                customer_dict = {
-                    'id': customer[0],
-                    'customer_name': customer[1],
-                    'address': customer[2],
-                    'state': customer[3],
-                    'state_code': customer[4],
-                    'gstin': customer[5],
-                    'phone': customer[6]
-                }
-                self.current_customers.append(customer_dict)
+            self.current_customers = [self.customer_to_dict(customer) for customer in customers]
             
             self.apply_filters()  # Apply current filters to new data
             self.update_statistics()
@@ -521,6 +510,18 @@ class Edit_Customer(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load customer data: {str(e)}")
             
+    def customer_to_dict(self, customer):
+        """Convert a customers table row to a dictionary."""
+        return {
+            'id': customer[0],
+            'customer_name': customer[1],
+            'address': customer[2],
+            'state': customer[3],
+            'state_code': customer[4],
+            'gstin': customer[5],
+            'phone': customer[6]
+        }
+        
     def populate_table(self, customers):
         """Populate table with customer data."""
         self.customer_table.setRowCount(len(customers))
@@ -568,25 +569,9 @@ class Edit_Customer(QWidget):
         search_term = self.search_input.text().strip().lower()
         
         if search_term:
-            # Enhanced local search - search in multiple fields
-            filtered_customers = []
-            for customer in self.current_customers:
-                # Search in multiple fields
-                searchable_text = ' '.join([
-                    str(customer.get('customer_name', '')).lower(),
-                    str(customer.get('address', '')).lower(),
-                    str(customer.get('state', '')).lower(),
-                    str(customer.get('gstin', '')).lower(),
-                    str(customer.get('phone', '')).lower(),
-                    str(customer.get('state_code', '')).lower()
-                ])
-                
-                # Support multiple search terms (AND logic)
-                search_terms = search_term.split()
-                if all(term in searchable_text for term in search_terms):
-                    filtered_customers.append(customer)
-            
-            self.filtered_customers = filtered_customers
+            # Ranked full-text search over name, address, state, GSTIN and phone
+            self.filtered_customers = [self.customer_to_dict(customer)
+                                       for customer in search_customers(search_term)]
         else:
             # No search term, apply other filters
             self.filtered_customers = self.current_customers.copy()
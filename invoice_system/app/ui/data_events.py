@@ -0,0 +1,69 @@
+"""
+Qt side of the data-change bus (models/events.py).
+
+DataEvents re-emits every bus event as a Qt signal, so slots of widgets
+run on the GUI thread whichever thread wrote to the database, and are
+disconnected automatically when the widget is destroyed.
+
+It also watches PRAGMA data_version on the GUI thread's connection. The
+value changes only when another connection (another process, or another
+thread of this one) commits. Checking it reads no database pages, so a
+slow timer costs next to nothing while the app is idle. Any change is
+published as EXTERNAL, even when this process's worker threads also
+committed in the meantime (their own events do not say what else
+changed); views coalesce refreshes, so the extra event is cheap.
+
+    data_events.changed.connect(self.on_data_changed)   # DataChanged
+"""
+import sqlite3
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from ..models.db_manager import get_connection
+from ..models.events import EXTERNAL, bus
+
+WATCH_INTERVAL_MS = 2000
+
+
+class DataEvents(QObject):
+    """Bus events as a Qt signal, plus the watcher for external writes."""
+    changed = Signal(object)   # DataChanged, delivered on the receiver's thread
+
+    def __init__(self):
+        super().__init__()
+        bus.subscribe(self.changed.emit)
+        self._timer = None
+        self._data_version = None
+
+    def watch_database(self, interval_ms=WATCH_INTERVAL_MS):
+        """Start checking for commits made outside this thread's connection (call on the GUI thread)."""
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.timeout.connect(self.check_database)
+        self._data_version = self._read_data_version()
+        self._timer.start(interval_ms)
+
+    def stop_watching(self):
+        if self._timer is not None:
+            self._timer.stop()
+
+    def check_database(self):
+        """Publish an EXTERNAL event if another process committed since the last check."""
+        version = self._read_data_version()
+        if version is None:
+            return
+        if self._data_version is not None and version != self._data_version:
+            bus.publish(None, EXTERNAL)
+        self._data_version = version
+
+    @staticmethod
+    def _read_data_version():
+        try:
+            with get_connection() as conn:
+                return conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Error checking for database changes: {e}")
+            return None
+
+
+data_events = DataEvents()
@@ -11,7 +11,7 @@ from .add_items import AddItems_Page
 from ..models.db_manager import (
     get_all_inventory_items, delete_inventory_item, 
     update_inventory_item, search_inventory_items,
-    get_low_stock_items, initialize_database
+    get_low_stock_items
 )
 
 class EditItemDialog(QDialog):
@@ -305,7 +305,6 @@ class InventoryViewPage(QWidget):
         super().__init__(parent)
         self.current_items = []
         self.filtered_items = []  # Store filtered results separately
-        initialize_database()  # Ensure database is initialized
         self.setup_ui()
         self.load_inventory_data()
         self.setWindowTitle("Inventory Management")
@@ -612,24 +611,8 @@ class InventoryViewPage(QWidget):
         search_term = self.search_input.text().strip().lower()
         
         if search_term:
-            # Enhanced local search - search in multiple fields
-            filtered_items = []
-            for item in self.current_items:
-                # Search in multiple fields
-                searchable_text = ' '.join([
-                    str(item.get('product_name', '')).lower(),
-                    str(item.get('product_code', '')).lower(),
-                    str(item.get('category', '')).lower(),
-                    str(item.get('description', '')).lower(),
-                    str(item.get('unit', '')).lower()
-                ])
-                
-                # Support multiple search terms (AND logic)
-                search_terms = search_term.split()
-                if all(term in searchable_text for term in search_terms):
-                    filtered_items.append(item)
-            
-            self.filtered_items = filtered_items
+            # Ranked full-text search over name, code, category, description and unit
+            self.filtered_items = search_inventory_items(search_term)
         else:
             # No search term, apply other filters
             self.filtered_items = self.current_items.copy()
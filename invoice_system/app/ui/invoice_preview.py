@@ -1,19 +1,23 @@
 from PySide6.QtWidgets import (QWidget, QLineEdit, QPushButton, QDialog, QVBoxLayout,
-                            QLabel, QRadioButton, QButtonGroup, QDialogButtonBox, QTableWidget,
-                            QMessageBox, QMainWindow, QTextEdit, QScrollArea, QFrame, QTableWidgetItem,
-                            QHBoxLayout, QGridLayout, QHeaderView, QSpacerItem, QSizePolicy)
-from PySide6.QtCore import Qt, QPoint, QRect, QMarginsF, QSize
-from PySide6.QtGui import QFont, QPainter, QPixmap, QPdfWriter, QPageLayout, QPageSize, QRegion, QColor
+                            QLabel, QRadioButton, QButtonGroup, QDialogButtonBox,
+                            QMainWindow, QTextEdit, QScrollArea, QFrame,
+                            QHBoxLayout, QGridLayout, QSpacerItem, QSizePolicy)
+from PySide6.QtCore import Qt, QRect, QSize
+from PySide6.QtGui import QFont
 from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog, QPrintDialog
-import os
-import sqlite3
-from ..models.db_manager import calculate_and_insert_invoice_taxes
+from ..models.db_manager import load_invoice_document
+from .job_queue import jobs, show_jobs_panel
+from .logo_cache import logos
+from .preview_table import create_document_table
+from .pdf_renderer import (INVOICE_COLUMNS, INVOICE_NOTES, TAX_COLUMNS, export_dir,
+                           invoice_detail_fields, item_cells, party_lines,
+                           render_invoice_pdf, tax_breakdown, tax_cells)
 
 class InvoicePreviewWindow(QMainWindow):
     def __init__(self, invoice_id, parent=None):
         super().__init__(parent)
         self.invoice_id = invoice_id
-        #self.conn = sqlite3.connect('invoice_app.db')
+        self.document = None
 
         self.setWindowTitle("Invoice Preview")
         self.setMinimumSize(900, 700)
@@ -141,43 +145,20 @@ class InvoicePreviewWindow(QMainWindow):
     def load_invoice_data(self):
         """Load invoice data from database and display it"""
         try:
-            conn = sqlite3.connect('invoice_app.db')
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            # Header, items, taxes and company in one read transaction
+            document = load_invoice_document(self.invoice_id)
 
-            # Fetch invoice details
-            cursor.execute("SELECT * FROM invoices WHERE id = ?", (self.invoice_id,))
-            invoice = cursor.fetchone()
-
-            if not invoice:
+            if document is None:
                 error_label = QLabel("Invoice not found!")
                 error_label.setStyleSheet("color: #dc3545; font-weight: bold;")
                 self.content_layout.addWidget(error_label)
                 return
 
-            # Fetch invoice items
-            cursor.execute("SELECT * FROM invoice_items WHERE invoice_id = ?", (self.invoice_id,))
-            items = cursor.fetchall()
-
-            # Fetch company info
-            cursor.execute("SELECT * FROM company_info WHERE id = 1")
-            company = cursor.fetchone()
-
-            conn.close()
-
-            # Ensure tax data exists and is up to date
-            self.ensure_tax_data_exists(self.invoice_id)
-            
-            # Fetch updated tax data after ensuring it exists
-            conn = sqlite3.connect('invoice_app.db')
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM invoice_taxes WHERE invoice_id = ?", (self.invoice_id,))
-            taxes = cursor.fetchall()
-            conn.close()
+            # Keep the loaded document so Download renders without re-querying
+            self.document = document
 
             # Display UI with tax data
-            self.create_invoice_ui(invoice, items, company, taxes)
+            self.create_invoice_ui(document.invoice, document.items, document.company, document.taxes)
 
         except Exception as e:
             error_label = QLabel(f"Error loading invoice: {str(e)}")
@@ -205,8 +186,7 @@ class InvoicePreviewWindow(QMainWindow):
         self.create_items_table(items)
 
         # === TAX BREAKDOWN ===
-        # Call the tax breakdown method with the correct invoice_id
-        self.create_tax_breakdown_section(self.invoice_id)
+        self.create_tax_breakdown_section(items, taxes)
         
         # === GRAND TOTAL ===
         self.create_grand_total_section(invoice['grand_total'])
@@ -264,13 +244,9 @@ class InvoicePreviewWindow(QMainWindow):
         logo_layout.setContentsMargins(0, 0, 0, 0)
         
         logo_label = QLabel()
-        if company and company["logo_path"]:
-            try:
-                pixmap = QPixmap(company["logo_path"])
-                if not pixmap.isNull():
-                    logo_label.setPixmap(pixmap.scaledToWidth(150, Qt.SmoothTransformation))
-            except Exception as e:
-                print(f"Failed to load logo: {e}")
+        pixmap = logos.screen_pixmap(company)
+        if pixmap is not None:
+            logo_label.setPixmap(pixmap)
         
         # Placeholder if no logo
         if logo_label.pixmap() is None or logo_label.pixmap().isNull():
@@ -324,21 +300,12 @@ class InvoicePreviewWindow(QMainWindow):
         bill_title.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 5px;")
         bill_layout.addWidget(bill_title)
         
-        bill_details = [
-            invoice['customer_name'] if invoice['customer_name'] else 'N/A',
-            invoice['customer_address'] if invoice['customer_address'] else 'N/A',
-            f"GSTIN: {invoice['gstin']}" if invoice['gstin'] else 'GSTIN: N/A',
-            f"State: {invoice['state']}" if invoice['state'] else 'State: N/A',
-            f"State Code: {invoice['state_code']}" if invoice['state_code'] else 'State Code: N/A'
-        ]
-        
-        for detail in bill_details:
-            if detail and 'N/A' not in detail:
-                detail_label = QLabel(str(detail))
-                detail_label.setFont(QFont("Segoe UI", 11))
-                detail_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 3px;")
-                detail_label.setWordWrap(True)
-                bill_layout.addWidget(detail_label)
+        for detail in party_lines(invoice):
+            detail_label = QLabel(detail)
+            detail_label.setFont(QFont("Segoe UI", 11))
+            detail_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 3px;")
+            detail_label.setWordWrap(True)
+            bill_layout.addWidget(detail_label)
         
         bill_layout.addStretch()
         return bill_widget
@@ -356,21 +323,12 @@ class InvoicePreviewWindow(QMainWindow):
         ship_title.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 5px;")
         ship_layout.addWidget(ship_title)
         
-        ship_details = [
-            invoice['customer_name'] if invoice['customer_name'] else 'N/A',
-            invoice['customer_address'] if invoice['customer_address'] else 'N/A',
-            f"GSTIN: {invoice['gstin']}" if invoice['gstin'] else 'GSTIN: N/A',
-            f"State: {invoice['state']}" if invoice['state'] else 'State: N/A',
-            f"State Code: {invoice['state_code']}" if invoice['state_code'] else 'State Code: N/A'
-        ]
-        
-        for detail in ship_details:
-            if detail and 'N/A' not in detail:
-                detail_label = QLabel(str(detail))
-                detail_label.setFont(QFont("Segoe UI", 11))
-                detail_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 3px;")
-                detail_label.setWordWrap(True)
-                ship_layout.addWidget(detail_label)
+        for detail in party_lines(invoice):
+            detail_label = QLabel(detail)
+            detail_label.setFont(QFont("Segoe UI", 11))
+            detail_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 3px;")
+            detail_label.setWordWrap(True)
+            ship_layout.addWidget(detail_label)
         
         ship_layout.addStretch()
         return ship_widget
@@ -389,28 +347,21 @@ class InvoicePreviewWindow(QMainWindow):
         invoice_layout.addWidget(title)
         
         # Invoice details
-        details = [
-            ("Invoice No:", invoice['invoice_no']),
-            ("Invoice Date:", invoice['date']),
-            ("Payment Status:", invoice['payment_status'])
-        ]
-        
-        for label_text, value in details:
-            if value and value != 'N/A':
-                detail_layout = QVBoxLayout()
-                detail_layout.setSpacing(2)
-                
-                label = QLabel(label_text)
-                label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-                label.setStyleSheet("color: #000000; border: none; padding: 0;")
-                
-                value_label = QLabel(str(value))
-                value_label.setFont(QFont("Segoe UI", 11))
-                value_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 8px;")
-                
-                detail_layout.addWidget(label)
-                detail_layout.addWidget(value_label)
-                invoice_layout.addLayout(detail_layout)
+        for label_text, value in invoice_detail_fields(invoice):
+            detail_layout = QVBoxLayout()
+            detail_layout.setSpacing(2)
+            
+            label = QLabel(label_text)
+            label.setFont(QFont("Segoe UI", 10, QFont.Bold))
+            label.setStyleSheet("color: #000000; border: none; padding: 0;")
+            
+            value_label = QLabel(value)
+            value_label.setFont(QFont("Segoe UI", 11))
+            value_label.setStyleSheet("color: #000000; border: none; padding: 0; margin-bottom: 8px;")
+            
+            detail_layout.addWidget(label)
+            detail_layout.addWidget(value_label)
+            invoice_layout.addLayout(detail_layout)
         
         invoice_layout.addStretch()
         return invoice_widget
@@ -424,107 +375,9 @@ class InvoicePreviewWindow(QMainWindow):
         table_title.setStyleSheet("color: #000000; margin: 25px 0 15px 0;")
         self.content_layout.addWidget(table_title)
         
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(8)
-        headers = ["Sl No.", "Description", "HSN/SAC", "Quantity", "Type", "Rate", "GST%", "Total"]
-        table.setHorizontalHeaderLabels(headers)
-        table.setRowCount(len(items))
-        table.setStyleSheet("""
-            QTableWidget {
-                font: 11pt "Segoe UI";
-                gridline-color: black;
-                border: 1px solid black;
-            }
-            QTableWidget::item {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border-right: 1px solid #e0e0e0;
-            }
-            QTableWidget::item:selected {
-                background-color: #e3f2fd;
-            }
-            QHeaderView::section {
-                background-color: white;
-                color: black;
-                font-weight: bold;
-                border: 1px solid black;
-                padding: 10px;
-            }
-        """)
-        
-        # Populate table
-        for row, item in enumerate(items):
-            # Serial number
-            sl_item = QTableWidgetItem(str(row + 1))
-            sl_item.setTextAlignment(Qt.AlignCenter)
-            sl_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 0, sl_item)
-            
-            # Description
-            desc_item = QTableWidgetItem(item["description"] or "")
-            desc_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 1, desc_item)
-            
-            # HSN/SAC
-            hsn_item = QTableWidgetItem(item["hsn"] or "")
-            hsn_item.setTextAlignment(Qt.AlignCenter)
-            hsn_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 2, hsn_item)
-            
-            # Quantity
-            qty_item = QTableWidgetItem(str(item["quantity"]) if item["quantity"] else "0")
-            qty_item.setTextAlignment(Qt.AlignRight)
-            qty_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 3, qty_item)
-            
-            # Type
-            type_item = QTableWidgetItem(item["type"] or "")
-            type_item.setTextAlignment(Qt.AlignCenter)
-            type_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 4, type_item)
-            
-            # Rate
-            rate_item = QTableWidgetItem(f"₹{item['rate']:.2f}" if item["rate"] else "₹0.00")
-            rate_item.setTextAlignment(Qt.AlignRight)
-            rate_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 5, rate_item)
-            
-            # GST%
-            gst_item = QTableWidgetItem(f"{item['gst_percent']}%" if item["gst_percent"] else "0%")
-            gst_item.setTextAlignment(Qt.AlignCenter)
-            gst_item.setFont(QFont("Segoe UI", 11))
-            table.setItem(row, 6, gst_item)
-            
-            # Total
-            total_item = QTableWidgetItem(f"₹{item['total']:.2f}" if item["total"] else "₹0.00")
-            total_item.setTextAlignment(Qt.AlignRight)
-            total_item.setFont(QFont("Segoe UI", 11, QFont.Bold))
-            table.setItem(row, 7, total_item)
-        
-        # Configure table
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionMode(QTableWidget.NoSelection)
-        table.verticalHeader().setVisible(False)
-        
-        # Set column widths
-        table.setColumnWidth(0, 60)   # Sl No
-        table.setColumnWidth(2, 80)   # HSN
-        table.setColumnWidth(3, 80)   # Quantity  
-        table.setColumnWidth(4, 60)   # Type
-        table.setColumnWidth(5, 100)  # Rate
-        table.setColumnWidth(6, 70)   # GST%
-        table.setColumnWidth(7, 120)  # Total
-        
-        # Description column stretches
-        header = table.horizontalHeader()
-        header.setSectionResizeMode(1, QHeaderView.Stretch)
-        
-        # Set table height
-        row_height = 35
-        header_height = 40
-        table_height = (len(items) * row_height) + header_height + 10
-        table.setFixedHeight(min(table_height, 400))
+        # Model/view table over the loaded rows (columns shared with the PDF renderer)
+        table = create_document_table(INVOICE_COLUMNS, item_cells(INVOICE_COLUMNS, items),
+                                      bold_column=len(INVOICE_COLUMNS) - 1, stretch_column=1)
         
         self.content_layout.addWidget(table)
     
@@ -576,11 +429,11 @@ class InvoicePreviewWindow(QMainWindow):
         notes_layout = QVBoxLayout(notes_widget)
         notes_layout.setSpacing(10)
         
-        notes_title = QLabel("NOTES:")
+        notes_title = QLabel(INVOICE_NOTES[0])
         notes_title.setFont(QFont("Segoe UI", 12, QFont.Bold))
         notes_title.setStyleSheet("color: #000000; border: none; background: transparent;")
         
-        notes_text = QLabel("Thank you for your business!")
+        notes_text = QLabel(INVOICE_NOTES[1])
         notes_text.setFont(QFont("Segoe UI", 11))
         notes_text.setStyleSheet("color: #000000; border: none; background: transparent; line-height: 1.5;")
         notes_text.setWordWrap(True)
@@ -590,51 +443,17 @@ class InvoicePreviewWindow(QMainWindow):
         
         self.content_layout.addWidget(notes_widget)
 
-   # Add this method to your InvoicePreviewWindow class
-
-    def get_tax_breakdown_from_db(self, invoice_id):
-        """Get tax breakdown from invoice_taxes table"""
-        try:
-            conn = sqlite3.connect('invoice_app.db')
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            if not invoice_id:
-                return []
-            
-            # Get all tax records for this invoice, ordered by GST rate
-            cursor.execute("""
-                SELECT gst_percent, sgst_amount, cgst_amount, igst_amount, tax_total
-                FROM invoice_taxes 
-                WHERE invoice_id = ?
-                ORDER BY gst_percent
-            """, (invoice_id,))
-            
-            tax_records = cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            return [dict(record) for record in tax_records]
-            
-        except Exception as e:
-            print(f"Error fetching tax breakdown: {e}")
-            return []
-        finally:
-            if conn:
-                conn.close()
-
-
-    def create_tax_breakdown_section(self, invoice_id=None):
-        """Create tax breakdown section using database data"""
+    def create_tax_breakdown_section(self, items, taxes):
+        """Create tax breakdown section from the loaded items and tax rows"""
         tax_title = QLabel("TAX BREAKDOWN")
         tax_title.setFont(QFont("Segoe UI", 16, QFont.Bold))
         tax_title.setAlignment(Qt.AlignCenter)
         tax_title.setStyleSheet("color: #000000; margin: 25px 0 15px 0;")
         self.content_layout.addWidget(tax_title)
         
-        # Get tax breakdown from database
-        tax_breakdown = self.get_tax_breakdown_from_db(invoice_id) if invoice_id else []
+        tax_rows, tax_totals = tax_breakdown(items, taxes)
         
-        if not tax_breakdown:
+        if not tax_rows:
             # Show message if no tax data available
             no_tax_label = QLabel("No tax data available for this invoice.")
             no_tax_label.setAlignment(Qt.AlignCenter)
@@ -642,185 +461,16 @@ class InvoicePreviewWindow(QMainWindow):
             self.content_layout.addWidget(no_tax_label)
             return
         
-        # Create tax table
-        tax_table = QTableWidget()
-        tax_table.setColumnCount(6)  # Added one more column for Taxable Amount
-        tax_headers = ["GST Rate", "Total Amount", "SGST Amount", "CGST Amount", "IGST Amount", "Total Tax"]
-        tax_table.setHorizontalHeaderLabels(tax_headers)
-        
-        tax_table.setRowCount(len(tax_breakdown) + 1)  # +1 for total row
-        tax_table.setStyleSheet("""
-            QTableWidget {
-                font: 11pt "Segoe UI";
-                gridline-color: black;
-                border: 1px solid black;
-            }
-            QTableWidget::item {
-                background-color: #f8f9fa;
-                padding: 8px;
-                border-right: 1px solid #e0e0e0;
-            }
-            QTableWidget::item:selected {
-                background-color: #e3f2fd;
-            }
-            QHeaderView::section {
-                background-color: white;
-                color: black;
-                font-weight: bold;
-                border: 1px solid black;
-                padding: 10px;
-            }
-        """)
-        
-        # Variables to track totals
-        total_taxable = 0.0
-        total_sgst = 0.0
-        total_cgst = 0.0
-        total_igst = 0.0
-        grand_tax_total = 0.0
-        
-        # Get taxable amounts for each GST rate
-        try:
-            conn = sqlite3.connect('invoice_app.db')
-            cursor = conn.cursor()
-            
-            # Populate tax table
-            for row, tax in enumerate(tax_breakdown):
-                gst_percent = tax['gst_percent']
-                
-                # Get taxable amount for this GST rate
-                cursor.execute("""
-                    SELECT SUM(total) as taxable_amount
-                    FROM invoice_items 
-                    WHERE invoice_id = ? AND gst_percent = ?
-                """, (invoice_id, gst_percent))
-                
-                result = cursor.fetchone()
-                taxable_amount = result[0] if result[0] else 0.0
-                
-                # GST Rate
-                rate_item = QTableWidgetItem(f"{gst_percent}%")
-                rate_item.setTextAlignment(Qt.AlignCenter)
-                tax_table.setItem(row, 0, rate_item)
-                
-                # Taxable Amount
-                taxable_item = QTableWidgetItem(f"₹{taxable_amount:.2f}")
-                taxable_item.setTextAlignment(Qt.AlignRight)
-                tax_table.setItem(row, 1, taxable_item)
-                total_taxable += taxable_amount
-                
-                # SGST Amount
-                sgst_amount = tax['sgst_amount']
-                sgst_item = QTableWidgetItem(f"₹{sgst_amount:.2f}")
-                sgst_item.setTextAlignment(Qt.AlignRight)
-                tax_table.setItem(row, 2, sgst_item)
-                total_sgst += sgst_amount
-                
-                # CGST Amount
-                cgst_amount = tax['cgst_amount']
-                cgst_item = QTableWidgetItem(f"₹{cgst_amount:.2f}")
-                cgst_item.setTextAlignment(Qt.AlignRight)
-                tax_table.setItem(row, 3, cgst_item)
-                total_cgst += cgst_amount
-                
-                # IGST Amount
-                igst_amount = tax['igst_amount']
-                igst_item = QTableWidgetItem(f"₹{igst_amount:.2f}")
-                igst_item.setTextAlignment(Qt.AlignRight)
-                tax_table.setItem(row, 4, igst_item)
-                total_igst += igst_amount
-                
-                # Total Tax
-                tax_total = tax['tax_total']
-                total_item = QTableWidgetItem(f"₹{tax_total:.2f}")
-                total_item.setTextAlignment(Qt.AlignRight)
-                tax_table.setItem(row, 5, total_item)
-                grand_tax_total += tax_total
-            
-            conn.close()
-            
-        except Exception as e:
-            print(f"Error getting taxable amounts: {e}")
-            if conn:
-                conn.close()
-        
-        # Add total row
-        if tax_breakdown:
-            total_row = len(tax_breakdown)
-            
-            # Total label
-            total_label_item = QTableWidgetItem("TOTAL")
-            total_label_item.setTextAlignment(Qt.AlignCenter)
-            total_label_item.setFont(QFont("Segoe UI", 12, QFont.Bold))
-            total_label_item.setBackground(QColor("#e8f4fd"))
-            tax_table.setItem(total_row, 0, total_label_item)
-            
-            # Total amounts
-            totals_data = [
-                (1, f"₹{total_taxable:.2f}"),
-                (2, f"₹{total_sgst:.2f}"),
-                (3, f"₹{total_cgst:.2f}"),
-                (4, f"₹{total_igst:.2f}"),
-                (5, f"₹{grand_tax_total:.2f}")
-            ]
-            
-            for col, text in totals_data:
-                item = QTableWidgetItem(text)
-                item.setTextAlignment(Qt.AlignRight)
-                item.setFont(QFont("Segoe UI", 11, QFont.Bold))
-                item.setBackground(QColor("#e8f4fd"))
-                tax_table.setItem(total_row, col, item)
-        
-        # Configure table
-        tax_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        tax_table.setSelectionMode(QTableWidget.NoSelection)
-        tax_table.verticalHeader().setVisible(False)
-        
-        # Set column widths
-        tax_table.setColumnWidth(0, 80)   # GST Rate
-        tax_table.setColumnWidth(1, 120)  # Taxable Amount
-        tax_table.setColumnWidth(2, 110)  # SGST Amount
-        tax_table.setColumnWidth(3, 110)  # CGST Amount
-        tax_table.setColumnWidth(4, 110)  # IGST Amount
-        tax_table.setColumnWidth(5, 120)  # Total Tax
-        
-        # Set table height based on content
-        row_height = 35
-        header_height = 45
-        table_height = ((len(tax_breakdown) + 1) * row_height) + header_height + 10
-        tax_table.setFixedHeight(min(table_height, 400))
+        # Tax table; the last row holds the totals
+        tax_table = create_document_table(TAX_COLUMNS, tax_cells(tax_rows, tax_totals), total_row=True)
         
         # Make table width fit content
-        total_width = sum([80, 120, 110, 110, 110, 120]) + 20  # column widths + padding
+        total_width = sum(column[1] for column in TAX_COLUMNS) + 20  # column widths + padding
         tax_table.setFixedWidth(total_width)
         
         self.content_layout.addWidget(tax_table)
 
 
-    # Additional helper function to ensure tax data exists when viewing invoice
-    def ensure_tax_data_exists(self, invoice_id):
-        """Ensure tax data exists in invoice_taxes table for the given invoice"""
-        try:
-            conn = sqlite3.connect('invoice_app.db')
-            cursor = conn.cursor()
-            
-            # Check if tax data already exists
-            cursor.execute("SELECT COUNT(*) FROM invoice_taxes WHERE invoice_id = ?", (invoice_id,))
-            count = cursor.fetchone()[0]
-            
-            if count == 0:
-                # Tax data doesn't exist, calculate and insert it
-                print(f"Tax data missing for invoice {invoice_id}, calculating...")
-                conn.close()
-                calculate_and_insert_invoice_taxes(invoice_id)
-            else:
-                conn.close()
-                
-        except Exception as e:
-            print(f"Error checking tax data: {e}")
-            if conn:
-                conn.close()
-    
     def create_separator(self):
         """Create a separator line"""
         line = QFrame()
@@ -830,74 +480,16 @@ class InvoicePreviewWindow(QMainWindow):
         return line
 
     def download_invoice(self):
-        """Download invoice as PDF"""
-        folder_path = r"C:\Users\91863\OneDrive\Desktop\Practice\Invoices_pdf"
-        
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-
-        file_name = f"Invoice_{self.invoice_id}.pdf"
-        file_path = os.path.join(folder_path, file_name)
-
-        try:
-            # PDF writer setup
-            pdf_writer = QPdfWriter(file_path)
-            pdf_writer.setPageSize(QPageSize(QPageSize.A4))
-            pdf_writer.setPageMargins(QMarginsF(15, 15, 15, 15), QPageLayout.Millimeter)
-
-            # Create painter
-            painter = QPainter(pdf_writer)
-            if not painter.isActive():
-                raise RuntimeError("Painter could not start on PDF writer")
-
-            # Scale widget to fit width of PDF page
-            self.invoice_content.adjustSize()
-            widget_width = self.invoice_content.width()
-            pdf_width = pdf_writer.width()
-            scale = pdf_width / widget_width
-            painter.scale(scale, scale)
-
-            # Render the invoice content
-            self.invoice_content.render(
-                painter,
-                QPoint(0, 0),
-                QRegion(self.invoice_content.rect()),
-                QWidget.RenderFlags(QWidget.DrawChildren)
-            )
-
-            painter.end()
-            
-            # Success message
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Success")
-            msg.setText("Invoice saved successfully!")
-            msg.setDetailedText(f"File saved at:\n{file_path}")
-            msg.setIcon(QMessageBox.Information)
-            msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: white;
-                }
-                QMessageBox QLabel {
-                    color: #212529;
-                }
-            """)
-            msg.exec()
+        """Render the invoice to PDF in the background and show it in the jobs panel"""
+        if self.document is None:
+            return
 
-        except Exception as e:
-            error_msg = QMessageBox(self)
-            error_msg.setWindowTitle("Error")
-            error_msg.setText("Failed to generate PDF")
-            error_msg.setDetailedText(str(e))
-            error_msg.setIcon(QMessageBox.Critical)
-            error_msg.setStyleSheet("""
-                QMessageBox {
-                    background-color: white;
-                }
-                QMessageBox QLabel {
-                    color: #212529;
-                }
-            """)
-            error_msg.exec()
+        file_path = export_dir("Invoices") / f"Invoice_{self.invoice_id}.pdf"
+        document = self.document
+        jobs.submit(f"Invoice {document.invoice['invoice_no']} PDF",
+                    lambda job: render_invoice_pdf(file_path, document.invoice, document.items,
+                                                   document.taxes, document.company))
+        show_jobs_panel()
     
     def clear_layout(self, layout):
         """Clear all widgets from a layout"""
@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
     QGridLayout, QFrame, QSizePolicy
 )
 from ..models.db_manager import get_invoice_summary
+from ..models.events import INVOICES
+from .data_events import data_events
 
 class InvoiceView(QWidget):
     def __init__(self):
@@ -25,12 +27,17 @@ class InvoiceView(QWidget):
         # Set Invoice page as default
         self.stacked_widget.setCurrentWidget(self.invoice_widget)
 
-        # Set up auto-refresh timer
-        self.refresh_timer = QTimer()
+        # Refresh when invoices change instead of polling the database;
+        # several changes in one event-loop pass cause a single refresh
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(0)
         self.refresh_timer.timeout.connect(self.refresh_dashboard)
-        self.refresh_timer.start(3000)  # Refresh every 5 seconds (adjust as needed)
+        self.stale = False
+        data_events.changed.connect(self.on_data_changed)
 
-        self.refresh_dashboard()  # Load data on startup
+        # First load once the event loop runs, so building the page does not wait on the database
+        self.refresh_timer.start()
 
     def show_invoice(self):
         self.stacked_widget.setCurrentWidget(self.invoice_widget)
@@ -47,30 +54,21 @@ class InvoiceView(QWidget):
         """Force an immediate refresh (can be called from other parts of the app)"""
         self.refresh_dashboard()
 
-    def set_refresh_interval(self, milliseconds):
-        """Change the auto-refresh interval"""
-        self.refresh_timer.setInterval(milliseconds)
-
-    def start_auto_refresh(self):
-        """Start auto-refresh if stopped"""
-        if not self.refresh_timer.isActive():
+    def on_data_changed(self, change):
+        """Refresh after invoices change; while hidden, wait until the page is shown"""
+        if not change.affects(INVOICES):
+            return
+        if self.isVisible():
             self.refresh_timer.start()
-
-    def stop_auto_refresh(self):
-        """Stop auto-refresh"""
-        self.refresh_timer.stop()
+        else:
+            self.stale = True
 
     def showEvent(self, event):
-        """Called when widget becomes visible - refresh data"""
+        """Called when widget becomes visible - catch up on changes made while hidden"""
         super().showEvent(event)
-        self.refresh_dashboard()
-        self.start_auto_refresh()
-
-    def hideEvent(self, event):
-        """Called when widget becomes hidden - can pause refresh to save resources"""
-        super().hideEvent(event)
-        # Optionally stop auto-refresh when not visible to save resources
-        # self.stop_auto_refresh()
+        if self.stale:
+            self.stale = False
+            self.refresh_dashboard()
 
 class HoverBox(QFrame):
     def __init__(self, title, value="0", parent=None):
@@ -0,0 +1,158 @@
+"""
+Running totals for the items table of the Create Invoice / Create Challan screens.
+
+LineTotals keeps each row's contribution to the grand total and to the
+taxable value of its GST rate, so an edit only swaps that row's old
+contribution for its new one. Amounts are paise and the arithmetic is
+models/invoice_calculator's, so the screen shows what is stored.
+
+ItemTableTotals binds it to a QTableWidget: on cellChanged it recomputes
+the edited row only, rewrites that row's Total cell in place, and emits
+which GST rates changed so the screen repaints just those fields.
+
+    self.item_totals = ItemTableTotals(self.items_table, quantity_column=2, rate_column=4,
+                                       total_column=6, gst_column=5)
+    self.item_totals.changed.connect(self.show_totals)
+"""
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWidgets import QTableWidgetItem
+
+from ..models.invoice_calculator import GST_RATES, format_paise, line_total, split_tax
+
+
+class LineTotals:
+    """Grand total and per-rate taxable values, updated one row at a time."""
+
+    def __init__(self, rates=GST_RATES):
+        self.rates = tuple(rates)
+        # Charge IGST instead of CGST + SGST (customer in another state)
+        self.inter_state = False
+        self.clear()
+
+    def clear(self):
+        self._rows = {}   # row: (total in paise, rate index or None)
+        self.grand_total_paise = 0
+        self.taxable_paise = [0] * len(self.rates)
+
+    def set_row(self, row, paise, gst_rate=None):
+        """
+        Replace one row's contribution.
+
+        Args:
+            row: Row number
+            paise: Row total in paise (0 if the row has none)
+            gst_rate: GST percent; a rate outside self.rates adds no tax
+
+        Returns:
+            set: Indexes of the rates whose taxable value changed
+        """
+        index = self.rates.index(gst_rate) if gst_rate in self.rates else None
+        old_paise, old_index = self._rows.pop(row, (0, None))
+        if paise:
+            self._rows[row] = (paise, index)
+        self.grand_total_paise += paise - old_paise
+
+        changed = set()
+        if old_index is not None and old_paise:
+            self.taxable_paise[old_index] -= old_paise
+            changed.add(old_index)
+        if index is not None and paise:
+            self.taxable_paise[index] += paise
+            changed.add(index)
+        return changed
+
+    def has_rows_from(self, row):
+        """Whether any row at or after this one contributes."""
+        return any(r >= row for r in self._rows)
+
+    def tax(self, index):
+        """(SGST, CGST, IGST) in paise on the taxable value of one rate."""
+        return split_tax(self.taxable_paise[index], self.rates[index], self.inter_state)
+
+
+class ItemTableTotals(QObject):
+    """Keeps LineTotals in step with an items table and writes each row's Total cell."""
+    changed = Signal(object)   # set of rate indexes whose taxes changed; the grand total may have too
+
+    def __init__(self, table, quantity_column, rate_column, total_column, gst_column=None,
+                 rates=GST_RATES):
+        super().__init__(table)
+        self.table = table
+        self.quantity_column = quantity_column
+        self.rate_column = rate_column
+        self.total_column = total_column
+        self.gst_column = gst_column
+        self.totals = LineTotals(rates)
+        # Editing the Total cell by hand puts the computed total back, as before
+        self._inputs = {quantity_column, rate_column, total_column, gst_column} - {None}
+
+        table.cellChanged.connect(self.on_cell_changed)
+        # Inserting or removing rows above others renumbers them
+        table.model().rowsInserted.connect(self.on_rows_moved)
+        table.model().rowsRemoved.connect(self.on_rows_moved)
+
+    def on_cell_changed(self, row, column):
+        if column in self._inputs:
+            self.changed.emit(self.update_row(row))
+
+    def on_rows_moved(self, parent, first, last):
+        if self.totals.has_rows_from(first):
+            self.recalculate()
+
+    def recalculate(self):
+        """Rebuild the totals from every row of the table."""
+        self.totals.clear()
+        for row in range(self.table.rowCount()):
+            self.update_row(row)
+        self.changed.emit(set(range(len(self.totals.rates))))
+
+    def update_row(self, row):
+        """
+        Recompute one row and write its Total cell.
+
+        Returns:
+            set: Indexes of the rates whose taxable value changed
+        """
+        quantity = self._cell_text(row, self.quantity_column)
+        rate = self._cell_text(row, self.rate_column)
+        if not (quantity and rate):
+            self._set_total_text(row, "")
+            return self.totals.set_row(row, 0)
+        try:
+            paise = line_total(quantity, rate)
+        except ValueError:
+            # Leave the row as typed; it counts for nothing (and shows no total) until it parses
+            self._set_total_text(row, "")
+            return self.totals.set_row(row, 0)
+
+        gst_text = self._cell_text(row, self.gst_column) if self.gst_column is not None else ""
+        try:
+            gst_rate = float(gst_text) if gst_text else None
+        except ValueError:
+            gst_rate = None
+        self._set_total_text(row, format_paise(paise))
+        return self.totals.set_row(row, paise, gst_rate)
+
+    def _cell_text(self, row, column):
+        item = self.table.item(row, column)
+        return item.text().strip() if item else ""
+
+    def _set_total_text(self, row, text):
+        item = self.table.item(row, self.total_column)
+        if item is not None and item.text() == text:
+            return
+        # The table's own cellChanged must not fire for a computed cell
+        blocked = self.table.blockSignals(True)
+        if item is None:
+            item = QTableWidgetItem(text)
+            item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable)
+            self.table.setItem(row, self.total_column, item)
+        else:
+            item.setText(text)
+        self.table.blockSignals(blocked)
+
+
+def set_text(field, text):
+    """Set a line edit's text only if it differs (setText always repaints)."""
+    if field.text() != text:
+        field.setText(text)
@@ -0,0 +1,310 @@
+"""
+Background job queue for PDF rendering and exports.
+
+Jobs run on a QThreadPool so the GUI thread keeps handling events while
+documents are laid out and written. Each job reports progress and its
+outcome through Qt signals (delivered on the GUI thread) and can be
+cancelled; the JobsPanel window lists every job of the session.
+
+    jobs.submit("Invoice INV-12 PDF", lambda job: render_invoice_pdf(path, *document))
+    show_jobs_panel()
+"""
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QUrl, Qt, Signal
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWidgets import (QFrame, QHBoxLayout, QLabel, QProgressBar, QPushButton,
+                               QScrollArea, QVBoxLayout, QWidget)
+
+# Job states
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "Queued", "Running", "Done", "Failed", "Cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function to stop early after cancel()."""
+
+
+class JobSignals(QObject):
+    """Signals of one job; emitted from the worker thread, received on the GUI thread."""
+    progress = Signal(int, int, str)   # done, total, message
+    finished = Signal(object)          # return value of the job function
+    failed = Signal(str)               # error message
+    cancelled = Signal()
+
+
+class Job(QRunnable):
+    """
+    One unit of background work.
+
+    The function is called as fn(job, *args, **kwargs) on a pool thread.
+    It may call job.report() to publish progress; report() returns False
+    once the job has been cancelled so long loops can stop early (and
+    return a partial result, or raise JobCancelled).
+    A returned Path is shown with an Open button in the jobs panel, a
+    returned str as the job's final message.
+    """
+
+    def __init__(self, title, fn, *args, **kwargs):
+        super().__init__()
+        # The queue keeps the Python object alive; don't let Qt delete it underneath
+        self.setAutoDelete(False)
+        self.title = title
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; a job that has not started yet is skipped."""
+        self._cancel.set()
+
+    def report(self, done, total, message=""):
+        """
+        Publish progress from inside the job function.
+
+        Returns:
+            bool: False if the job was cancelled and should stop
+        """
+        self.signals.progress.emit(int(done), int(total), str(message))
+        return not self.is_cancelled
+
+    def run(self):
+        if self.is_cancelled:
+            self.state = CANCELLED
+            self.signals.cancelled.emit()
+            return
+
+        self.state = RUNNING
+        try:
+            self.result = self.fn(self, *self.args, **self.kwargs)
+        except JobCancelled:
+            self.state = CANCELLED
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            print(f"Job '{self.title}' failed: {e}")
+            self.signals.failed.emit(self.error)
+            return
+
+        # A function that returned normally after a cancel reports its partial result
+        self.state = DONE
+        self.signals.finished.emit(self.result)
+
+
+class JobQueue(QObject):
+    """
+    Runs Jobs on its own thread pool and keeps the session's job list.
+
+    Two threads by default: a single document download does not have to
+    wait behind a long batch export.
+    """
+    job_added = Signal(object)
+
+    def __init__(self, max_threads=2):
+        super().__init__()
+        self._pool = None
+        self.max_threads = max_threads
+        self.jobs = []
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = QThreadPool()
+            self._pool.setMaxThreadCount(self.max_threads)
+        return self._pool
+
+    def submit(self, title, fn, *args, **kwargs):
+        """
+        Queue fn(job, *args, **kwargs) to run in the background.
+
+        Returns:
+            Job: Connect to job.signals for progress and completion
+        """
+        job = Job(title, fn, *args, **kwargs)
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        self.pool.start(job)
+        return job
+
+    def active(self):
+        """Jobs that are queued or running."""
+        return [job for job in self.jobs if job.state in (QUEUED, RUNNING)]
+
+    def cancel_all(self):
+        for job in self.active():
+            job.cancel()
+
+    def clear_finished(self):
+        """Forget jobs that are no longer queued or running."""
+        self.jobs = self.active()
+
+    def wait(self, msecs=-1):
+        """Block until every job has finished (used on shutdown and in scripts)."""
+        if self._pool is None:
+            return True
+        return self._pool.waitForDone(msecs)
+
+
+class JobRow(QFrame):
+    """One job in the jobs panel: title, progress bar, status and actions."""
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.output = None
+        self.setObjectName("jobRow")
+        self.setStyleSheet("#jobRow { border-bottom: 1px solid #dee2e6; }")
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 6, 8, 6)
+        layout.setSpacing(4)
+
+        top = QHBoxLayout()
+        title = QLabel(job.title)
+        title.setStyleSheet("font-weight: bold;")
+        top.addWidget(title)
+        top.addStretch()
+
+        self.open_button = QPushButton("Open")
+        self.open_button.setVisible(False)
+        self.open_button.clicked.connect(self.open_output)
+        top.addWidget(self.open_button)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        top.addWidget(self.cancel_button)
+        layout.addLayout(top)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # busy until the job reports a total
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(8)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel(job.state)
+        self.status_label.setStyleSheet("color: #6c757d;")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        job.signals.progress.connect(self.on_progress)
+        job.signals.finished.connect(self.on_finished)
+        job.signals.failed.connect(self.on_failed)
+        job.signals.cancelled.connect(self.on_cancelled)
+
+        # The job may have finished before the panel was opened
+        if job.state == DONE:
+            self.on_finished(job.result)
+        elif job.state == FAILED:
+            self.on_failed(job.error)
+        elif job.state == CANCELLED:
+            self.on_cancelled()
+
+    def cancel(self):
+        self.job.cancel()
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelling...")
+
+    def on_progress(self, done, total, message):
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+        if not self.job.is_cancelled:
+            self.status_label.setText(message or f"{done} of {total}")
+
+    def stop(self, text, color):
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1)
+        self.cancel_button.setVisible(False)
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"color: {color};")
+
+    def on_finished(self, result):
+        if isinstance(result, Path):
+            self.output = result
+            self.open_button.setVisible(True)
+            self.stop(f"Saved to {result}", "#198754")
+        else:
+            self.stop(result if isinstance(result, str) else DONE, "#198754")
+
+    def on_failed(self, error):
+        self.stop(f"Failed: {error}", "#dc3545")
+
+    def on_cancelled(self):
+        self.stop(CANCELLED, "#6c757d")
+
+    def open_output(self):
+        if self.output is not None:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.output)))
+
+
+class JobsPanel(QWidget):
+    """Non-modal window listing background jobs, newest first."""
+
+    def __init__(self, queue, parent=None):
+        super().__init__(parent, Qt.Tool)
+        self.queue = queue
+        self.setWindowTitle("Jobs")
+        self.resize(420, 360)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 8)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        container = QWidget()
+        self.rows_layout = QVBoxLayout(container)
+        self.rows_layout.setContentsMargins(0, 0, 0, 0)
+        self.rows_layout.setSpacing(0)
+        self.rows_layout.addStretch()
+        scroll.setWidget(container)
+        layout.addWidget(scroll)
+
+        buttons = QHBoxLayout()
+        buttons.setContentsMargins(8, 0, 8, 0)
+        buttons.addStretch()
+        clear_button = QPushButton("Clear finished")
+        clear_button.clicked.connect(self.clear_finished)
+        buttons.addWidget(clear_button)
+        layout.addLayout(buttons)
+
+        for job in queue.jobs:
+            self.add_job(job)
+        queue.job_added.connect(self.add_job)
+
+    def add_job(self, job):
+        self.rows_layout.insertWidget(0, JobRow(job))
+
+    def clear_finished(self):
+        self.queue.clear_finished()
+        for index in reversed(range(self.rows_layout.count())):
+            row = self.rows_layout.itemAt(index).widget()
+            if isinstance(row, JobRow) and row.job not in self.queue.jobs:
+                self.rows_layout.takeAt(index)
+                row.deleteLater()
+
+
+jobs = JobQueue()
+_panel = None
+
+
+def show_jobs_panel():
+    """Show (or raise) the shared jobs panel."""
+    global _panel
+    if _panel is None:
+        _panel = JobsPanel(jobs)
+    _panel.show()
+    _panel.raise_()
+    _panel.activateWindow()
+    return _panel
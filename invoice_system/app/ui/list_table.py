@@ -0,0 +1,277 @@
+"""
+Paged table model and painted action buttons for the Manage screens.
+
+PagedTableModel pulls rows from the database a page at a time through
+Qt's canFetchMore/fetchMore, so the view only asks for more rows as the
+user scrolls; with background=True the pages are read on a pool thread
+and a reset (e.g. a new search) drops whatever page is still in flight.
+ActionButtonsDelegate paints the per-row buttons
+(View / Mark Paid / Delete ...) and hit-tests clicks itself, so a list of
+thousands of rows holds no per-row widgets at all.
+"""
+from PySide6.QtCore import (QAbstractTableModel, QEvent, QModelIndex, QObject, QRect, QRunnable,
+                            QThreadPool, Qt, Signal)
+from PySide6.QtGui import QBrush, QColor, QFont
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+BUTTON_WIDTH = 85
+BUTTON_HEIGHT = 28
+BUTTON_SPACING = 8
+
+
+class _PageSignals(QObject):
+    """Delivers a page read on a pool thread back to the model's thread."""
+    loaded = Signal(int, object, object)   # generation, rows, next cursor
+
+
+class _PageLoader(QRunnable):
+    """Reads one page on a pool thread."""
+
+    def __init__(self, generation, fetch_page, cursor, signals):
+        super().__init__()
+        self.generation = generation
+        self.fetch_page = fetch_page
+        self.cursor = cursor
+        self.signals = signals
+
+    def run(self):
+        try:
+            rows, next_cursor = self.fetch_page(self.cursor)
+        except Exception as e:
+            print(f"Error loading page: {e}")
+            rows, next_cursor = [], None
+        self.signals.loaded.emit(self.generation, rows, next_cursor)
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Read-only table over dict rows loaded page by page.
+
+    Args:
+        columns: (header, text(row) -> str, color(row) -> str or None) per
+            column; use None as text for a column painted by a delegate
+        key (str): Row field that identifies a row (e.g. 'id')
+        background (bool): Read pages on a pool thread instead of inside
+            fetchMore; fetch_page must then not touch any widgets
+    """
+
+    def __init__(self, columns, key="id", background=False, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.key = key
+        self.background = background
+        self.rows = []
+        self._fetch_page = None
+        self._next = None
+        self._exhausted = True
+        self._brushes = {}
+        # Bumped on every reset; pages loaded for an older generation are dropped
+        self.generation = 0
+        self._loading = False
+        self._signals = _PageSignals()
+        self._signals.loaded.connect(self._page_loaded)
+
+    def reset(self, fetch_page, first_page=None):
+        """
+        Drop all rows and start paging from the beginning.
+
+        Args:
+            fetch_page: Callable(cursor) -> (rows, next_cursor); cursor is
+                None for the first page and next_cursor None after the last
+            first_page: Optional (rows, next_cursor) already read by the
+                caller, shown at once
+        """
+        self.beginResetModel()
+        self.generation += 1
+        self._loading = False
+        self.rows = []
+        self._fetch_page = fetch_page
+        self._next = None
+        self._exhausted = False
+        if first_page is not None:
+            self.rows, self._next = list(first_page[0]), first_page[1]
+            self._exhausted = self._next is None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    @property
+    def loading(self):
+        """True while a background page is being read."""
+        return self._loading
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self.background:
+            self._loading = True
+            QThreadPool.globalInstance().start(
+                _PageLoader(self.generation, self._fetch_page, self._next, self._signals))
+        else:
+            self._append_page(*self._fetch_page(self._next))
+
+    def _page_loaded(self, generation, rows, next_cursor):
+        if generation != self.generation:
+            return  # The list was reset (e.g. a new search) while this page was loading
+        self._loading = False
+        self._append_page(rows, next_cursor)
+
+    def _append_page(self, rows, next_cursor):
+        self._next = next_cursor
+        self._exhausted = next_cursor is None
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def fetch_all(self):
+        """Load every remaining page now (e.g. before exporting the list)."""
+        if self._loading:
+            # Read the in-flight page again here and ignore the background result
+            self.generation += 1
+            self._loading = False
+        while not self._exhausted:
+            self._append_page(*self._fetch_page(self._next))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        _header, text, color = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            return text(row) if text else None
+        if role == Qt.ForegroundRole and color:
+            value = color(row)
+            if value:
+                if value not in self._brushes:
+                    self._brushes[value] = QBrush(QColor(value))
+                return self._brushes[value]
+        if role == Qt.UserRole:
+            return row
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return None
+
+    def row_of(self, key_value):
+        """Row number of the row whose key equals key_value, or -1."""
+        for number, row in enumerate(self.rows):
+            if row[self.key] == key_value:
+                return number
+        return -1
+
+    def update_row(self, key_value, **changes):
+        """Change fields of one loaded row and repaint only that row."""
+        number = self.row_of(key_value)
+        if number < 0:
+            return False
+        self.rows[number].update(changes)
+        self.dataChanged.emit(self.index(number, 0), self.index(number, len(self.columns) - 1))
+        return True
+
+    def remove_row(self, key_value):
+        """Remove one loaded row without reloading the others."""
+        number = self.row_of(key_value)
+        if number < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), number, number)
+        del self.rows[number]
+        self.endRemoveRows()
+        return True
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """
+    Paints a row of buttons in one column and reports clicks.
+
+    Args:
+        actions: (name, label, color, visible(row) -> bool or None) per
+            button; a hidden button keeps its slot so columns stay aligned
+
+    Emits triggered(name, row) with the clicked action and the row dict.
+    Connect it with Qt.QueuedConnection when the slot changes the model
+    or opens a dialog, so that runs after the view's mouse handling.
+    """
+    triggered = Signal(str, object)
+
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        self.actions = actions
+        self.font = QFont()
+        self.font.setBold(True)
+        self._colors = {color: QColor(color) for _name, _label, color, _visible in actions}
+        self._pressed = None
+
+    def button_rects(self, rect):
+        """Rect of each action's button inside a cell, left to right."""
+        top = rect.top() + (rect.height() - BUTTON_HEIGHT) // 2
+        left = rect.left() + BUTTON_SPACING // 2
+        return [QRect(left + slot * (BUTTON_WIDTH + BUTTON_SPACING), top, BUTTON_WIDTH, BUTTON_HEIGHT)
+                for slot in range(len(self.actions))]
+
+    def visible_actions(self, row, rect):
+        for (name, label, color, visible), button in zip(self.actions, self.button_rects(rect)):
+            if visible is None or visible(row):
+                yield name, label, color, button
+
+    def paint(self, painter, option, index):
+        row = index.data(Qt.UserRole)
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setFont(self.font)
+        for name, label, color, button in self.visible_actions(row, option.rect):
+            fill = self._colors[color]
+            if self._pressed == (index.row(), name):
+                fill = fill.darker(130)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(fill)
+            painter.drawRoundedRect(button, 4, 4)
+            painter.setPen(Qt.white)
+            painter.drawText(button, Qt.AlignCenter, label)
+        painter.restore()
+
+    def _repaint(self, option):
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        size.setWidth(len(self.actions) * (BUTTON_WIDTH + BUTTON_SPACING))
+        size.setHeight(max(size.height(), BUTTON_HEIGHT + 6))
+        return size
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return False
+        if event.button() != Qt.LeftButton:
+            return False
+
+        row = index.data(Qt.UserRole)
+        hit = None
+        for name, _label, _color, button in self.visible_actions(row, option.rect):
+            if button.contains(event.position().toPoint()):
+                hit = name
+                break
+
+        if event.type() == QEvent.MouseButtonPress:
+            self._pressed = (index.row(), hit) if hit else None
+            self._repaint(option)
+            return hit is not None
+
+        # Release: fire only if it lands on the button that was pressed
+        pressed, self._pressed = self._pressed, None
+        self._repaint(option)
+        if hit and pressed == (index.row(), hit):
+            self.triggered.emit(hit, row)
+        return hit is not None or pressed is not None
@@ -0,0 +1,102 @@
+"""
+Process-wide cache of the decoded company logo.
+
+Previews and PDF renders ask for the logo by the company row's
+logo_digest; the stored PNG renditions are read from the database and
+decoded once per process, and a new digest (after the logo is changed in
+the admin page) simply misses the cache. The original image file is never
+opened here.
+"""
+import threading
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter, QPainterPath, QPixmap
+
+from ..models.db_manager import load_company_logo
+from ..models.logo import SCREEN_LOGO_SCALE
+
+
+def circular_pixmap(image, size):
+    """Scale an image to cover a size x size square and clip it to a circle."""
+    scaled = QPixmap.fromImage(image).scaled(size, size, Qt.KeepAspectRatioByExpanding,
+                                             Qt.SmoothTransformation)
+    circle = QPixmap(size, size)
+    circle.fill(Qt.transparent)
+
+    painter = QPainter(circle)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addEllipse(0, 0, size, size)
+    painter.setClipPath(path)
+    painter.drawPixmap((size - scaled.width()) // 2, (size - scaled.height()) // 2, scaled)
+    painter.end()
+    return circle
+
+
+class LogoCache:
+    """
+    Decoded logo renditions for the current logo digest.
+
+    print_image() returns a QImage and may be called from render threads;
+    screen_pixmap() and circle() return QPixmaps and are for the GUI thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._digest = None
+        self._images = {}
+        self._pixmaps = {}
+
+    def _image(self, company, rendition):
+        digest = company["logo_digest"] if company and "logo_digest" in company.keys() else None
+        if not digest:
+            return None
+
+        with self._lock:
+            if digest != self._digest:
+                logo = load_company_logo()
+                if not logo or logo["digest"] != digest:
+                    return None
+                self._digest = digest
+                self._images = {
+                    "print": QImage.fromData(logo["print_png"], "PNG"),
+                    "screen": QImage.fromData(logo["screen_png"], "PNG"),
+                }
+                self._pixmaps = {}
+            image = self._images[rendition]
+        return None if image.isNull() else image
+
+    def print_image(self, company):
+        """Print-resolution logo for PDF output, or None if the company has no logo."""
+        return self._image(company, "print")
+
+    def screen_pixmap(self, company):
+        """Preview logo (high-DPI pixmap, 150 x 100 logical pixels at most), or None."""
+        return self._pixmap(company, "screen")
+
+    def circle(self, company, size=180):
+        """Circular logo used by the admin page, or None."""
+        return self._pixmap(company, ("circle", size))
+
+    def _pixmap(self, company, key):
+        image = self._image(company, "print" if key != "screen" else "screen")
+        if image is None:
+            return None
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            if key == "screen":
+                pixmap = QPixmap.fromImage(image)
+                pixmap.setDevicePixelRatio(SCREEN_LOGO_SCALE)
+            else:
+                pixmap = circular_pixmap(image, key[1])
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def clear(self):
+        with self._lock:
+            self._digest = None
+            self._images = {}
+            self._pixmaps = {}
+
+
+logos = LogoCache()
@@ -1,14 +1,12 @@
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLabel, QStackedWidget, QSpacerItem, QSizePolicy,QPushButton
 )
 from .sideBar import Sidebar
-from .invoice_view import InvoiceView
-from .challan_view import ChallanView
-from .inventory import InventoryView
-from .customers_view import CustomerView
-from .admin_page import AdminPage
+from .data_events import data_events
+from .page_registry import create_page
+from .window_manager import windows
 from .styles import load_stylesheet
 
 class MainWindow(QMainWindow):
@@ -47,23 +45,30 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setObjectName("contentWidget")
         self.content_layout.addWidget(self.stacked_widget)
         
-        # Initialize pages
-        self.invoice_page = InvoiceView()
-        self.challan_page = ChallanView()
-        self.inventory_page = InventoryView()
-        self.customers_page = CustomerView()
-        
-        # Add pages to stacked widget
-        self.stacked_widget.addWidget(self.invoice_page)
-        self.stacked_widget.addWidget(self.challan_page)
-        self.stacked_widget.addWidget(self.inventory_page)
-        self.stacked_widget.addWidget(self.customers_page)
+        # Pages are created on first navigation (see page_registry);
+        # only the invoice dashboard is built at startup
+        self.pages = {}
+        self.show_page("invoice")
         
         # Connect signals
-        self.sidebar.invoice_button.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.invoice_page))
-        self.sidebar.challan_button.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.challan_page))
-        self.sidebar.inventory_button.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.inventory_page))
-        self.sidebar.customers_button.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.customers_page))
+        self.sidebar.invoice_button.clicked.connect(lambda: self.show_page("invoice"))
+        self.sidebar.challan_button.clicked.connect(lambda: self.show_page("challan"))
+        self.sidebar.inventory_button.clicked.connect(lambda: self.show_page("inventory"))
+        self.sidebar.customers_button.clicked.connect(lambda: self.show_page("customers"))
+        
+        # Pages refresh on data-change events; the watcher catches writes from other
+        # processes. It reads the database, so it starts once the event loop runs.
+        QTimer.singleShot(0, data_events.watch_database)
+    
+    def page(self, name):
+        """The main-window page registered under name, created on first use"""
+        if name not in self.pages:
+            self.pages[name] = create_page(name)
+            self.stacked_widget.addWidget(self.pages[name])
+        return self.pages[name]
+    
+    def show_page(self, name):
+        self.stacked_widget.setCurrentWidget(self.page(name))
         
     def create_header(self):
         header_layout = QHBoxLayout()
@@ -78,6 +83,12 @@ class MainWindow(QMainWindow):
         # Spacer
         header_layout.addItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         
+        # Background PDF renders and exports
+        jobs_button = QPushButton("Jobs")
+        jobs_button.setObjectName("adminButton")
+        jobs_button.clicked.connect(self.show_jobs)
+        header_layout.addWidget(jobs_button)
+        
         # Admin button
         admin_button = QPushButton("Admin")
         admin_button.setObjectName("adminButton")
@@ -87,7 +98,21 @@ class MainWindow(QMainWindow):
         
         self.main_layout.addLayout(header_layout)
 
+    def show_jobs(self):
+        from .job_queue import show_jobs_panel
+        show_jobs_panel()
+
+    def closeEvent(self, event):
+        data_events.stop_watching()
+        # Screens and previews are top-level windows; close them with the app
+        windows.close_all()
+        # Let a running export stop at its next progress report instead of being killed mid-file
+        from .job_queue import jobs
+        jobs.cancel_all()
+        jobs.wait()
+        super().closeEvent(event)
+
     def open_admin_page(self):
-        self.admin_window=AdminPage()
+        self.admin_window=create_page("admin")
         self.admin_window.show()
         self.showMaximized()
\ No newline at end of file
@@ -1,15 +1,36 @@
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtCore import Qt, QDate, QTimer
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QButtonGroup, QRadioButton,
-    QTableWidget, QTableWidgetItem, QPushButton, QScrollArea, QDialog, QDateEdit, QFileDialog,
+    QTableView, QPushButton, QScrollArea, QDialog, QDateEdit, QFileDialog,
     QFrame, QGridLayout, QHeaderView, QSizePolicy, QComboBox, QMessageBox, QDialogButtonBox
 )
-from PySide6.QtGui import QBrush, QColor, QIcon
-from ..models.db_manager import get_all_challans, delete_challan
-from .challan_preview import ChallanPreview_Window
-from .create_challan import CreateChallan
+from PySide6.QtGui import QIcon, QFont
+from ..models.db_manager import list_challans, list_challan_ids, delete_challan, CHALLAN_PAGE_SIZE
+from ..models.events import CHALLANS
+from .job_queue import jobs, show_jobs_panel
+from .list_table import ActionButtonsDelegate, PagedTableModel
+from .pdf_renderer import export_challan_pdf, export_dir
+from .data_events import data_events
+from .window_manager import windows
 import csv
 
+# Columns of the challan list: (header, text(challan), text color(challan))
+CHALLAN_LIST_COLUMNS = (
+    ("Challan #", lambda challan: str(challan.get('challan_no', '')), None),
+    ("Date", lambda challan: str(challan.get('date', '')), None),
+    ("Customer Name", lambda challan: str(challan.get('customer_name', '')), None),
+    ("Items", lambda challan: str(challan.get('item_count', 0)), None),
+    ("Grand Total", lambda challan: f"₹{float(challan.get('grand_total') or 0):.2f}", None),
+    ("Actions", None, None),
+)
+ACTIONS_COLUMN = len(CHALLAN_LIST_COLUMNS) - 1
+
+# Row buttons: (action, label, color, shown for challan)
+CHALLAN_ACTIONS = (
+    ('view', "View", "#555599", None),
+    ('delete', "Delete", "#cc4444", None),
+)
+
 class Manage_Challan(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -32,7 +53,9 @@ class Manage_Challan(QWidget):
         # Buttons section
         self.setup_action_buttons()
         
-        # Load challans
+        # Load challans; later changes only mark the list stale until it is reopened
+        self.stale = False
+        data_events.changed.connect(self.on_data_changed)
         self.load_challans()
 
         self.setStyleSheet("""
@@ -40,7 +63,7 @@ class Manage_Challan(QWidget):
                 background-color: #A6AEBF; 
                 color: #333333; font-weight:bold;
             }
-            QTableWidget { 
+            QTableView { 
                 background-color: white;
                 gridline-color: #cccccc;
             }
@@ -109,7 +132,12 @@ class Manage_Challan(QWidget):
         search_label = QLabel("Search:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by challan #, customer name...")
-        self.search_input.textChanged.connect(self.apply_filters)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        
+        # Debounce typing so the query runs once the user pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.apply_filters)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         
@@ -147,20 +175,25 @@ class Manage_Challan(QWidget):
         self.main_layout.addSpacing(10)
     
     def setup_challans_table(self):
-        """Set up the challans table"""
-        # Create table widget
-        self.challans_table = QTableWidget()
-        self.challans_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.challans_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.challans_table.setAlternatingRowColors(True)
-        self.challans_table.setColumnCount(7)
+        """Set up the challans table: pages are read in the background as the user scrolls"""
+        self.challans_model = PagedTableModel(CHALLAN_LIST_COLUMNS, key='id', background=True, parent=self)
         
-        # Set headers
-        headers = ["Challan #", "Date", "Customer Name", "Items", "Grand Total", "Actions", "ID"]
-        self.challans_table.setHorizontalHeaderLabels(headers)
-        
-        # Hide the ID column which we'll use internally
-        self.challans_table.setColumnHidden(6, True)
+        self.challans_table = QTableView()
+        self.challans_table.setModel(self.challans_model)
+        self.challans_table.setSelectionBehavior(QTableView.SelectRows)
+        self.challans_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.challans_table.setAlternatingRowColors(True)
+        self.challans_table.setStyleSheet("QTableView { font-weight:600; }")
+        self.challans_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.challans_table.verticalHeader().setDefaultSectionSize(36)
+        header_font = QFont()
+        header_font.setBold(True)
+        self.challans_table.horizontalHeader().setFont(header_font)
+        
+        # View / Delete, painted and hit-tested by the delegate
+        self.actions_delegate = ActionButtonsDelegate(CHALLAN_ACTIONS, self.challans_table)
+        self.actions_delegate.triggered.connect(self.on_challan_action, Qt.QueuedConnection)
+        self.challans_table.setItemDelegateForColumn(ACTIONS_COLUMN, self.actions_delegate)
         
         # Set column widths
         self.challans_table.setColumnWidth(0, 200)  # Challan #
@@ -184,6 +217,12 @@ class Manage_Challan(QWidget):
         self.export_button.clicked.connect(self.export_to_csv)
         buttons_layout.addWidget(self.export_button) 
         
+        # PDF export of the filtered challans, run as a background job
+        self.export_pdf_button = QPushButton("Export PDFs")
+        self.export_pdf_button.setStyleSheet("background-color:#44aa44;color:white;font-weight:bold")
+        self.export_pdf_button.clicked.connect(self.export_pdfs)
+        buttons_layout.addWidget(self.export_pdf_button)
+        
         # Refresh button
         self.refresh_button = QPushButton("Refresh")
         self.refresh_button.setStyleSheet("background-color:#44aa44;color:white;font-weight:bold")
@@ -193,152 +232,69 @@ class Manage_Challan(QWidget):
         self.main_layout.addLayout(buttons_layout)
     
     def load_challans(self):
-        """Load challans from database"""
+        """Show the first page now; later pages stream in as the user scrolls"""
         try:
-            # Clear existing table
-            self.challans_table.setRowCount(0)
-            self.challans_table.setStyleSheet("QTableWidget { font-weight:600; }")
-
-            # Get all challans from database
-            challans_data = get_all_challans()
-            
-            # Check if challans_data is None or empty
-            if not challans_data:
-                self.total_challans_value.setText("0")
-                return
-            
-            # Track counts for statistics
-            total_count = 0
+            self.stale = False
+            filters = self.current_filters()
+            page = list_challans(limit=CHALLAN_PAGE_SIZE, filters=filters)
+            self.set_total(page.get('total', 0))
             
-            for challan_data in challans_data:
-                # Convert to dictionary if it's not already
-                if hasattr(challan_data, 'keys'):
-                    # It's already a dict-like object
-                    challan = dict(challan_data) if not isinstance(challan_data, dict) else challan_data
-                else:
-                    # Handle the case where it might be a tuple or other format
-                    print(f"Unexpected challan data format: {type(challan_data)}")
-                    continue
-                
-                # Apply filters if needed
-                if not self.should_display_challan(challan):
-                    continue
-                
-                # Count for statistics
-                total_count += 1
-                
-                # Add row to table
-                row_position = self.challans_table.rowCount()
-                self.challans_table.insertRow(row_position)
-                
-                # Set challan data with safe getting
-                self.challans_table.setItem(row_position, 0, QTableWidgetItem(str(challan.get('challan_no', ''))))
-                self.challans_table.setItem(row_position, 1, QTableWidgetItem(str(challan.get('date', ''))))
-                self.challans_table.setItem(row_position, 2, QTableWidgetItem(str(challan.get('customer_name', ''))))
-                
-                # Calculate number of items - this might need adjustment based on your data structure
-                items_count = 0
-                if 'items' in challan and challan['items']:
-                    if isinstance(challan['items'], list) and len(challan['items']) > 0:
-                        # Extract the actual count from the first (and only) item in the mock structure
-                        items_count = challan['items'][0].get('count', 0)
-                    else:
-                        items_count = 0
-
-                self.challans_table.setItem(row_position, 3, QTableWidgetItem(str(items_count)))
-                
-                # Format grand total with currency
-                grand_total_value = challan.get('grand_total', 0)
-                try:
-                    grand_total = f"₹{float(grand_total_value):.2f}"
-                except (ValueError, TypeError):
-                    grand_total = "₹0.00"
-                self.challans_table.setItem(row_position, 4, QTableWidgetItem(grand_total))
-                
-                # Add action buttons
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(4, 2, 4, 2)
-                
-                # View button
-                view_btn = QPushButton("View")
-                view_btn.setStyleSheet("font-weight:bold;background-color:#555599;color:white")
-                view_btn.setToolTip("View Challan")
-                challan_id = challan.get('id')
-                view_btn.clicked.connect(lambda checked, id=challan_id: self.view_challan(id))
-                actions_layout.addWidget(view_btn)
-                
-                # Delete button
-                delete_btn = QPushButton("Delete")
-                delete_btn.setStyleSheet("font-weight:bold;background-color:#cc4444;color:white")
-                delete_btn.setToolTip("Delete Challan")
-                delete_btn.clicked.connect(lambda checked, id=challan_id: self.delete_challan(id))
-                actions_layout.addWidget(delete_btn)
-                
-                self.challans_table.setCellWidget(row_position, 5, actions_widget)
-                
-                # Store challan ID (hidden)
-                self.challans_table.setItem(row_position, 6, QTableWidgetItem(str(challan.get('id', ''))))
-            
-            # Update statistics
-            self.total_challans_value.setText(str(total_count))
+            # Resetting the model also drops any page still loading for the previous filters
+            self.challans_model.reset(
+                lambda after_id: self.fetch_challan_page(after_id, filters),
+                (page.get('challans', []), page.get('next_after_id')),
+            )
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load challans: {str(e)}")
             print(f"Detailed error: {e}")  # For debugging
-            print(f"Error type: {type(e)}")  # Additional debugging
     
-    def should_display_challan(self, challan):
-        """Check if the challan matches current filters"""
-        # Search filter
-        search_text = self.search_input.text().lower()
-        if search_text:
-            challan_matches = False
-            # Check various fields for match
-            for field in ['challan_no', 'customer_name', 'customer_address', 'gstin']:
-                if field in challan and search_text in str(challan[field]).lower():
-                    challan_matches = True
-                    break
-            if not challan_matches:
-                return False
-        
-        # Date filter
-        if 'date' in challan and challan['date']:
-            try:
-                # Try different date formats
-                challan_date = None
-                date_str = str(challan['date'])
-                
-                # Try DD-MM-YYYY format
-                if '-' in date_str:
-                    challan_date = QDate.fromString(date_str, "dd-MM-yyyy")
-                    if not challan_date.isValid():
-                        challan_date = QDate.fromString(date_str, "yyyy-MM-dd")
-                # Try DD/MM/YYYY format
-                elif '/' in date_str:
-                    challan_date = QDate.fromString(date_str, "dd/MM/yyyy")
-                    if not challan_date.isValid():
-                        challan_date = QDate.fromString(date_str, "MM/dd/yyyy")
-                
-                if challan_date and challan_date.isValid():
-                    if not (self.date_from.date() <= challan_date <= self.date_to.date()):
-                        return False
-            except Exception as e:
-                print(f"Date parsing error for {challan.get('date')}: {e}")
-                # If date parsing fails, don't filter by date
-                pass
-        
-        return True
+    @staticmethod
+    def fetch_challan_page(after_id, filters):
+        """Load one later page for the model (runs on a pool thread); returns (challans, next cursor)"""
+        page = list_challans(after_id=after_id, limit=CHALLAN_PAGE_SIZE, filters=filters)
+        return page.get('challans', []), page.get('next_after_id')
+    
+    def set_total(self, total):
+        self.total_count = total
+        self.total_challans_value.setText(str(total))
+    
+    def current_filters(self):
+        """Filters passed down to the query (see build_challan_filter)"""
+        return {
+            'search': self.search_input.text(),
+            'date_from': self.date_from.date().toString("yyyy-MM-dd"),
+            'date_to': self.date_to.date().toString("yyyy-MM-dd"),
+        }
+    
+    def on_search_text_changed(self):
+        """Restart the debounce timer on every keystroke"""
+        self.search_timer.start(300)
     
     def apply_filters(self):
         """Apply filters to the challans table"""
         self.load_challans()
     
+    def on_data_changed(self, change):
+        if change.affects(CHALLANS):
+            self.stale = True
+    
+    def reopen(self):
+        """Called by the window manager when the window is shown again"""
+        if self.stale:
+            self.load_challans()
+    
+    def on_challan_action(self, action, challan):
+        """Handle a click on one of the painted row buttons"""
+        if action == 'view':
+            self.view_challan(challan['id'])
+        elif action == 'delete':
+            self.delete_challan(challan['id'])
+    
     def view_challan(self, challan_id):
         """Open the challan preview window"""
         try:
-            preview_window = ChallanPreview_Window(challan_id, self)
-            preview_window.show()
+            windows.show_preview("challan_preview", challan_id)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open challan preview: {str(e)}")
     
@@ -355,8 +311,10 @@ class Manage_Challan(QWidget):
                 success = delete_challan(challan_id)
                 
                 if success:
+                    # Drop just this row and adjust the counter
+                    if self.challans_model.remove_row(challan_id):
+                        self.set_total(self.total_count - 1)
                     QMessageBox.information(self, "Success", "Challan deleted successfully.")
-                    self.load_challans()  # Refresh the table
                 else:
                     QMessageBox.critical(self, "Error", "Failed to delete challan.")
             except Exception as e:
@@ -377,6 +335,9 @@ class Manage_Challan(QWidget):
             if not file_path.endswith('.csv'):
                 file_path += '.csv'
             
+            # Export the whole filtered list, not only the pages loaded so far
+            self.challans_model.fetch_all()
+            
             with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
                 
@@ -385,22 +346,56 @@ class Manage_Challan(QWidget):
                 writer.writerow(headers)
                 
                 # Write data rows
-                for row in range(self.challans_table.rowCount()):
-                    row_data = []
-                    for col in range(5):  # Only export visible columns, excluding Actions and ID
-                        item = self.challans_table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                for challan in self.challans_model.rows:
+                    # Only export the text columns, excluding Actions
+                    writer.writerow([text(challan) for _header, text, _color in CHALLAN_LIST_COLUMNS[:ACTIONS_COLUMN]])
             
             QMessageBox.information(self, "Success", f"Data exported successfully to {file_path}")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to export data: {str(e)}")
     
+    def export_pdfs(self):
+        """Render every challan matching the current filters to PDF as a background job"""
+        challan_ids = list_challan_ids(self.current_filters())
+        if not challan_ids:
+            QMessageBox.information(self, "Export PDFs", "No challans match the current filters.")
+            return
+        
+        folder = QFileDialog.getExistingDirectory(self, "Export PDFs to", str(export_dir("Challans")))
+        if not folder:
+            return  # User canceled
+        
+        jobs.submit(f"Export {len(challan_ids)} challan PDFs", export_challans_job, challan_ids, folder)
+        show_jobs_panel()
+    
     def create_new_challan(self):
         """Open the Create Challan window"""
         try:
-            create_window = CreateChallan(self)
-            create_window.show()
+            windows.show("create_challan")
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to open create challan window: {str(e)}")
\ No newline at end of file
+            QMessageBox.critical(self, "Error", f"Failed to open create challan window: {str(e)}")
+
+
+def export_challans_job(job, challan_ids, folder):
+    """Job function: write each challan's PDF in turn; returns a summary for the jobs panel"""
+    exported, failed, cancelled = 0, [], False
+    for done, challan_id in enumerate(challan_ids, 1):
+        try:
+            if export_challan_pdf(challan_id, folder) is None:
+                failed.append(challan_id)
+            else:
+                exported += 1
+        except Exception as e:
+            print(f"Error exporting challan {challan_id}: {e}")
+            failed.append(challan_id)
+        if not job.report(done, len(challan_ids), f"{done} of {len(challan_ids)} challans"):
+            cancelled = True
+            break
+    
+    message = f"Exported {exported} of {len(challan_ids)} challans to {folder}"
+    if cancelled:
+        message += " (cancelled)"
+    if failed:
+        message += f"\n{len(failed)} failed: " + ", ".join(str(challan_id) for challan_id in failed[:20])
+    return message
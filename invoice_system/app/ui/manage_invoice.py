@@ -1,15 +1,42 @@
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtCore import Qt, QDate, QTimer
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QButtonGroup, QRadioButton,
-    QTableWidget, QTableWidgetItem, QPushButton, QScrollArea, QDialog, QDateEdit, QFileDialog,
+    QTableView, QPushButton, QScrollArea, QDialog, QDateEdit, QFileDialog,
     QFrame, QGridLayout, QHeaderView, QSizePolicy, QComboBox, QMessageBox, QDialogButtonBox
 )
-from PySide6.QtGui import QBrush, QColor, QIcon,QFont
-from ..models.db_manager import get_all_invoices, get_invoice, delete_invoice,update_payment_status
-from .invoice_preview import InvoicePreviewWindow
+from PySide6.QtGui import QIcon,QFont
+from ..models.db_manager import (list_invoices, list_invoice_ids, get_invoice, delete_invoice,
+                                 update_payment_status, INVOICE_PAGE_SIZE)
+from ..models.events import INVOICES
+from .batch_export import export_invoices
+from .job_queue import jobs, show_jobs_panel
+from .list_table import ActionButtonsDelegate, PagedTableModel
+from .pdf_renderer import export_dir
+from .data_events import data_events
+from .window_manager import windows
 from .create_invoice import CreateInvoice
 import csv
 
+# Columns of the invoice list: (header, text(invoice), text color(invoice))
+INVOICE_LIST_COLUMNS = (
+    ("Invoice No.", lambda invoice: str(invoice.get('invoice_no', '')), None),
+    ("Date", lambda invoice: str(invoice.get('date', '')), None),
+    ("Customer Name", lambda invoice: str(invoice.get('customer_name', '')), None),
+    ("Items", lambda invoice: str(invoice.get('item_count', 0)), None),
+    ("Grand Total", lambda invoice: f"₹{float(invoice.get('grand_total') or 0):.2f}", None),
+    ("Payment Status", lambda invoice: invoice.get('payment_status', 'Pending'),
+     lambda invoice: "#0B5D02" if invoice.get('payment_status') == 'Paid' else "#CE6706"),
+    ("Actions", None, None),
+)
+ACTIONS_COLUMN = len(INVOICE_LIST_COLUMNS) - 1
+
+# Row buttons: (action, label, color, shown for invoice); Mark Paid only on pending invoices
+INVOICE_ACTIONS = (
+    ('view', "View", "#555599", None),
+    ('mark_paid', "Mark Paid", "#0D4715", lambda invoice: invoice.get('payment_status', 'Pending') == 'Pending'),
+    ('delete', "Delete", "#cc4444", None),
+)
+
 class ManageInvoice(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -32,7 +59,9 @@ class ManageInvoice(QWidget):
         # Buttons section
         self.setup_action_buttons()
         
-        # Load invoices
+        # Load invoices; later changes only mark the list stale until it is reopened
+        self.stale = False
+        data_events.changed.connect(self.on_data_changed)
         self.load_invoices()
 
         self.setStyleSheet("""
@@ -40,7 +69,7 @@ class ManageInvoice(QWidget):
                 background-color: #A6AEBF; 
                 color: #333333; font-weight:bold;
             }
-            QTableWidget { 
+            QTableView { 
                 background-color: white;
                 gridline-color: #cccccc;
             }
@@ -128,7 +157,12 @@ class ManageInvoice(QWidget):
         search_label = QLabel("Search:")
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search by invoice no., customer name")
-        self.search_input.textChanged.connect(self.apply_filters)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        
+        # Debounce typing so the query runs once the user pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.apply_filters)
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
         
@@ -177,23 +211,25 @@ class ManageInvoice(QWidget):
         self.main_layout.addSpacing(10)
     
     def setup_invoices_table(self):
-        """Set up the invoices table"""
-        # Create table widget
-        self.invoices_table = QTableWidget()
-        self.invoices_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.invoices_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.invoices_table.setAlternatingRowColors(True)
-        self.invoices_table.setColumnCount(8)
+        """Set up the invoices table: a paged model, with the action buttons painted by a delegate"""
+        self.invoices_model = PagedTableModel(INVOICE_LIST_COLUMNS, key='id', parent=self)
         
-        # Set headers
-        headers = ["Invoice No.", "Date", "Customer Name", "Items", "Grand Total", "Payment Status", "Actions", "ID"]
-        self.invoices_table.setHorizontalHeaderLabels(headers)
+        self.invoices_table = QTableView()
+        self.invoices_table.setModel(self.invoices_model)
+        self.invoices_table.setSelectionBehavior(QTableView.SelectRows)
+        self.invoices_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.invoices_table.setAlternatingRowColors(True)
+        self.invoices_table.setStyleSheet("QTableView { font-weight:600; }")
+        self.invoices_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.invoices_table.verticalHeader().setDefaultSectionSize(36)
         header_font = QFont()
         header_font.setBold(True)
         self.invoices_table.horizontalHeader().setFont(header_font)
-
-        # Hide the ID column which we'll use internally
-        self.invoices_table.setColumnHidden(7, True)
+        
+        # View / Mark Paid / Delete, painted and hit-tested by the delegate
+        self.actions_delegate = ActionButtonsDelegate(INVOICE_ACTIONS, self.invoices_table)
+        self.actions_delegate.triggered.connect(self.on_invoice_action, Qt.QueuedConnection)
+        self.invoices_table.setItemDelegateForColumn(ACTIONS_COLUMN, self.actions_delegate)
         
         # Set column widths
         self.invoices_table.setColumnWidth(0, 200)  # Invoice #
@@ -218,6 +254,12 @@ class ManageInvoice(QWidget):
         self.export_button.clicked.connect(self.export_to_csv)
         buttons_layout.addWidget(self.export_button) 
         
+        # Batch PDF export of the filtered invoices
+        self.export_pdf_button = QPushButton("Export PDFs")
+        self.export_pdf_button.setStyleSheet("background-color:#44aa44;color:white;font-weight:bold")
+        self.export_pdf_button.clicked.connect(self.export_pdfs)
+        buttons_layout.addWidget(self.export_pdf_button)
+        
         # Refresh button
         self.refresh_button = QPushButton("Refresh")
         self.refresh_button.setStyleSheet("background-color:#44aa44;color:white;font-weight:bold")
@@ -227,156 +269,62 @@ class ManageInvoice(QWidget):
         self.main_layout.addLayout(buttons_layout)
     
     def load_invoices(self):
-        """Load invoices from database"""
+        """Restart the list; the view then pulls pages from fetch_invoice_page as it scrolls"""
         try:
-            # Clear existing table
-            self.invoices_table.setRowCount(0)
-            self.invoices_table.setStyleSheet("QTableWidget { font-weight:600; }")
-            
-            # Get all invoices from database - FIXED: Using get_all_invoices() instead of get_invoice()
-            invoices = get_all_invoices()
-            
-            # Track counts for statistics
-            total_count = 0
-            paid_count = 0
-            pending_count = 0
-            
-            for invoice in invoices:
-                # Apply filters if needed
-                if not self.should_display_invoice(invoice):
-                    continue
-                
-                # Count for statistics
-                total_count += 1
-                if invoice.get('payment_status') == 'Paid':
-                    paid_count += 1
-                else:  # Assuming 'Pending' is the default
-                    pending_count += 1
-                
-                # Add row to table
-                row_position = self.invoices_table.rowCount()
-                self.invoices_table.insertRow(row_position)
-                
-                # Set invoice data
-                self.invoices_table.setItem(row_position, 0, QTableWidgetItem(str(invoice.get('invoice_no', ''))))
-                self.invoices_table.setItem(row_position, 1, QTableWidgetItem(str(invoice.get('date', ''))))
-                self.invoices_table.setItem(row_position, 2, QTableWidgetItem(str(invoice.get('customer_name', ''))))
-                
-                # Calculate number of items - FIXED: Handle the mock items structure
-                items_count = invoice.get('items', [{}])[0].get('count', 0) if invoice.get('items') else 0
-                self.invoices_table.setItem(row_position, 3, QTableWidgetItem(str(items_count)))
-                
-                # Format grand total with currency
-                grand_total = f"₹{float(invoice.get('grand_total', 0)):.2f}"
-                self.invoices_table.setItem(row_position, 4, QTableWidgetItem(grand_total))
-                
-                # Payment status with colored indicator
-                payment_status = invoice.get('payment_status', 'Pending')
-                payment_status_item = QTableWidgetItem(payment_status)
-                if payment_status == 'Paid':
-                    payment_status_item.setForeground(QBrush(QColor("#0B5D02")))
-                else:
-                    payment_status_item.setForeground(QBrush(QColor("#CE6706")))
-                self.invoices_table.setItem(row_position, 5, payment_status_item)
-                
-                # Add action buttons
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(4, 2, 4, 2)
-
-                # View button
-                view_btn = QPushButton("View")
-                view_btn.setStyleSheet("font-weight:bold;background-color:#555599;color:white")
-                view_btn.clicked.connect(lambda checked, id=invoice['id']: self.view_invoice(id))
-                actions_layout.addWidget(view_btn)
-
-                # Payment Status Toggle button or Spacer
-                current_status = invoice.get('payment_status', 'Pending')
-
-                if current_status == 'Pending':
-                    toggle_btn = QPushButton("Mark Paid")
-                    toggle_btn.setStyleSheet("background-color: #0D4715; color: white;font-weight:bold")
-                    new_status = 'Paid'
-
-                    toggle_btn.clicked.connect(
-                        lambda checked, id=invoice['id'], status=new_status: self.toggle_payment_status(id, status)
-                    )
-                    actions_layout.addWidget(toggle_btn)
-                else:
-                    # Add an empty spacer button (same size as real one for alignment)
-                    spacer_btn = QPushButton()
-                    spacer_btn.setFixedSize(85, 28)  # Match size to real button
-                    spacer_btn.setEnabled(False)
-                    spacer_btn.setFlat(True)
-                    spacer_btn.setStyleSheet("border: none; background-color: transparent;")
-                    actions_layout.addWidget(spacer_btn)
-
-                # Delete button
-                delete_btn = QPushButton("Delete")
-                delete_btn.setStyleSheet("font-weight:bold;background-color:#cc4444;color:white")
-                delete_btn.clicked.connect(lambda checked, id=invoice['id']: self.delete_invoice(id))
-                actions_layout.addWidget(delete_btn)
-
-                # Add to table
-                self.invoices_table.setCellWidget(row_position, 6, actions_widget)
-
-                # Store invoice ID (hidden)
-                self.invoices_table.setItem(row_position, 7, QTableWidgetItem(str(invoice['id'])))
-
-            
-            # Update statistics
-            self.total_invoices_value.setText(str(total_count))
-            self.paid_invoices_value.setText(str(paid_count))
-            self.pending_invoices_value.setText(str(pending_count))
+            self.stale = False
+            # Later pages use the filters the list was loaded with
+            self.filters = self.current_filters()
+            self.invoices_model.reset(self.fetch_invoice_page)
+            self.invoices_model.fetchMore()
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load invoices: {str(e)}")
             print(f"Detailed error: {e}")  # For debugging
     
-    def should_display_invoice(self, invoice):
-        """Check if the invoice matches current filters"""
-        # Search filter
-        search_text = self.search_input.text().lower()
-        if search_text:
-            invoice_matches = False
-            # Check various fields for match
-            for field in ['invoice_no', 'customer_name', 'customer_address', 'gstin']:
-                if field in invoice and search_text in str(invoice[field]).lower():
-                    invoice_matches = True
-                    break
-            if not invoice_matches:
-                return False
-        
-        # Payment status filter
-        status_filter = self.status_combo.currentText()
-        if status_filter != "All" and invoice.get('payment_status') != status_filter:
-            return False
-        
-        # Date filter
-        if 'date' in invoice and invoice['date']:
-            try:
-                # Try different date formats
-                invoice_date = None
-                date_str = str(invoice['date'])
-                
-                # Try DD/MM/YYYY format
-                if '/' in date_str:
-                    invoice_date = QDate.fromString(date_str, "dd/MM/yyyy")
-                    if not invoice_date.isValid():
-                        invoice_date = QDate.fromString(date_str, "MM/dd/yyyy")
-                # Try YYYY-MM-DD format
-                elif '-' in date_str:
-                    invoice_date = QDate.fromString(date_str, "yyyy-MM-dd")
-                
-                if invoice_date and invoice_date.isValid():
-                    if not (self.date_from.date() <= invoice_date <= self.date_to.date()):
-                        return False
-            except Exception as e:
-                print(f"Date parsing error for {invoice.get('date')}: {e}")
-                # If date parsing fails, don't filter by date
-                pass
-        
-        return True
+    def fetch_invoice_page(self, after_id):
+        """Load one page for the model; returns (invoices, next cursor)"""
+        page = list_invoices(after_id=after_id, limit=INVOICE_PAGE_SIZE, filters=self.filters)
+        if after_id is None:
+            # Statistics cover the whole filtered set, not just the loaded page
+            self.set_statistics(page.get('total', 0), page.get('paid', 0), page.get('pending', 0))
+        return page.get('invoices', []), page.get('next_after_id')
+    
+    def set_statistics(self, total, paid, pending):
+        self.stats = {'total': total, 'paid': paid, 'pending': pending}
+        self.total_invoices_value.setText(str(total))
+        self.paid_invoices_value.setText(str(paid))
+        self.pending_invoices_value.setText(str(pending))
+    
+    def current_filters(self):
+        """Filters passed down to the query (see build_invoice_filter)"""
+        return {
+            'search': self.search_input.text(),
+            'payment_status': self.status_combo.currentText(),
+            'date_from': self.date_from.date().toString("yyyy-MM-dd"),
+            'date_to': self.date_to.date().toString("yyyy-MM-dd"),
+        }
+    
+    def on_data_changed(self, change):
+        if change.affects(INVOICES):
+            self.stale = True
+    
+    def reopen(self):
+        """Called by the window manager when the window is shown again"""
+        if self.stale:
+            self.load_invoices()
+    
+    def on_invoice_action(self, action, invoice):
+        """Handle a click on one of the painted row buttons"""
+        if action == 'view':
+            self.view_invoice(invoice['id'])
+        elif action == 'mark_paid':
+            self.toggle_payment_status(invoice['id'], 'Paid')
+        elif action == 'delete':
+            self.delete_invoice(invoice['id'])
+    
+    def on_search_text_changed(self):
+        """Restart the debounce timer on every keystroke"""
+        self.search_timer.start(300)
     
     def apply_filters(self):
         """Apply filters to the invoices table"""
@@ -385,8 +333,7 @@ class ManageInvoice(QWidget):
     def view_invoice(self, invoice_id):
         """Open the invoice preview window"""
         try:
-            preview_window = InvoicePreviewWindow(invoice_id, self)
-            preview_window.show()
+            windows.show_preview("invoice_preview", invoice_id)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open invoice preview: {str(e)}")
     
@@ -405,8 +352,19 @@ class ManageInvoice(QWidget):
                 success = update_payment_status(invoice_id, new_status)
                 
                 if success:
+                    status_filter = self.filters.get('payment_status')
+                    if status_filter and status_filter != 'All' and status_filter != new_status:
+                        # The row no longer matches the status filter: drop it, as delete_invoice does
+                        if self.invoices_model.remove_row(invoice_id):
+                            paid = new_status != 'Paid'
+                            self.set_statistics(self.stats['total'] - 1, self.stats['paid'] - paid,
+                                                self.stats['pending'] - (not paid))
+                    # Otherwise update just this row and the counters instead of reloading the list
+                    elif self.invoices_model.update_row(invoice_id, payment_status=new_status):
+                        change = 1 if new_status == 'Paid' else -1
+                        self.set_statistics(self.stats['total'], self.stats['paid'] + change,
+                                            self.stats['pending'] - change)
                     QMessageBox.information(self, "Success", f"Payment status updated to {new_status}")
-                    self.load_invoices()  # Refresh the table to show updated status
                 else:
                     QMessageBox.critical(self, "Error", "Failed to update payment status.")
                     
@@ -426,8 +384,14 @@ class ManageInvoice(QWidget):
                 success = delete_invoice(invoice_id)
                 
                 if success:
+                    # Drop just this row and adjust the counters
+                    number = self.invoices_model.row_of(invoice_id)
+                    if number >= 0:
+                        paid = self.invoices_model.rows[number].get('payment_status') == 'Paid'
+                        self.invoices_model.remove_row(invoice_id)
+                        self.set_statistics(self.stats['total'] - 1, self.stats['paid'] - paid,
+                                            self.stats['pending'] - (not paid))
                     QMessageBox.information(self, "Success", "Invoice deleted successfully.")
-                    self.load_invoices()  # Refresh the table
                 else:
                     QMessageBox.critical(self, "Error", "Failed to delete invoice.")
             except Exception as e:
@@ -448,6 +412,9 @@ class ManageInvoice(QWidget):
             if not file_path.endswith('.csv'):
                 file_path += '.csv'
             
+            # Export the whole filtered list, not only the pages loaded so far
+            self.invoices_model.fetch_all()
+            
             with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
                 
@@ -456,16 +423,43 @@ class ManageInvoice(QWidget):
                 writer.writerow(headers)
                 
                 # Write data rows
-                for row in range(self.invoices_table.rowCount()):
-                    row_data = []
-                    for col in range(6):  # Only export visible columns, excluding Actions and ID
-                        item = self.invoices_table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                for invoice in self.invoices_model.rows:
+                    # Only export the text columns, excluding Actions
+                    writer.writerow([text(invoice) for _header, text, _color in INVOICE_LIST_COLUMNS[:ACTIONS_COLUMN]])
             
             QMessageBox.information(self, "Success", f"Data exported successfully to {file_path}")
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to export data: {str(e)}")
     
-    
\ No newline at end of file
+    
+    
+    def export_pdfs(self):
+        """Render every invoice matching the current filters to PDF as a background job"""
+        invoice_ids = list_invoice_ids(self.current_filters())
+        if not invoice_ids:
+            QMessageBox.information(self, "Export PDFs", "No invoices match the current filters.")
+            return
+        
+        folder = QFileDialog.getExistingDirectory(self, "Export PDFs to", str(export_dir("Invoices")))
+        if not folder:
+            return  # User canceled
+        
+        jobs.submit(f"Export {len(invoice_ids)} invoice PDFs", export_invoices_job, invoice_ids, folder)
+        show_jobs_panel()
+
+
+def export_invoices_job(job, invoice_ids, folder):
+    """Job function: batch export with progress; returns a summary for the jobs panel"""
+    def report(done, total, invoice_id, error):
+        return job.report(done, total, f"{done} of {total} invoices")
+    
+    result = export_invoices(invoice_ids, folder=folder, progress=report)
+    
+    message = f"Exported {len(result['exported'])} of {len(invoice_ids)} invoices to {folder}"
+    if result['cancelled']:
+        message += " (cancelled)"
+    if result['failed']:
+        failed = "\n".join(f"Invoice {invoice_id}: {error}" for invoice_id, error in result['failed'][:20])
+        message += f"\n{len(result['failed'])} failed:\n{failed}"
+    return message
@@ -0,0 +1,40 @@
+"""
+Lazy page registry.
+
+Pages and windows are named here instead of being imported by the main
+window and sidebar, so a module (and everything it imports: PDF
+rendering, the job queue, preview windows...) is loaded only when the
+user first navigates to it.
+
+    window = create_page("manage_invoice")
+"""
+import importlib
+
+# name: (module relative to this package, class name)
+PAGES = {
+    # Main window pages
+    "invoice": (".invoice_view", "InvoiceView"),
+    "challan": (".challan_view", "ChallanView"),
+    "inventory": (".inventory", "InventoryView"),
+    "customers": (".customers_view", "CustomerView"),
+    # Windows opened from the sidebar and dashboards
+    "create_invoice": (".create_invoice", "CreateInvoice"),
+    "manage_invoice": (".manage_invoice", "ManageInvoice"),
+    "create_challan": (".create_challan", "CreateChallan"),
+    "manage_challan": (".manage_challan", "Manage_Challan"),
+    "admin": (".admin_page", "AdminPage"),
+    # Preview windows, created with the document id
+    "invoice_preview": (".invoice_preview", "InvoicePreviewWindow"),
+    "challan_preview": (".challan_preview", "ChallanPreview_Window"),
+}
+
+
+def page_class(name):
+    """Import the page's module (first call only) and return its class."""
+    module_name, class_name = PAGES[name]
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+def create_page(name, *args, **kwargs):
+    """Create a new instance of a registered page."""
+    return page_class(name)(*args, **kwargs)
@@ -0,0 +1,704 @@
+"""
+Headless PDF rendering of invoices and challans.
+
+The document is drawn straight onto a QPdfWriter with QPainter, so no
+window or widget tree is built and it works under QT_QPA_PLATFORM=offscreen.
+The column specs, detail fields and notes below are shared with the
+on-screen previews, so the preview and the PDF always show the same layout.
+"""
+import os
+import sys
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QMarginsF, QPointF, QRectF
+from PySide6.QtGui import (QColor, QFont, QFontMetricsF, QGuiApplication,
+                           QPageLayout, QPageSize, QPainter, QPdfWriter, QPen)
+
+from ..models.db_manager import get_challan_by_id, load_company_info, load_invoice_document
+from ..models.invoice_calculator import gst_rate, taxable_by_rate, to_rupees
+from ..models.pdf_cache import cache as pdf_cache, document_key
+from .logo_cache import logos
+
+FONT_FAMILY = "Segoe UI"
+PDF_RESOLUTION = 300
+PAGE_MARGIN_MM = 15
+
+# Part of every PDF cache key: bump it whenever the drawing code changes
+# what a document looks like, so stale cached renderings are never served.
+LAYOUT_VERSION = 1
+
+# Where Download / export writes PDFs: set_export_dir(), else $FINVO_EXPORT_DIR,
+# else ~/Documents/Finvo. Invoices and challans go to subfolders.
+EXPORT_DIR_ENV = "FINVO_EXPORT_DIR"
+_export_root = None
+
+
+def _money(value):
+    return f"₹{float(value or 0):.2f}"
+
+
+# Items table columns: (header, preview width in px or None to stretch, alignment, cell text)
+INVOICE_COLUMNS = (
+    ("Sl No.", 60, Qt.AlignCenter, lambda index, item: str(index + 1)),
+    ("Description", None, Qt.AlignLeft, lambda index, item: item["description"] or ""),
+    ("HSN/SAC", 80, Qt.AlignCenter, lambda index, item: item["hsn"] or ""),
+    ("Quantity", 80, Qt.AlignRight, lambda index, item: str(item["quantity"]) if item["quantity"] else "0"),
+    ("Type", 60, Qt.AlignCenter, lambda index, item: item["type"] or ""),
+    ("Rate", 100, Qt.AlignRight, lambda index, item: _money(item["rate"])),
+    ("GST%", 70, Qt.AlignCenter, lambda index, item: f"{item['gst_percent']}%" if item["gst_percent"] else "0%"),
+    ("Total", 120, Qt.AlignRight, lambda index, item: _money(item["total"])),
+)
+
+CHALLAN_COLUMNS = tuple(column for column in INVOICE_COLUMNS if column[0] != "GST%")
+
+# Tax breakdown columns; rows come from tax_breakdown()
+TAX_COLUMNS = (
+    ("GST Rate", 80, Qt.AlignCenter),
+    ("Total Amount", 120, Qt.AlignRight),
+    ("SGST Amount", 110, Qt.AlignRight),
+    ("CGST Amount", 110, Qt.AlignRight),
+    ("IGST Amount", 110, Qt.AlignRight),
+    ("Total Tax", 120, Qt.AlignRight),
+)
+
+INVOICE_NOTES = ("NOTES:", "Thank you for your business!")
+
+CHALLAN_NOTES = (
+    "NOTE:",
+    "1. This is a computer-generated delivery challan and does not require a signature.\n"
+    "2. All goods mentioned above are delivered in good condition.\n"
+    "3. Any discrepancy should be reported within 24 hours of delivery.\n"
+    "4. This challan is valid for transportation purposes only."
+)
+
+
+def party_lines(record):
+    """Bill to / ship to lines of an invoice or challan, skipping empty fields"""
+    lines = [
+        record["customer_name"],
+        record["customer_address"],
+        f"GSTIN: {record['gstin']}" if record["gstin"] else None,
+        f"State: {record['state']}" if record["state"] else None,
+        f"State Code: {record['state_code']}" if record["state_code"] else None,
+    ]
+    return [str(line) for line in lines if line]
+
+
+def consignee_fields(challan):
+    """(label, value) pairs of the challan consignee box"""
+    fields = [
+        ("Name:", challan["customer_name"]),
+        ("Address:", challan["customer_address"]),
+        ("GSTIN:", challan["gstin"]),
+        ("State:", challan["state"]),
+        ("State Code:", challan["state_code"]),
+    ]
+    return [(label, str(value)) for label, value in fields if value]
+
+
+def invoice_detail_fields(invoice):
+    """(label, value) pairs of the invoice details box"""
+    fields = [
+        ("Invoice No:", invoice["invoice_no"]),
+        ("Invoice Date:", invoice["date"]),
+        ("Payment Status:", invoice["payment_status"]),
+    ]
+    return [(label, str(value)) for label, value in fields if value]
+
+
+def challan_detail_fields(challan):
+    """(label, value) pairs of the challan details box, transport fields only when set"""
+    fields = [("Challan No:", challan["challan_no"]), ("Date:", challan["date"])]
+    for label, key in (("Vehicle No:", "vehicle"), ("Transporter:", "transporter"), ("LR No:", "lr")):
+        if challan[key] and str(challan[key]).strip():
+            fields.append((label, challan[key]))
+    return [(label, str(value)) for label, value in fields if value]
+
+
+def item_cells(columns, items):
+    """Cell text of every item row for the given column specs"""
+    return [[column[3](index, item) for column in columns] for index, item in enumerate(items)]
+
+
+def tax_breakdown(items, taxes):
+    """
+    Rows of the tax breakdown table.
+
+    The taxable amount per rate comes from the tax rows' taxable_amount
+    (see get_invoice_taxes); for tax rows without it, it is summed from
+    the already loaded items. No query is run per GST rate.
+
+    Args:
+        items: Invoice item rows (gst_percent, total)
+        taxes: invoice_taxes rows ordered by gst_percent
+
+    Returns:
+        tuple: (rows, totals) where each row is
+            (gst_percent, taxable, sgst, cgst, igst, tax_total) and totals
+            holds the column sums from taxable onwards
+    """
+    taxable = None
+    rows = []
+    for tax in taxes:
+        if "taxable_amount" in tax.keys():
+            amount = float(tax["taxable_amount"] or 0)
+        else:
+            if taxable is None:
+                taxable = taxable_by_rate(items)
+            amount = to_rupees(taxable.get(gst_rate(tax["gst_percent"]), 0))
+        rows.append((
+            tax["gst_percent"],
+            amount,
+            float(tax["sgst_amount"] or 0),
+            float(tax["cgst_amount"] or 0),
+            float(tax["igst_amount"] or 0),
+            float(tax["tax_total"] or 0),
+        ))
+    totals = tuple(sum(row[index] for row in rows) for index in range(1, 6))
+    return rows, totals
+
+
+def tax_cells(rows, totals):
+    """Cell text of the tax breakdown rows followed by the TOTAL row"""
+    cells = [[f"{row[0]}%"] + [_money(value) for value in row[1:]] for row in rows]
+    cells.append(["TOTAL"] + [_money(value) for value in totals])
+    return cells
+
+
+def set_export_dir(path):
+    """Override the PDF export folder for this process (None restores the default)."""
+    global _export_root
+    _export_root = Path(path) if path else None
+
+
+def export_dir(kind="Invoices"):
+    """
+    Folder that PDFs of the given kind are written to, created on demand.
+
+    Args:
+        kind (str): Subfolder name, e.g. "Invoices" or "Challans"
+    """
+    root = _export_root or os.environ.get(EXPORT_DIR_ENV) or Path.home() / "Documents" / "Finvo"
+    folder = Path(root) / kind
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def ensure_gui_application():
+    """
+    Return the running QGuiApplication, creating an offscreen one if needed.
+
+    QPdfWriter needs an application object for fonts; command-line exports
+    and worker processes have none and usually no display either.
+    """
+    app = QGuiApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication(sys.argv[:1])
+    return app
+
+
+class DocumentRenderer:
+    """
+    Draws document sections top to bottom onto a QPdfWriter, page by page.
+
+    Coordinates are device pixels of the writer's paint area; sizes are
+    given in points and converted with pt(). A renderer without a painter
+    only lays the document out, which is how the total page count for
+    "Page X of Y" is found before the real pass. Each finished page is
+    handed to the writer straight away, so memory does not grow with the
+    number of pages.
+    """
+
+    def __init__(self, writer, painter=None, footer="", page_count=None, text_heights=None):
+        self.writer = writer
+        self.painter = painter
+        self.footer = footer
+        self.page_count = page_count
+        self.scale = writer.resolution() / 72.0
+        self.width = writer.width()
+        self.y = 0.0
+        self.page = 1
+        self.padding = self.pt(5)
+
+        self.fonts = {
+            "title": QFont(FONT_FAMILY, 22, QFont.Bold),
+            "company": QFont(FONT_FAMILY, 15, QFont.Bold),
+            "heading": QFont(FONT_FAMILY, 12, QFont.Bold),
+            "label": QFont(FONT_FAMILY, 8, QFont.Bold),
+            "body": QFont(FONT_FAMILY, 9),
+            "bold": QFont(FONT_FAMILY, 9, QFont.Bold),
+            "total": QFont(FONT_FAMILY, 13, QFont.Bold),
+            "footer": QFont(FONT_FAMILY, 7),
+        }
+        self.metrics = {name: QFontMetricsF(font, writer) for name, font in self.fonts.items()}
+        # Wrapped text heights, shared between the layout and the paint pass
+        self.text_heights = {} if text_heights is None else text_heights
+
+        # Content stops above the footer band
+        self.footer_height = self.metrics["footer"].height() + self.pt(6)
+        self.height = writer.height() - self.footer_height
+
+        self.pen = QPen(QColor("#000000"))
+        self.pen.setWidthF(self.pt(0.75))
+        if painter is not None:
+            painter.setPen(self.pen)
+
+    def pt(self, points):
+        """Convert points to device pixels."""
+        return points * self.scale
+
+    # --- primitives (no-ops while only laying out) ---
+
+    def text_height(self, text, font, width):
+        """Height of text word-wrapped to width."""
+        key = (text, font, width)
+        height = self.text_heights.get(key)
+        if height is None:
+            rect = self.metrics[font].boundingRect(QRectF(0, 0, width, 1e7), Qt.TextWordWrap, text)
+            height = self.text_heights[key] = rect.height()
+        return height
+
+    def draw_text(self, rect, text, font, flags=Qt.AlignLeft | Qt.AlignTop):
+        if self.painter is None:
+            return
+        self.painter.setFont(self.fonts[font])
+        self.painter.drawText(rect, flags | Qt.TextWordWrap, text)
+
+    def draw_rect(self, rect, fill=None, line_width=None):
+        if self.painter is None:
+            return
+        if fill is not None:
+            self.painter.fillRect(rect, fill)
+        if line_width is not None:
+            self.pen.setWidthF(self.pt(line_width))
+            self.painter.setPen(self.pen)
+        self.painter.drawRect(rect)
+        if line_width is not None:
+            self.pen.setWidthF(self.pt(0.75))
+            self.painter.setPen(self.pen)
+
+    def draw_rule(self):
+        if self.painter is not None:
+            self.painter.drawLine(QPointF(0, self.y), QPointF(self.width, self.y))
+
+    def draw_image(self, rect, image):
+        if self.painter is not None:
+            self.painter.drawImage(rect, image)
+
+    # --- pages ---
+
+    def fits(self, height):
+        return self.y + height <= self.height
+
+    def ensure_space(self, height):
+        """Start a new page when the next block would not fit on this one."""
+        if self.y > 0 and not self.fits(height):
+            self.new_page()
+
+    def draw_footer(self):
+        """Document name on the left and 'Page X of Y' on the right of the footer band."""
+        rect = QRectF(0, self.height + self.pt(6), self.width, self.metrics["footer"].height())
+        page_text = f"Page {self.page} of {self.page_count}" if self.page_count else f"Page {self.page}"
+        self.draw_text(rect, self.footer, "footer", Qt.AlignLeft | Qt.AlignTop)
+        self.draw_text(rect, page_text, "footer", Qt.AlignRight | Qt.AlignTop)
+
+    def new_page(self):
+        self.draw_footer()
+        if self.painter is not None:
+            self.writer.newPage()
+        self.page += 1
+        self.y = 0.0
+
+    def finish(self):
+        """Close the last page; returns the number of pages."""
+        self.draw_footer()
+        return self.page
+
+    def column_widths(self, columns):
+        """Scale preview column widths to the page; stretch columns share what is left."""
+        stretch = 200
+        weights = [column[1] or stretch for column in columns]
+        total = sum(weights)
+        return [self.width * weight / total for weight in weights]
+
+    # --- sections ---
+
+    def draw_title(self, text):
+        height = self.text_height(text, "title", self.width)
+        self.ensure_space(height)
+        self.draw_text(QRectF(0, self.y, self.width, height), text, "title", Qt.AlignHCenter | Qt.AlignTop)
+        self.y += height + self.pt(10)
+
+    def draw_company_header(self, company):
+        """Company name, address and contact on the left, logo on the right, then a rule."""
+        logo_width, logo_height = self.pt(110), self.pt(70)
+        text_width = self.width - logo_width - self.pt(20)
+
+        lines = [
+            (company["name"] if company else "Company Name Not Available", "company"),
+            (company["address"] if company else "Address Not Available", "body"),
+            (f"Contact: {company['contact']}" if company else "Contact Not Available", "body"),
+        ]
+        heights = [self.text_height(text or "", font, text_width) for text, font in lines]
+        block_height = max(sum(heights) + self.pt(4) * len(lines), logo_height)
+        self.ensure_space(block_height)
+
+        y = self.y
+        for (text, font), height in zip(lines, heights):
+            self.draw_text(QRectF(0, y, text_width, height), text or "", font)
+            y += height + self.pt(4)
+
+        if self.painter is not None:
+            logo_rect = QRectF(self.width - logo_width, self.y, logo_width, logo_height)
+            image = logos.print_image(company)
+            if image is None:
+                self.draw_rect(logo_rect, QColor("#f8f9fa"))
+                self.draw_text(logo_rect, "COMPANY\nLOGO", "heading", Qt.AlignCenter)
+            else:
+                scaled = image.size().scaled(logo_rect.size().toSize(), Qt.KeepAspectRatio)
+                self.draw_image(QRectF(logo_rect.right() - scaled.width(), logo_rect.top(),
+                                       scaled.width(), scaled.height()), image)
+
+        self.y += block_height + self.pt(8)
+        self.draw_rule()
+        self.y += self.pt(12)
+
+    def draw_boxes(self, boxes):
+        """
+        Bordered boxes side by side, e.g. bill to / ship to / invoice details.
+
+        Args:
+            boxes: List of (title, lines); a line is a plain string or a
+                (label, value) pair drawn as a bold label above its value
+        """
+        gap = self.pt(10)
+        pad = self.pt(8)
+        box_width = (self.width - gap * (len(boxes) - 1)) / len(boxes)
+        inner = box_width - 2 * pad
+
+        layouts = []
+        for title, lines in boxes:
+            parts = [(title, "heading", self.text_height(title, "heading", inner) + self.pt(4))]
+            for line in lines:
+                if isinstance(line, tuple):
+                    label, value = line
+                    parts.append((label, "label", self.text_height(label, "label", inner)))
+                    parts.append((value, "body", self.text_height(value, "body", inner) + self.pt(4)))
+                else:
+                    parts.append((line, "body", self.text_height(line, "body", inner) + self.pt(3)))
+            layouts.append(parts)
+
+        box_height = max(sum(part[2] for part in parts) for parts in layouts) + 2 * pad
+        self.ensure_space(box_height)
+
+        for index, parts in enumerate(layouts):
+            x = index * (box_width + gap)
+            self.draw_rect(QRectF(x, self.y, box_width, box_height))
+            y = self.y + pad
+            for text, font, height in parts:
+                self.draw_text(QRectF(x + pad, y, inner, height), text, font)
+                y += height
+
+        self.y += box_height + self.pt(14)
+
+    def draw_section_title(self, text):
+        height = self.text_height(text, "heading", self.width)
+        # Keep the title on the same page as at least the table header
+        self.ensure_space(height + self.pt(40))
+        self.draw_text(QRectF(0, self.y, self.width, height), text, "heading", Qt.AlignHCenter | Qt.AlignTop)
+        self.y += height + self.pt(8)
+
+    def row_height(self, widths, cells, font="body"):
+        pad = self.padding
+        return max(self.text_height(text, font, width - 2 * pad) for text, width in zip(cells, widths)) + 2 * pad
+
+    def draw_table_row(self, widths, alignments, cells, font="body", fill=None, height=None):
+        """Draw one bordered table row at the cursor and advance past it."""
+        pad = self.padding
+        if height is None:
+            height = self.row_height(widths, cells, font)
+
+        x = 0.0
+        for text, width, alignment in zip(cells, widths, alignments):
+            rect = QRectF(x, self.y, width, height)
+            self.draw_rect(rect, fill)
+            self.draw_text(rect.adjusted(pad, pad, -pad, -pad), text, font, alignment | Qt.AlignVCenter)
+            x += width
+        self.y += height
+
+    def draw_carry_row(self, widths, label, amount):
+        """Row spanning all but the last column, used for carried / brought forward subtotals."""
+        self.draw_table_row([sum(widths[:-1]), widths[-1]], [Qt.AlignRight, Qt.AlignRight],
+                            [label, _money(amount)], "bold", QColor("#f2f2f2"))
+
+    def draw_table(self, columns, rows, total_row=None, amounts=None):
+        """
+        Table with a bold header row that is repeated on every page it spans.
+
+        Rows are never split across pages. When amounts are given, the
+        running sum of the last column is carried forward at the foot of
+        each page and brought forward under the header of the next.
+
+        Args:
+            columns: Column specs (header, width, alignment, ...)
+            rows: Cell text per row
+            total_row: Optional cell text of a highlighted closing row
+            amounts: Optional numeric value of the last column per row
+        """
+        widths = self.column_widths(columns)
+        alignments = [column[2] for column in columns]
+        header_alignments = [Qt.AlignCenter] * len(columns)
+        header = [column[0] for column in columns]
+        header_height = self.row_height(widths, header, "bold")
+        carry_height = self.row_height([self.width], ["Carried forward"], "bold") if amounts is not None else 0
+
+        self.ensure_space(header_height + (self.row_height(widths, rows[0]) if rows else 0))
+        self.draw_table_row(widths, header_alignments, header, "bold", height=header_height)
+
+        running = 0.0
+        last = len(rows) - 1
+        for index, cells in enumerate(rows):
+            height = self.row_height(widths, cells)
+            # The last row needs no carried-forward line below it
+            reserve = carry_height if index < last else 0
+            if not self.fits(height + reserve):
+                if amounts is not None:
+                    self.draw_carry_row(widths, "Carried forward", running)
+                self.new_page()
+                self.draw_table_row(widths, header_alignments, header, "bold", height=header_height)
+                if amounts is not None:
+                    self.draw_carry_row(widths, "Brought forward", running)
+            self.draw_table_row(widths, alignments, cells, height=height)
+            if amounts is not None:
+                running += amounts[index]
+
+        if total_row is not None:
+            height = self.row_height(widths, total_row, "bold")
+            if not self.fits(height):
+                self.new_page()
+                self.draw_table_row(widths, header_alignments, header, "bold", height=header_height)
+            self.draw_table_row(widths, alignments, total_row, "bold", QColor("#e8f4fd"), height)
+        self.y += self.pt(14)
+
+    def draw_grand_total(self, amount):
+        text = f"GRAND TOTAL:   {_money(amount)}"
+        pad = self.pt(10)
+        width = self.metrics["total"].horizontalAdvance(text) + 2 * pad
+        height = self.metrics["total"].height() + 2 * pad
+        self.ensure_space(height)
+        rect = QRectF(self.width - width, self.y, width, height)
+        self.draw_rect(rect, line_width=1.5)
+        self.draw_text(rect, text, "total", Qt.AlignCenter)
+        self.y += height + self.pt(20)
+
+    def draw_notes(self, notes):
+        title, text = notes
+        pad = self.pt(10)
+        inner = self.width - 2 * pad
+        title_height = self.text_height(title, "heading", inner)
+        text_height = self.text_height(text, "body", inner)
+        height = title_height + self.pt(6) + text_height + 2 * pad
+        self.ensure_space(height)
+        self.draw_rect(QRectF(0, self.y, self.width, height))
+        self.draw_text(QRectF(pad, self.y + pad, inner, title_height), title, "heading")
+        self.draw_text(QRectF(pad, self.y + pad + title_height + self.pt(6), inner, text_height), text, "body")
+        self.y += height
+
+    # --- documents ---
+
+    def draw_invoice(self, invoice, items, taxes, company):
+        self.draw_title("INVOICE")
+        self.draw_company_header(company)
+        lines = party_lines(invoice)
+        self.draw_boxes([
+            ("BILL TO:", lines),
+            ("SHIP TO:", lines),
+            ("INVOICE DETAILS", invoice_detail_fields(invoice)),
+        ])
+
+        self.draw_section_title("INVOICE ITEMS")
+        self.draw_table(INVOICE_COLUMNS, item_cells(INVOICE_COLUMNS, items),
+                        amounts=[float(item["total"] or 0) for item in items])
+
+        self.draw_section_title("TAX BREAKDOWN")
+        rows, totals = tax_breakdown(items, taxes)
+        if rows:
+            cells = tax_cells(rows, totals)
+            self.draw_table(TAX_COLUMNS, cells[:-1], cells[-1])
+        else:
+            height = self.text_height("No tax data available for this invoice.", "body", self.width)
+            self.draw_text(QRectF(0, self.y, self.width, height),
+                           "No tax data available for this invoice.", "body", Qt.AlignHCenter | Qt.AlignTop)
+            self.y += height + self.pt(14)
+
+        self.draw_grand_total(invoice["grand_total"])
+        self.draw_notes(INVOICE_NOTES)
+
+    def draw_challan(self, challan, items, company):
+        self.draw_title("DELIVERY CHALLAN")
+        self.draw_company_header(company)
+        self.draw_boxes([
+            ("CONSIGNEE DETAILS", consignee_fields(challan)),
+            ("CHALLAN DETAILS", challan_detail_fields(challan)),
+        ])
+
+        self.draw_section_title("ITEMS DELIVERED")
+        self.draw_table(CHALLAN_COLUMNS, item_cells(CHALLAN_COLUMNS, items),
+                        amounts=[float(item["total"] or 0) for item in items])
+
+        self.draw_grand_total(challan["grand_total"])
+        self.draw_notes(CHALLAN_NOTES)
+
+
+def render_document(file_path, title, draw):
+    """
+    Write an A4 PDF with the app's margins in two passes.
+
+    The first pass only lays the document out to count its pages; the
+    second paints it, so every footer can say "Page X of Y".
+
+    Args:
+        file_path (str | Path): Output file
+        title (str): PDF title, also printed in the footer
+        draw: Callable(renderer) that draws the document sections
+
+    Returns:
+        int: Number of pages written
+    """
+    ensure_gui_application()
+    writer = QPdfWriter(str(file_path))
+    writer.setResolution(PDF_RESOLUTION)
+    writer.setPageSize(QPageSize(QPageSize.A4))
+    writer.setPageMargins(QMarginsF(PAGE_MARGIN_MM, PAGE_MARGIN_MM, PAGE_MARGIN_MM, PAGE_MARGIN_MM),
+                          QPageLayout.Millimeter)
+    writer.setTitle(title)
+    writer.setCreator("Finvo")
+
+    layout = DocumentRenderer(writer, footer=title)
+    draw(layout)
+    page_count = layout.finish()
+
+    painter = QPainter(writer)
+    if not painter.isActive():
+        raise RuntimeError("Painter could not start on PDF writer")
+    try:
+        renderer = DocumentRenderer(writer, painter, title, page_count, layout.text_heights)
+        draw(renderer)
+        renderer.finish()
+    finally:
+        painter.end()
+    return page_count
+
+
+def _render_cached(kind, record, file_path, parts, render):
+    """
+    Copy a cached rendering to file_path, or render it and cache the result.
+
+    Records without an id (unsaved documents) are always rendered.
+
+    Args:
+        kind (str): 'invoice' or 'challan'
+        record: Header row; its 'id' names the cache entry
+        file_path (str | Path): Output file
+        parts (tuple): Everything the rendering depends on
+        render: Callable(file_path) that writes the PDF
+    """
+    file_path = Path(file_path)
+    doc_id = record["id"] if "id" in record.keys() else None
+    if doc_id is None:
+        render(file_path)
+        return file_path
+
+    key = document_key(kind, LAYOUT_VERSION, *parts)
+    data = pdf_cache.get(kind, doc_id, key)
+    if data is not None:
+        file_path.write_bytes(data)
+        return file_path
+
+    render(file_path)
+    try:
+        pdf_cache.put(kind, doc_id, key, file_path.read_bytes())
+    except OSError as e:
+        print(f"PDF cache skipped for {kind} {doc_id}: {e}")
+    return file_path
+
+
+def render_invoice_pdf(file_path, invoice, items, taxes, company):
+    """
+    Write an invoice PDF from already loaded data.
+
+    Saved invoices are served from the PDF cache when the invoice,
+    its items, its taxes and the company details are unchanged.
+
+    Args:
+        file_path (str | Path): Output file
+        invoice: Invoice header row (dict or sqlite3.Row)
+        items: Invoice item rows
+        taxes: invoice_taxes rows ordered by gst_percent
+        company: company_info row or None
+
+    Returns:
+        Path: The written file
+    """
+    def render(path):
+        render_document(path, f"Invoice {invoice['invoice_no']}",
+                        lambda renderer: renderer.draw_invoice(invoice, items, taxes, company))
+
+    parts = (invoice, items, taxes, company)
+    return _render_cached("invoice", invoice, file_path, parts, render)
+
+
+def render_challan_pdf(file_path, challan, items, company):
+    """
+    Write a delivery challan PDF from already loaded data, using the
+    PDF cache like render_invoice_pdf.
+
+    Returns:
+        Path: The written file
+    """
+    def render(path):
+        render_document(path, f"Challan {challan['challan_no']}",
+                        lambda renderer: renderer.draw_challan(challan, items, company))
+
+    parts = (challan, items, company)
+    return _render_cached("challan", challan, file_path, parts, render)
+
+
+def export_invoice_pdf(invoice_id, folder=None):
+    """
+    Load an invoice from the database and write Invoice_<id>.pdf.
+
+    Args:
+        invoice_id (int): Invoice to export
+        folder: Target folder (defaults to export_dir("Invoices"))
+
+    Returns:
+        Path: The written file, or None if the invoice does not exist
+    """
+    document = load_invoice_document(invoice_id)
+    if document is None:
+        return None
+
+    folder = Path(folder) if folder else export_dir("Invoices")
+    folder.mkdir(parents=True, exist_ok=True)
+    return render_invoice_pdf(folder / f"Invoice_{invoice_id}.pdf", document.invoice, document.items,
+                              document.taxes, document.company)
+
+
+def export_challan_pdf(challan_id, folder=None):
+    """
+    Load a challan from the database and write Challan_<id>.pdf.
+
+    Returns:
+        Path: The written file, or None if the challan does not exist
+    """
+    result = get_challan_by_id(challan_id)
+    if not result:
+        return None
+    challan, items = result
+    company = load_company_info()
+
+    folder = Path(folder) if folder else export_dir("Challans")
+    folder.mkdir(parents=True, exist_ok=True)
+    return render_challan_pdf(folder / f"Challan_{challan_id}.pdf", challan, items, company)
@@ -0,0 +1,151 @@
+"""
+Model/view tables for the invoice and challan previews.
+
+The previews show already-fetched rows, so a read-only table model over
+the cell text is all that is needed. There are no per-cell QTableWidgetItems,
+fonts are shared across every table, and a delegate paints the cells
+instead of per-item stylesheet rules.
+"""
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor, QFont
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QStyledItemDelegate, QTableView
+
+from .pdf_renderer import FONT_FAMILY
+
+ROW_HEIGHT = 35
+HEADER_HEIGHT = 40
+CELL_PADDING = 8
+
+TABLE_STYLE = """
+    QTableView {
+        background-color: white;
+        gridline-color: black;
+        border: 1px solid black;
+    }
+    QHeaderView::section {
+        background-color: white;
+        color: black;
+        font-weight: bold;
+        border: 1px solid black;
+        padding: 10px;
+    }
+"""
+
+_fonts = {}
+_brushes = {}
+
+
+def shared_font(point_size=11, bold=False):
+    """One QFont per (size, weight) for every preview table"""
+    key = (point_size, bold)
+    if key not in _fonts:
+        _fonts[key] = QFont(FONT_FAMILY, point_size, QFont.Bold if bold else QFont.Normal)
+    return _fonts[key]
+
+
+def _brush(color):
+    if color not in _brushes:
+        _brushes[color] = QBrush(QColor(color))
+    return _brushes[color]
+
+
+class DocumentTableModel(QAbstractTableModel):
+    """
+    Read-only model over rows of cell text.
+
+    Args:
+        columns: Column specs from pdf_renderer (header, width, alignment, ...)
+        rows: Cell text per row, e.g. from item_cells() or tax_cells()
+        bold_column (int): Column drawn in bold (e.g. the line total)
+        total_row (bool): Whether the last row is a highlighted TOTAL row
+    """
+
+    def __init__(self, columns, rows, bold_column=None, total_row=False, parent=None):
+        super().__init__(parent)
+        self.headers = [column[0] for column in columns]
+        self.alignments = [column[2] | Qt.AlignVCenter for column in columns]
+        self.rows = rows
+        self.bold_column = bold_column
+        self.total_row = len(rows) - 1 if total_row else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self.rows[row][column]
+        if role == Qt.TextAlignmentRole:
+            return self.alignments[column]
+        if role == Qt.FontRole:
+            if row == self.total_row:
+                return shared_font(12 if column == 0 else 11, bold=True)
+            return shared_font(11, bold=column == self.bold_column)
+        if role == Qt.BackgroundRole:
+            return _brush("#e8f4fd" if row == self.total_row else "#f8f9fa")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+
+class DocumentCellDelegate(QStyledItemDelegate):
+    """Paints background and padded, elided text straight from the model roles"""
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.fillRect(option.rect, index.data(Qt.BackgroundRole))
+        painter.setFont(index.data(Qt.FontRole))
+        painter.setPen(Qt.black)
+        rect = option.rect.adjusted(CELL_PADDING, 0, -CELL_PADDING, 0)
+        text = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, rect.width())
+        painter.drawText(rect, index.data(Qt.TextAlignmentRole), text)
+        painter.restore()
+
+
+def create_document_table(columns, rows, bold_column=None, total_row=False,
+                          stretch_column=None, max_height=400):
+    """
+    Build the read-only table used by the previews.
+
+    Args:
+        columns: Column specs (header, width or None, alignment, ...)
+        rows: Cell text per row
+        bold_column (int): Column drawn in bold
+        total_row (bool): Last row is the TOTAL row
+        stretch_column (int): Column that takes the remaining width
+        max_height (int): Height cap; longer tables scroll
+
+    Returns:
+        QTableView: Configured table (its model is parented to it)
+    """
+    table = QTableView()
+    table.setModel(DocumentTableModel(columns, rows, bold_column, total_row, table))
+    table.setItemDelegate(DocumentCellDelegate(table))
+    table.setStyleSheet(TABLE_STYLE)
+    table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    table.setSelectionMode(QAbstractItemView.NoSelection)
+    table.setFocusPolicy(Qt.NoFocus)
+    table.setWordWrap(False)
+
+    # Every row has the same height, so the view never measures rows
+    vertical_header = table.verticalHeader()
+    vertical_header.setVisible(False)
+    vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+    vertical_header.setDefaultSectionSize(ROW_HEIGHT)
+
+    for column, spec in enumerate(columns):
+        if spec[1]:
+            table.setColumnWidth(column, spec[1])
+    if stretch_column is not None:
+        table.horizontalHeader().setSectionResizeMode(stretch_column, QHeaderView.Stretch)
+
+    table.setFixedHeight(min(len(rows) * ROW_HEIGHT + HEADER_HEIGHT + 10, max_height))
+    return table
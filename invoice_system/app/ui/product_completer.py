@@ -0,0 +1,88 @@
+"""
+Product lookup in the Description column of the invoice and challan
+items tables.
+
+ProductDelegate gives the Description cell an editor whose completer is
+fed from the in-memory product index (models/product_index.py) on every
+keystroke; the completer itself does no filtering. Picking a product puts
+its name in the cell and emits product_chosen, and fill_items_row() then
+fills the rest of the row from the inventory item.
+
+    delegate = ProductDelegate(self.items_table)
+    self.items_table.setItemDelegateForColumn(0, delegate)
+    delegate.product_chosen.connect(lambda row, product: fill_items_row(self.items_table, row, product, ...))
+"""
+from PySide6.QtCore import QModelIndex, Qt, QTimer, Signal
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import (QAbstractItemDelegate, QCompleter, QLineEdit, QStyledItemDelegate,
+                               QTableWidgetItem)
+
+from ..models.product_index import products
+
+PRODUCT_ROLE = Qt.UserRole + 1
+# The completer writes this role into the cell; the popup shows code and name
+NAME_ROLE = Qt.UserRole + 2
+
+
+class ProductDelegate(QStyledItemDelegate):
+    """Line editor with inventory completion for an items table's Description column."""
+    product_chosen = Signal(int, object)   # row, inventory item dict
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Build the index once the screen is up rather than on the first keystroke
+        QTimer.singleShot(0, products.ensure_loaded)
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        model = QStandardItemModel(editor)
+        completer = QCompleter(model, editor)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.setCompletionRole(NAME_ROLE)
+        editor.setCompleter(completer)
+
+        row = index.row()
+        editor.textEdited.connect(lambda text: self._suggest(completer, model, text))
+        completer.activated[QModelIndex].connect(
+            lambda chosen: self._choose(editor, row, chosen))
+        return editor
+
+    def _suggest(self, completer, model, text):
+        model.clear()
+        for product in products.lookup(text):
+            code = product.get('product_code') or ''
+            name = product.get('product_name') or ''
+            item = QStandardItem(f"{code}  {name}" if code else name)
+            item.setData(name, NAME_ROLE)
+            item.setData(product, PRODUCT_ROLE)
+            model.appendRow(item)
+        if model.rowCount():
+            completer.complete()
+
+    def _choose(self, editor, row, chosen):
+        product = chosen.data(PRODUCT_ROLE)
+        if product is None:
+            return
+        editor.setText(product.get('product_name') or '')
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QAbstractItemDelegate.NoHint)
+        self.product_chosen.emit(row, product)
+
+
+def fill_items_row(table, row, product, quantity_column, type_column, rate_column, gst_column=None):
+    """
+    Fill an items row from an inventory item: unit, selling price, GST
+    and a quantity of 1 if none was typed yet. Each cell write goes
+    through cellChanged, so the row's total follows.
+    """
+    cells = {
+        type_column: product.get('unit') or '',
+        rate_column: f"{float(product.get('selling_price') or 0):.2f}",
+    }
+    if gst_column is not None:
+        cells[gst_column] = f"{product['gst']:g}" if product.get('gst') is not None else ''
+    quantity = table.item(row, quantity_column)
+    if quantity is None or not quantity.text().strip():
+        cells[quantity_column] = "1"
+    for column, text in cells.items():
+        table.setItem(row, column, QTableWidgetItem(text))
@@ -3,12 +3,8 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QToolButton, QLabel, QFrame,
     QSpacerItem, QSizePolicy, QPushButton
 )
-from .create_invoice import CreateInvoice
-from .admin_page import AdminPage
-from .create_challan import CreateChallan
-from .manage_invoice import ManageInvoice
-from .add_items import AddItems_Page
-from .manage_challan import Manage_Challan 
+from .page_registry import create_page
+from .window_manager import windows
 
 class SidebarButton(QToolButton):
     def __init__(self, text, has_icon=True, parent=None):
@@ -263,25 +259,17 @@ class Sidebar(QFrame):
         self.collapse_all_menus()
 
     def open_createInvoice_page(self):
-        self.createInvoice_window=CreateInvoice(None)
-        self.createInvoice_window.show()
-        self.createInvoice_window.showMaximized()
+        self.createInvoice_window = windows.show("create_invoice")
 
     def open_admin(self):
-        self.admin_window=AdminPage()
+        self.admin_window=create_page("admin")
         self.admin_window.show()
 
     def open_challanPage(self):
-        self.createChallan_window=CreateChallan()
-        self.createChallan_window.show()
-        self.createChallan_window.showMaximized()
+        self.createChallan_window = windows.show("create_challan")
         
     def open_manageInvoice_page(self):
-        self.manageInvoice_window = ManageInvoice()
-        self.manageInvoice_window.show()
-        self.manageInvoice_window.showMaximized()
+        self.manageInvoice_window = windows.show("manage_invoice")
 
     def open_manageChallan_page(self):
-        self.manageChallan_window=Manage_Challan()
-        self.manageChallan_window.show()
-        self.manageChallan_window.showMaximized()
\ No newline at end of file
+        self.manageChallan_window = windows.show("manage_challan")
\ No newline at end of file
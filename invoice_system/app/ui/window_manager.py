@@ -0,0 +1,135 @@
+"""
+Reusable top-level windows.
+
+The create and manage screens are large widget trees that load data when
+they are built. WindowManager keeps one instance of each screen and shows
+it again on the next click, calling its reopen() hook (if it has one) so
+the screen can reset its form or reload what changed while it was hidden.
+
+Preview windows are keyed by document and closed least recently used
+first once more than MAX_PREVIEWS are open; a closed preview is deleted.
+
+    windows.show("manage_invoice")
+    windows.show_preview("invoice_preview", invoice_id)
+    windows.footprint()     # widgets, list rows and image bytes per live window
+"""
+from collections import OrderedDict
+
+import shiboken6
+from PySide6.QtCore import QObject, Qt
+from PySide6.QtWidgets import QAbstractItemView, QLabel
+
+from .page_registry import create_page
+
+MAX_PREVIEWS = 4
+
+
+def _alive(window):
+    return window is not None and shiboken6.isValid(window)
+
+
+class WindowManager:
+    """One instance per screen, and a bounded pool of preview windows."""
+
+    def __init__(self, max_previews=MAX_PREVIEWS):
+        self.max_previews = max_previews
+        self._screens = {}               # registry name: window
+        self._previews = OrderedDict()   # (registry name, document id): window, oldest first
+
+    def show(self, name, maximized=True):
+        """
+        Show the screen registered as name, creating it on first use.
+
+        Returns:
+            The window
+        """
+        window = self._screens.get(name)
+        if _alive(window):
+            reopen = getattr(window, "reopen", None)
+            if reopen is not None and not window.isVisible():
+                reopen()
+        else:
+            window = create_page(name)
+            self._screens[name] = window
+        self._raise(window, maximized)
+        return window
+
+    def show_preview(self, name, document_id):
+        """
+        Show the preview of one document, reusing its window if it is still open.
+
+        Returns:
+            The preview window
+        """
+        key = (name, document_id)
+        self._prune()
+        window = self._previews.get(key)
+        if window is None:
+            window = create_page(name, document_id)
+            window.setAttribute(Qt.WA_DeleteOnClose)
+            self._previews[key] = window
+            while len(self._previews) > self.max_previews:
+                _, oldest = self._previews.popitem(last=False)
+                oldest.close()
+        else:
+            self._previews.move_to_end(key)
+        self._raise(window, maximized=False)
+        return window
+
+    def windows(self):
+        """Live windows as (name, window) pairs, screens first."""
+        self._prune()
+        live = [(name, window) for name, window in self._screens.items() if _alive(window)]
+        return live + [(name, window) for (name, _), window in self._previews.items()]
+
+    def footprint(self):
+        """
+        Rough memory footprint of every live window.
+
+        Image bytes count each pixmap once even when several windows share
+        it (the logo cache hands out the same pixmap).
+
+        Returns:
+            list: dicts with name, title, visible, objects, rows and image_bytes
+        """
+        seen = set()
+        report = []
+        for name, window in self.windows():
+            image_bytes = 0
+            for label in window.findChildren(QLabel):
+                pixmap = label.pixmap()
+                if pixmap.isNull() or pixmap.cacheKey() in seen:
+                    continue
+                seen.add(pixmap.cacheKey())
+                image_bytes += pixmap.width() * pixmap.height() * pixmap.depth() // 8
+            rows = sum(view.model().rowCount() for view in window.findChildren(QAbstractItemView)
+                       if view.model() is not None)
+            report.append({
+                'name': name,
+                'title': window.windowTitle(),
+                'visible': window.isVisible(),
+                'objects': len(window.findChildren(QObject)),
+                'rows': rows,
+                'image_bytes': image_bytes,
+            })
+        return report
+
+    def close_all(self):
+        for _, window in self.windows():
+            window.close()
+
+    def _prune(self):
+        for key in [key for key, window in self._previews.items() if not _alive(window)]:
+            del self._previews[key]
+
+    @staticmethod
+    def _raise(window, maximized):
+        if maximized:
+            window.showMaximized()
+        else:
+            window.show()
+        window.raise_()
+        window.activateWindow()
+
+
+windows = WindowManager()
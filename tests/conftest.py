@@ -0,0 +1,31 @@
+"""
+Shared fixtures. Run from the repository root:
+
+    python -m pytest -q
+"""
+import os
+
+import pytest
+
+# Widgets are only created off screen
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A fresh, migrated database that every db_manager function uses for the test."""
+    from invoice_system.app.models import db_manager
+
+    path = tmp_path / "invoice_app.db"
+    db_manager.set_database_path(path)
+    db_manager.create_tables()
+    yield path
+    db_manager.close_connections()
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """The QApplication widgets need (one per process)."""
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,102 @@
+"""Connections and statements used to load an invoice document and open its preview."""
+import sqlite3
+
+import pytest
+
+from invoice_system.app.models import db_manager
+from invoice_system.app.models.connection import manager
+
+
+@pytest.fixture
+def invoice(database):
+    """One invoice with three lines at two rates; returns its id."""
+    with db_manager.transaction() as conn:
+        conn.execute("INSERT INTO company_info (id, name, gstin) VALUES (1, 'Finvo', '19ABCDE1234F1Z5')")
+        conn.execute("""
+            INSERT INTO invoices (id, customer_name, gstin, state_code, invoice_no, date, grand_total, payment_status)
+            VALUES (1, 'Sharma Traders', '19ABCDE0001F1Z5', '19', 'INV-000001', '01-04-2025', 350.0, 'Pending')
+        """)
+        conn.executemany("""
+            INSERT INTO invoice_items (invoice_id, description, hsn, quantity, type, rate, gst_percent, total)
+            VALUES (1, ?, '3917', ?, 'pcs', ?, ?, ?)
+        """, [("PVC Pipe", 2, 50.0, 18, 100.0), ("GI Elbow", 1, 150.0, 18, 150.0),
+              ("Ball Valve", 4, 25.0, 12, 100.0)])
+    return 1
+
+
+@pytest.fixture
+def counts(monkeypatch):
+    """Connections opened and statements run on any connection during the test."""
+    counts = {"connections": 0, "statements": []}
+    connect = sqlite3.connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        counts["connections"] += 1
+        conn.set_trace_callback(counts["statements"].append)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", traced_connect)
+    pooled = manager.acquire()
+    pooled.set_trace_callback(counts["statements"].append)
+    yield counts
+    pooled.set_trace_callback(None)
+
+
+def queries(statements):
+    return [statement for statement in statements if not statement.startswith("PRAGMA")]
+
+
+def test_document_is_read_in_one_transaction(invoice, counts):
+    db_manager.compute_invoice_taxes()
+    counts["statements"].clear()
+
+    document = db_manager.load_invoice_document(invoice)
+
+    assert counts["connections"] == 0
+    statements = queries(counts["statements"])
+    # BEGIN, invoice, items, taxes, company, COMMIT
+    assert len(statements) == 6
+    assert statements[0] == "BEGIN" and statements[-1] == "COMMIT"
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements[1:-1])
+
+    assert document.invoice["invoice_no"] == "INV-000001"
+    assert [item["description"] for item in document.items] == ["PVC Pipe", "GI Elbow", "Ball Valve"]
+    assert [(tax["gst_percent"], tax["taxable_amount"]) for tax in document.taxes] == [(12.0, 100.0), (18.0, 250.0)]
+    assert document.company["name"] == "Finvo"
+    with pytest.raises(TypeError):
+        document.items[0]["total"] = 0
+
+
+def test_missing_taxes_are_computed_once(invoice, counts):
+    document = db_manager.load_invoice_document(invoice)
+    assert len(document.taxes) == 2
+
+    counts["statements"].clear()
+    db_manager.load_invoice_document(invoice)
+    assert len(queries(counts["statements"])) == 6
+
+
+def test_missing_invoice(database):
+    assert db_manager.load_invoice_document(999) is None
+
+
+def test_preview_loads_in_one_read_transaction(qt_app, invoice, counts, tmp_path):
+    from invoice_system.app.models.pdf_cache import cache
+    from invoice_system.app.ui.invoice_preview import InvoicePreviewWindow
+
+    cache.configure(tmp_path / "pdf_cache")
+    db_manager.compute_invoice_taxes()
+    counts["statements"].clear()
+
+    window = InvoicePreviewWindow(invoice)
+    window.show()
+    qt_app.processEvents()
+    window.close()
+    window.deleteLater()
+
+    assert counts["connections"] == 0
+    statements = queries(counts["statements"])
+    # The same six statements as load_invoice_document
+    assert statements[0] == "BEGIN" and statements[-1] == "COMMIT"
+    assert len(statements) == 6
@@ -0,0 +1,128 @@
+"""The set-based tax engine in db_manager against InvoiceCalculator."""
+import random
+
+from invoice_system.app.models import db_manager
+from invoice_system.app.models.invoice_calculator import GST_RATES, InvoiceCalculator
+
+COMPANY_GSTIN = "19ABCDE1234F1Z5"
+# Same state, other states, unknown, and values state_number() rejects
+PLACES = [("19", ""), ("27", ""), ("", "10ABCDE1234F1Z5"), ("", ""), (None, None),
+          (" 21", ""), ("1A", "27ABCDE1234F1Z5"), ("5", ""), ("00", "19ABCDE1234F1Z5")]
+# Three-decimal rates round half up to basis points (0.125 -> 0.13)
+RATES = list(GST_RATES) + [0.1, 7.5, 12.0, None, 0.125, 2.345, 12.005, 0.285, "18"]
+
+
+def random_item(rng):
+    rate = rng.choice(RATES)
+    if rng.random() < 0.1:
+        # Saved without a total: taxed on quantity x rate
+        return {'total': None, 'quantity': rng.randint(1, 20), 'rate': round(rng.uniform(1, 999), 3),
+                'gst_percent': rate}
+    total = random_total(rng)
+    return {'total': total, 'quantity': 1, 'rate': total, 'gst_percent': rate}
+
+
+def random_total(rng):
+    kind = rng.random()
+    if kind < 0.6:
+        return round(rng.uniform(1, 50_000), 2)
+    if kind < 0.8:
+        # A third decimal of 5 is where float and half-up rounding part ways
+        return rng.randint(100, 5_000_000) / 100 + 0.005
+    if kind < 0.9:
+        return round(rng.uniform(1, 1000), 3)
+    return -round(rng.uniform(1, 500), 2)
+
+
+def seed(count, seed=7):
+    rng = random.Random(seed)
+    invoices = {}
+    with db_manager.transaction() as conn:
+        conn.execute("INSERT INTO company_info (id, name, gstin) VALUES (1, 'Finvo', ?)", (COMPANY_GSTIN,))
+        for invoice_id in range(1, count + 1):
+            state_code, gstin = rng.choice(PLACES)
+            items = [random_item(rng) for _ in range(rng.randint(1, 6))]
+            conn.execute("""
+                INSERT INTO invoices (id, customer_name, gstin, state_code, invoice_no, grand_total, payment_status)
+                VALUES (?, 'Customer', ?, ?, ?, 0, 'Pending')
+            """, (invoice_id, gstin, state_code, f"INV-{invoice_id:05d}"))
+            conn.executemany("""
+                INSERT INTO invoice_items (invoice_id, description, quantity, rate, gst_percent, total)
+                VALUES (?, 'Item', ?, ?, ?, ?)
+            """, [(invoice_id, item['quantity'], item['rate'], item['gst_percent'], item['total'])
+                  for item in items])
+            invoices[invoice_id] = (items, state_code, gstin)
+    return invoices
+
+
+def stored_taxes():
+    with db_manager.get_connection() as conn:
+        rows = conn.execute("""
+            SELECT invoice_id, gst_percent, sgst_amount, cgst_amount, igst_amount, tax_total
+            FROM invoice_taxes ORDER BY invoice_id, gst_percent
+        """).fetchall()
+    taxes = {}
+    for invoice_id, *row in rows:
+        taxes.setdefault(invoice_id, []).append(tuple(row))
+    return taxes
+
+
+def expected_taxes(invoices):
+    calculator = InvoiceCalculator(COMPANY_GSTIN)
+    expected = {}
+    for invoice_id, (items, state_code, gstin) in invoices.items():
+        totals = calculator.calculate(items, state_code=state_code, gstin=gstin)
+        expected[invoice_id] = [(tax.gst_percent, tax.sgst / 100, tax.cgst / 100, tax.igst / 100,
+                                 tax.tax_total / 100) for tax in totals.taxes]
+    return expected
+
+
+def test_backfill_matches_calculator(database, monkeypatch):
+    invoices = seed(2000)
+    # Many small chunks, so invoices at chunk edges are covered
+    monkeypatch.setattr(db_manager, "TAX_CHUNK_INVOICES", 37)
+
+    written = db_manager.compute_invoice_taxes()
+
+    expected = expected_taxes(invoices)
+    assert stored_taxes() == expected
+    assert written == sum(len(taxes) for taxes in expected.values())
+
+
+def test_recompute_is_scoped_and_idempotent(database):
+    invoices = seed(50)
+    db_manager.compute_invoice_taxes()
+    before = stored_taxes()
+
+    with db_manager.transaction() as conn:
+        conn.execute("UPDATE invoice_items SET total = total + 1 WHERE invoice_id IN (3, 4) AND total IS NOT NULL")
+    db_manager.compute_invoice_taxes(3)
+    db_manager.compute_invoice_taxes([4, 4])
+    db_manager.compute_invoice_taxes([4])
+
+    for invoice_id in (3, 4):
+        items, state_code, gstin = invoices[invoice_id]
+        invoices[invoice_id] = ([dict(item, total=item['total'] + 1) if item['total'] is not None else item
+                                 for item in items], state_code, gstin)
+    after = stored_taxes()
+    assert after == expected_taxes(invoices)
+    assert {k: v for k, v in after.items() if k not in (3, 4)} == \
+        {k: v for k, v in before.items() if k not in (3, 4)}
+
+
+def test_three_decimal_rate_and_missing_total(database):
+    with db_manager.transaction() as conn:
+        conn.execute("INSERT INTO company_info (id, name, gstin) VALUES (1, 'Finvo', ?)", (COMPANY_GSTIN,))
+        conn.execute("""
+            INSERT INTO invoices (id, customer_name, state_code, invoice_no, grand_total, payment_status)
+            VALUES (1, 'Customer', '19', 'INV-00001', 1200, 'Pending')
+        """)
+        conn.executemany("""
+            INSERT INTO invoice_items (invoice_id, description, quantity, rate, gst_percent, total)
+            VALUES (1, 'Item', ?, ?, ?, ?)
+        """, [(1, 1000, 0.125, 1000.0), (2, 100, 18, None)])
+
+    db_manager.compute_invoice_taxes(1)
+
+    # 0.125% is 0.13%: 1.30 on 1000, split 0.65 + 0.65; 18% of 2 x 100
+    assert stored_taxes() == {1: [(0.13, 0.65, 0.65, 0.0, 1.3), (18.0, 18.0, 18.0, 0.0, 36.0)]}